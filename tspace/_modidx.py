@@ -11,17 +11,24 @@ d = { 'settings': { 'branch': 'main',
                                                                              'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.__repr__': ('07.agent.ddpg.html#ddpg.__repr__', 'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.__str__': ('07.agent.ddpg.html#ddpg.__str__', 'tspace/agent/ddpg.py'),
+                                   'tspace.agent.ddpg.DDPG.acting_actor_model': ( '07.agent.ddpg.html#ddpg.acting_actor_model',
+                                                                                  'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.actor_model': ('07.agent.ddpg.html#ddpg.actor_model', 'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.actor_predict': ( '07.agent.ddpg.html#ddpg.actor_predict',
                                                                              'tspace/agent/ddpg.py'),
+                                   'tspace.agent.ddpg.DDPG.actor_predict_batch': ( '07.agent.ddpg.html#ddpg.actor_predict_batch',
+                                                                                   'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.convert_to_tflite': ( '07.agent.ddpg.html#ddpg.convert_to_tflite',
                                                                                  'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.critic_model': ('07.agent.ddpg.html#ddpg.critic_model', 'tspace/agent/ddpg.py'),
+                                   'tspace.agent.ddpg.DDPG.export_backend': ( '07.agent.ddpg.html#ddpg.export_backend',
+                                                                              'tspace/agent/ddpg.py'),
+                                   'tspace.agent.ddpg.DDPG.fleet_copy': ('07.agent.ddpg.html#ddpg.fleet_copy', 'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.get_actor': ('07.agent.ddpg.html#ddpg.get_actor', 'tspace/agent/ddpg.py'),
+                                   'tspace.agent.ddpg.DDPG.get_actor_weights': ( '07.agent.ddpg.html#ddpg.get_actor_weights',
+                                                                                 'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.get_critic': ('07.agent.ddpg.html#ddpg.get_critic', 'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.get_losses': ('07.agent.ddpg.html#ddpg.get_losses', 'tspace/agent/ddpg.py'),
-                                   'tspace.agent.ddpg.DDPG.infer_single_sample': ( '07.agent.ddpg.html#ddpg.infer_single_sample',
-                                                                                   'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.init_checkpoint': ( '07.agent.ddpg.html#ddpg.init_checkpoint',
                                                                                'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.load_saved_model': ( '07.agent.ddpg.html#ddpg.load_saved_model',
@@ -34,8 +41,13 @@ d = { 'settings': { 'branch': 'main',
                                    'tspace.agent.ddpg.DDPG.save_as_saved_model': ( '07.agent.ddpg.html#ddpg.save_as_saved_model',
                                                                                    'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.save_ckpt': ('07.agent.ddpg.html#ddpg.save_ckpt', 'tspace/agent/ddpg.py'),
+                                   'tspace.agent.ddpg.DDPG.set_acting_weights': ( '07.agent.ddpg.html#ddpg.set_acting_weights',
+                                                                                  'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.soft_update_target': ( '07.agent.ddpg.html#ddpg.soft_update_target',
                                                                                   'tspace/agent/ddpg.py'),
+                                   'tspace.agent.ddpg.DDPG.start_episode': ( '07.agent.ddpg.html#ddpg.start_episode',
+                                                                             'tspace/agent/ddpg.py'),
+                                   'tspace.agent.ddpg.DDPG.swap_backend': ('07.agent.ddpg.html#ddpg.swap_backend', 'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.target_actor_model': ( '07.agent.ddpg.html#ddpg.target_actor_model',
                                                                                   'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.target_critic_model': ( '07.agent.ddpg.html#ddpg.target_critic_model',
@@ -44,6 +56,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                       'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.touch_gpu': ('07.agent.ddpg.html#ddpg.touch_gpu', 'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.train': ('07.agent.ddpg.html#ddpg.train', 'tspace/agent/ddpg.py'),
+                                   'tspace.agent.ddpg.DDPG.train_n': ('07.agent.ddpg.html#ddpg.train_n', 'tspace/agent/ddpg.py'),
+                                   'tspace.agent.ddpg.DDPG.update_n': ('07.agent.ddpg.html#ddpg.update_n', 'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.update_target': ( '07.agent.ddpg.html#ddpg.update_target',
                                                                              'tspace/agent/ddpg.py'),
                                    'tspace.agent.ddpg.DDPG.update_with_batch': ( '07.agent.ddpg.html#ddpg.update_with_batch',
@@ -54,7 +68,10 @@ d = { 'settings': { 'branch': 'main',
                                   'tspace.agent.dpg.DPG.__repr__': ('07.agent.dpg.html#dpg.__repr__', 'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.__str__': ('07.agent.dpg.html#dpg.__str__', 'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.actor_predict': ('07.agent.dpg.html#dpg.actor_predict', 'tspace/agent/dpg.py'),
+                                  'tspace.agent.dpg.DPG.actor_predict_batch': ( '07.agent.dpg.html#dpg.actor_predict_batch',
+                                                                                'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.buffer': ('07.agent.dpg.html#dpg.buffer', 'tspace/agent/dpg.py'),
+                                  'tspace.agent.dpg.DPG.close_ckpt': ('07.agent.dpg.html#dpg.close_ckpt', 'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.coll_type': ('07.agent.dpg.html#dpg.coll_type', 'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.data_folder': ('07.agent.dpg.html#dpg.data_folder', 'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.deposit': ('07.agent.dpg.html#dpg.deposit', 'tspace/agent/dpg.py'),
@@ -64,16 +81,27 @@ d = { 'settings': { 'branch': 'main',
                                   'tspace.agent.dpg.DPG.epi_no': ('07.agent.dpg.html#dpg.epi_no', 'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.episode_start_dt': ( '07.agent.dpg.html#dpg.episode_start_dt',
                                                                              'tspace/agent/dpg.py'),
+                                  'tspace.agent.dpg.DPG.fleet_copy': ('07.agent.dpg.html#dpg.fleet_copy', 'tspace/agent/dpg.py'),
+                                  'tspace.agent.dpg.DPG.get_actor_weights': ( '07.agent.dpg.html#dpg.get_actor_weights',
+                                                                              'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.get_losses': ('07.agent.dpg.html#dpg.get_losses', 'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.hyper_param': ('07.agent.dpg.html#dpg.hyper_param', 'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.infer_mode': ('07.agent.dpg.html#dpg.infer_mode', 'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.init_checkpoint': ('07.agent.dpg.html#dpg.init_checkpoint', 'tspace/agent/dpg.py'),
+                                  'tspace.agent.dpg.DPG.new_observation_block': ( '07.agent.dpg.html#dpg.new_observation_block',
+                                                                                  'tspace/agent/dpg.py'),
+                                  'tspace.agent.dpg.DPG.observation_block': ( '07.agent.dpg.html#dpg.observation_block',
+                                                                              'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.observation_meta': ( '07.agent.dpg.html#dpg.observation_meta',
                                                                              'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.observations': ('07.agent.dpg.html#dpg.observations', 'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.pool_key': ('07.agent.dpg.html#dpg.pool_key', 'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.resume': ('07.agent.dpg.html#dpg.resume', 'tspace/agent/dpg.py'),
+                                  'tspace.agent.dpg.DPG.sample_minibatch_arrays': ( '07.agent.dpg.html#dpg.sample_minibatch_arrays',
+                                                                                    'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.save_ckpt': ('07.agent.dpg.html#dpg.save_ckpt', 'tspace/agent/dpg.py'),
+                                  'tspace.agent.dpg.DPG.set_acting_weights': ( '07.agent.dpg.html#dpg.set_acting_weights',
+                                                                               'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.soft_update_target': ( '07.agent.dpg.html#dpg.soft_update_target',
                                                                                'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.start_episode': ('07.agent.dpg.html#dpg.start_episode', 'tspace/agent/dpg.py'),
@@ -81,6 +109,7 @@ d = { 'settings': { 'branch': 'main',
                                                                                    'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.touch_gpu': ('07.agent.dpg.html#dpg.touch_gpu', 'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.train': ('07.agent.dpg.html#dpg.train', 'tspace/agent/dpg.py'),
+                                  'tspace.agent.dpg.DPG.train_n': ('07.agent.dpg.html#dpg.train_n', 'tspace/agent/dpg.py'),
                                   'tspace.agent.dpg.DPG.truck': ('07.agent.dpg.html#dpg.truck', 'tspace/agent/dpg.py')},
             'tspace.agent.idql': { 'tspace.agent.idql.IDQL': ('07.agent.idql.html#idql', 'tspace/agent/idql.py'),
                                    'tspace.agent.idql.IDQL.__hash__': ('07.agent.idql.html#idql.__hash__', 'tspace/agent/idql.py'),
@@ -90,16 +119,28 @@ d = { 'settings': { 'branch': 'main',
                                    'tspace.agent.idql.IDQL.__str__': ('07.agent.idql.html#idql.__str__', 'tspace/agent/idql.py'),
                                    'tspace.agent.idql.IDQL.actor_predict': ( '07.agent.idql.html#idql.actor_predict',
                                                                              'tspace/agent/idql.py'),
+                                   'tspace.agent.idql.IDQL.actor_predict_batch': ( '07.agent.idql.html#idql.actor_predict_batch',
+                                                                                   'tspace/agent/idql.py'),
+                                   'tspace.agent.idql.IDQL.ckpt_path': ('07.agent.idql.html#idql.ckpt_path', 'tspace/agent/idql.py'),
+                                   'tspace.agent.idql.IDQL.close_ckpt': ('07.agent.idql.html#idql.close_ckpt', 'tspace/agent/idql.py'),
                                    'tspace.agent.idql.IDQL.get_losses': ('07.agent.idql.html#idql.get_losses', 'tspace/agent/idql.py'),
                                    'tspace.agent.idql.IDQL.init_checkpoint': ( '07.agent.idql.html#idql.init_checkpoint',
                                                                                'tspace/agent/idql.py'),
+                                   'tspace.agent.idql.IDQL.next_policy_key': ( '07.agent.idql.html#idql.next_policy_key',
+                                                                               'tspace/agent/idql.py'),
                                    'tspace.agent.idql.IDQL.sample_minibatch': ( '07.agent.idql.html#idql.sample_minibatch',
                                                                                 'tspace/agent/idql.py'),
                                    'tspace.agent.idql.IDQL.save_ckpt': ('07.agent.idql.html#idql.save_ckpt', 'tspace/agent/idql.py'),
                                    'tspace.agent.idql.IDQL.soft_update_target': ( '07.agent.idql.html#idql.soft_update_target',
                                                                                   'tspace/agent/idql.py'),
                                    'tspace.agent.idql.IDQL.touch_gpu': ('07.agent.idql.html#idql.touch_gpu', 'tspace/agent/idql.py'),
-                                   'tspace.agent.idql.IDQL.train': ('07.agent.idql.html#idql.train', 'tspace/agent/idql.py')},
+                                   'tspace.agent.idql.IDQL.train': ('07.agent.idql.html#idql.train', 'tspace/agent/idql.py'),
+                                   'tspace.agent.idql.eval_learner_loss': ('07.agent.idql.html#eval_learner_loss', 'tspace/agent/idql.py'),
+                                   'tspace.agent.idql.flatten_valid_steps': ( '07.agent.idql.html#flatten_valid_steps',
+                                                                              'tspace/agent/idql.py'),
+                                   'tspace.agent.idql.sample_implicit_policy': ( '07.agent.idql.html#sample_implicit_policy',
+                                                                                 'tspace/agent/idql.py'),
+                                   'tspace.agent.idql.update_learner': ('07.agent.idql.html#update_learner', 'tspace/agent/idql.py')},
             'tspace.agent.rdpg.rdpg': { 'tspace.agent.rdpg.rdpg.RDPG': ('07.agent.rdpg.rdpg.html#rdpg', 'tspace/agent/rdpg/rdpg.py'),
                                         'tspace.agent.rdpg.rdpg.RDPG.__hash__': ( '07.agent.rdpg.rdpg.html#rdpg.__hash__',
                                                                                   'tspace/agent/rdpg/rdpg.py'),
@@ -113,18 +154,30 @@ d = { 'settings': { 'branch': 'main',
                                                                                        'tspace/agent/rdpg/rdpg.py'),
                                         'tspace.agent.rdpg.rdpg.RDPG.actor_predict_step': ( '07.agent.rdpg.rdpg.html#rdpg.actor_predict_step',
                                                                                             'tspace/agent/rdpg/rdpg.py'),
+                                        'tspace.agent.rdpg.rdpg.RDPG.deposit': ( '07.agent.rdpg.rdpg.html#rdpg.deposit',
+                                                                                 'tspace/agent/rdpg/rdpg.py'),
                                         'tspace.agent.rdpg.rdpg.RDPG.end_episode': ( '07.agent.rdpg.rdpg.html#rdpg.end_episode',
                                                                                      'tspace/agent/rdpg/rdpg.py'),
+                                        'tspace.agent.rdpg.rdpg.RDPG.get_actor_weights': ( '07.agent.rdpg.rdpg.html#rdpg.get_actor_weights',
+                                                                                           'tspace/agent/rdpg/rdpg.py'),
                                         'tspace.agent.rdpg.rdpg.RDPG.get_losses': ( '07.agent.rdpg.rdpg.html#rdpg.get_losses',
                                                                                     'tspace/agent/rdpg/rdpg.py'),
                                         'tspace.agent.rdpg.rdpg.RDPG.init_checkpoint': ( '07.agent.rdpg.rdpg.html#rdpg.init_checkpoint',
                                                                                          'tspace/agent/rdpg/rdpg.py'),
                                         'tspace.agent.rdpg.rdpg.RDPG.notrain': ( '07.agent.rdpg.rdpg.html#rdpg.notrain',
                                                                                  'tspace/agent/rdpg/rdpg.py'),
+                                        'tspace.agent.rdpg.rdpg.RDPG.pad_to_chunks': ( '07.agent.rdpg.rdpg.html#rdpg.pad_to_chunks',
+                                                                                       'tspace/agent/rdpg/rdpg.py'),
+                                        'tspace.agent.rdpg.rdpg.RDPG.reset_acting_state': ( '07.agent.rdpg.rdpg.html#rdpg.reset_acting_state',
+                                                                                            'tspace/agent/rdpg/rdpg.py'),
                                         'tspace.agent.rdpg.rdpg.RDPG.save_ckpt': ( '07.agent.rdpg.rdpg.html#rdpg.save_ckpt',
                                                                                    'tspace/agent/rdpg/rdpg.py'),
+                                        'tspace.agent.rdpg.rdpg.RDPG.set_acting_weights': ( '07.agent.rdpg.rdpg.html#rdpg.set_acting_weights',
+                                                                                            'tspace/agent/rdpg/rdpg.py'),
                                         'tspace.agent.rdpg.rdpg.RDPG.soft_update_target': ( '07.agent.rdpg.rdpg.html#rdpg.soft_update_target',
                                                                                             'tspace/agent/rdpg/rdpg.py'),
+                                        'tspace.agent.rdpg.rdpg.RDPG.start_episode': ( '07.agent.rdpg.rdpg.html#rdpg.start_episode',
+                                                                                       'tspace/agent/rdpg/rdpg.py'),
                                         'tspace.agent.rdpg.rdpg.RDPG.touch_gpu': ( '07.agent.rdpg.rdpg.html#rdpg.touch_gpu',
                                                                                    'tspace/agent/rdpg/rdpg.py'),
                                         'tspace.agent.rdpg.rdpg.RDPG.train': ( '07.agent.rdpg.rdpg.html#rdpg.train',
@@ -145,6 +198,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                                         'tspace/agent/rdpg/seq_actor.py'),
                                              'tspace.agent.rdpg.seq_actor.SeqActor.hidden_dim': ( '07.agent.rdpg.actor.html#seqactor.hidden_dim',
                                                                                                   'tspace/agent/rdpg/seq_actor.py'),
+                                             'tspace.agent.rdpg.seq_actor.SeqActor.initial_cell_state': ( '07.agent.rdpg.actor.html#seqactor.initial_cell_state',
+                                                                                                          'tspace/agent/rdpg/seq_actor.py'),
                                              'tspace.agent.rdpg.seq_actor.SeqActor.lr': ( '07.agent.rdpg.actor.html#seqactor.lr',
                                                                                           'tspace/agent/rdpg/seq_actor.py'),
                                              'tspace.agent.rdpg.seq_actor.SeqActor.n_layers': ( '07.agent.rdpg.actor.html#seqactor.n_layers',
@@ -153,6 +208,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                                      'tspace/agent/rdpg/seq_actor.py'),
                                              'tspace.agent.rdpg.seq_actor.SeqActor.predict': ( '07.agent.rdpg.actor.html#seqactor.predict',
                                                                                                'tspace/agent/rdpg/seq_actor.py'),
+                                             'tspace.agent.rdpg.seq_actor.SeqActor.predict_cell': ( '07.agent.rdpg.actor.html#seqactor.predict_cell',
+                                                                                                    'tspace/agent/rdpg/seq_actor.py'),
                                              'tspace.agent.rdpg.seq_actor.SeqActor.predict_step': ( '07.agent.rdpg.actor.html#seqactor.predict_step',
                                                                                                     'tspace/agent/rdpg/seq_actor.py'),
                                              'tspace.agent.rdpg.seq_actor.SeqActor.reset_noise': ( '07.agent.rdpg.actor.html#seqactor.reset_noise',
@@ -193,6 +250,22 @@ d = { 'settings': { 'branch': 'main',
                                                                                                     'tspace/agent/rdpg/seq_critic.py'),
                                               'tspace.agent.rdpg.seq_critic.SeqCritic.tau': ( '07.agent.rdpg.critic.html#seqcritic.tau',
                                                                                               'tspace/agent/rdpg/seq_critic.py')},
+            'tspace.agent.utils.checkpoint': { 'tspace.agent.utils.checkpoint.AsyncWriter': ( '07.agent.utils.checkpoint.html#asyncwriter',
+                                                                                              'tspace/agent/utils/checkpoint.py'),
+                                               'tspace.agent.utils.checkpoint.AsyncWriter.__init__': ( '07.agent.utils.checkpoint.html#asyncwriter.__init__',
+                                                                                                       'tspace/agent/utils/checkpoint.py'),
+                                               'tspace.agent.utils.checkpoint.AsyncWriter.close': ( '07.agent.utils.checkpoint.html#asyncwriter.close',
+                                                                                                    'tspace/agent/utils/checkpoint.py'),
+                                               'tspace.agent.utils.checkpoint.AsyncWriter.done': ( '07.agent.utils.checkpoint.html#asyncwriter.done',
+                                                                                                   'tspace/agent/utils/checkpoint.py'),
+                                               'tspace.agent.utils.checkpoint.AsyncWriter.submit': ( '07.agent.utils.checkpoint.html#asyncwriter.submit',
+                                                                                                     'tspace/agent/utils/checkpoint.py'),
+                                               'tspace.agent.utils.checkpoint.AsyncWriter.sync': ( '07.agent.utils.checkpoint.html#asyncwriter.sync',
+                                                                                                   'tspace/agent/utils/checkpoint.py'),
+                                               'tspace.agent.utils.checkpoint.async_checkpoint_options': ( '07.agent.utils.checkpoint.html#async_checkpoint_options',
+                                                                                                           'tspace/agent/utils/checkpoint.py'),
+                                               'tspace.agent.utils.checkpoint.write_atomic': ( '07.agent.utils.checkpoint.html#write_atomic',
+                                                                                               'tspace/agent/utils/checkpoint.py')},
             'tspace.agent.utils.hyperparams': { 'tspace.agent.utils.hyperparams.HyperParamDDPG': ( '07.agent.utils.hyperparams.html#hyperparamddpg',
                                                                                                    'tspace/agent/utils/hyperparams.py'),
                                                 'tspace.agent.utils.hyperparams.HyperParamDPG': ( '07.agent.utils.hyperparams.html#hyperparamdpg',
@@ -201,7 +274,61 @@ d = { 'settings': { 'branch': 'main',
                                                                                                    'tspace/agent/utils/hyperparams.py'),
                                                 'tspace.agent.utils.hyperparams.HyperParamRDPG': ( '07.agent.utils.hyperparams.html#hyperparamrdpg',
                                                                                                    'tspace/agent/utils/hyperparams.py')},
-            'tspace.agent.utils.ou_action_noise': { 'tspace.agent.utils.ou_action_noise.OUActionNoise': ( '07.agent.utils.ou_action_noise.html#ouactionnoise',
+            'tspace.agent.utils.inference': { 'tspace.agent.utils.inference.InferenceBackend': ( '07.agent.utils.inference.html#inferencebackend',
+                                                                                                 'tspace/agent/utils/inference.py'),
+                                              'tspace.agent.utils.inference.InferenceBackend.__repr__': ( '07.agent.utils.inference.html#inferencebackend.__repr__',
+                                                                                                          'tspace/agent/utils/inference.py'),
+                                              'tspace.agent.utils.inference.InferenceBackend.predict': ( '07.agent.utils.inference.html#inferencebackend.predict',
+                                                                                                         'tspace/agent/utils/inference.py'),
+                                              'tspace.agent.utils.inference.KerasBackend': ( '07.agent.utils.inference.html#kerasbackend',
+                                                                                             'tspace/agent/utils/inference.py'),
+                                              'tspace.agent.utils.inference.KerasBackend.__init__': ( '07.agent.utils.inference.html#kerasbackend.__init__',
+                                                                                                      'tspace/agent/utils/inference.py'),
+                                              'tspace.agent.utils.inference.KerasBackend.predict': ( '07.agent.utils.inference.html#kerasbackend.predict',
+                                                                                                     'tspace/agent/utils/inference.py'),
+                                              'tspace.agent.utils.inference.OnnxBackend': ( '07.agent.utils.inference.html#onnxbackend',
+                                                                                            'tspace/agent/utils/inference.py'),
+                                              'tspace.agent.utils.inference.OnnxBackend.__init__': ( '07.agent.utils.inference.html#onnxbackend.__init__',
+                                                                                                     'tspace/agent/utils/inference.py'),
+                                              'tspace.agent.utils.inference.OnnxBackend.predict': ( '07.agent.utils.inference.html#onnxbackend.predict',
+                                                                                                    'tspace/agent/utils/inference.py'),
+                                              'tspace.agent.utils.inference.TFLiteBackend': ( '07.agent.utils.inference.html#tflitebackend',
+                                                                                              'tspace/agent/utils/inference.py'),
+                                              'tspace.agent.utils.inference.TFLiteBackend.__init__': ( '07.agent.utils.inference.html#tflitebackend.__init__',
+                                                                                                       'tspace/agent/utils/inference.py'),
+                                              'tspace.agent.utils.inference.TFLiteBackend.predict': ( '07.agent.utils.inference.html#tflitebackend.predict',
+                                                                                                      'tspace/agent/utils/inference.py'),
+                                              'tspace.agent.utils.inference.available_backends': ( '07.agent.utils.inference.html#available_backends',
+                                                                                                   'tspace/agent/utils/inference.py'),
+                                              'tspace.agent.utils.inference.make_backend': ( '07.agent.utils.inference.html#make_backend',
+                                                                                             'tspace/agent/utils/inference.py')},
+            'tspace.agent.utils.observation_block': { 'tspace.agent.utils.observation_block.ObservationBlock': ( '07.agent.utils.observation_block.html#observationblock',
+                                                                                                                 'tspace/agent/utils/observation_block.py'),
+                                                      'tspace.agent.utils.observation_block.ObservationBlock.__len__': ( '07.agent.utils.observation_block.html#observationblock.__len__',
+                                                                                                                         'tspace/agent/utils/observation_block.py'),
+                                                      'tspace.agent.utils.observation_block.ObservationBlock.__post_init__': ( '07.agent.utils.observation_block.html#observationblock.__post_init__',
+                                                                                                                               'tspace/agent/utils/observation_block.py'),
+                                                      'tspace.agent.utils.observation_block.ObservationBlock.append': ( '07.agent.utils.observation_block.html#observationblock.append',
+                                                                                                                        'tspace/agent/utils/observation_block.py'),
+                                                      'tspace.agent.utils.observation_block.ObservationBlock.clear': ( '07.agent.utils.observation_block.html#observationblock.clear',
+                                                                                                                       'tspace/agent/utils/observation_block.py'),
+                                                      'tspace.agent.utils.observation_block.ObservationBlock.resolve': ( '07.agent.utils.observation_block.html#observationblock.resolve',
+                                                                                                                         'tspace/agent/utils/observation_block.py'),
+                                                      'tspace.agent.utils.observation_block.ObservationBlock.sample': ( '07.agent.utils.observation_block.html#observationblock.sample',
+                                                                                                                        'tspace/agent/utils/observation_block.py')},
+            'tspace.agent.utils.ou_action_noise': { 'tspace.agent.utils.ou_action_noise.BatchedOUActionNoise': ( '07.agent.utils.ou_action_noise.html#batchedouactionnoise',
+                                                                                                                 'tspace/agent/utils/ou_action_noise.py'),
+                                                    'tspace.agent.utils.ou_action_noise.BatchedOUActionNoise.__call__': ( '07.agent.utils.ou_action_noise.html#batchedouactionnoise.__call__',
+                                                                                                                          'tspace/agent/utils/ou_action_noise.py'),
+                                                    'tspace.agent.utils.ou_action_noise.BatchedOUActionNoise.__init__': ( '07.agent.utils.ou_action_noise.html#batchedouactionnoise.__init__',
+                                                                                                                          'tspace/agent/utils/ou_action_noise.py'),
+                                                    'tspace.agent.utils.ou_action_noise.BatchedOUActionNoise.add_streams': ( '07.agent.utils.ou_action_noise.html#batchedouactionnoise.add_streams',
+                                                                                                                             'tspace/agent/utils/ou_action_noise.py'),
+                                                    'tspace.agent.utils.ou_action_noise.BatchedOUActionNoise.num_streams': ( '07.agent.utils.ou_action_noise.html#batchedouactionnoise.num_streams',
+                                                                                                                             'tspace/agent/utils/ou_action_noise.py'),
+                                                    'tspace.agent.utils.ou_action_noise.BatchedOUActionNoise.reset': ( '07.agent.utils.ou_action_noise.html#batchedouactionnoise.reset',
+                                                                                                                       'tspace/agent/utils/ou_action_noise.py'),
+                                                    'tspace.agent.utils.ou_action_noise.OUActionNoise': ( '07.agent.utils.ou_action_noise.html#ouactionnoise',
                                                                                                           'tspace/agent/utils/ou_action_noise.py'),
                                                     'tspace.agent.utils.ou_action_noise.OUActionNoise.__call__': ( '07.agent.utils.ou_action_noise.html#ouactionnoise.__call__',
                                                                                                                    'tspace/agent/utils/ou_action_noise.py'),
@@ -218,7 +345,11 @@ d = { 'settings': { 'branch': 'main',
                                'tspace.avatar.Avatar.resume': ('00.avatar.html#avatar.resume', 'tspace/avatar.py'),
                                'tspace.avatar.Avatar.trip_server': ('00.avatar.html#avatar.trip_server', 'tspace/avatar.py'),
                                'tspace.avatar.Avatar.truck': ('00.avatar.html#avatar.truck', 'tspace/avatar.py'),
-                               'tspace.avatar.main': ('00.avatar.html#main', 'tspace/avatar.py')},
+                               'tspace.avatar.get_data_root': ('00.avatar.html#get_data_root', 'tspace/avatar.py'),
+                               'tspace.avatar.main': ('00.avatar.html#main', 'tspace/avatar.py'),
+                               'tspace.avatar.main_fleet': ('00.avatar.html#main_fleet', 'tspace/avatar.py'),
+                               'tspace.avatar.main_multiprocess': ('00.avatar.html#main_multiprocess', 'tspace/avatar.py'),
+                               'tspace.avatar.make_agent': ('00.avatar.html#make_agent', 'tspace/avatar.py')},
             'tspace.config.db': {'tspace.config.db.get_db_config': ('03.config.db.html#get_db_config', 'tspace/config/db.py')},
             'tspace.config.drivers': { 'tspace.config.drivers.Driver': ('03.config.drivers.html#driver', 'tspace/config/drivers.py'),
                                        'tspace.config.drivers.Driver.__post_init__': ( '03.config.drivers.html#driver.__post_init__',
@@ -273,6 +404,26 @@ d = { 'settings': { 'branch': 'main',
                                                                                  'tspace/config/vehicles.py'),
                                         'tspace.config.vehicles.TruckInField.__post_init__': ( '03.config.vehicles.html#truckinfield.__post_init__',
                                                                                                'tspace/config/vehicles.py')},
+            'tspace.conn.remote_can_async': { 'tspace.conn.remote_can_async.AsyncRemoteCanClient': ( '04.conn.remote_can_async.html#asyncremotecanclient',
+                                                                                                     'tspace/conn/remote_can_async.py'),
+                                              'tspace.conn.remote_can_async.AsyncRemoteCanClient.__init__': ( '04.conn.remote_can_async.html#asyncremotecanclient.__init__',
+                                                                                                              'tspace/conn/remote_can_async.py'),
+                                              'tspace.conn.remote_can_async.AsyncRemoteCanClient.close': ( '04.conn.remote_can_async.html#asyncremotecanclient.close',
+                                                                                                           'tspace/conn/remote_can_async.py'),
+                                              'tspace.conn.remote_can_async.AsyncRemoteCanClient.get_signals': ( '04.conn.remote_can_async.html#asyncremotecanclient.get_signals',
+                                                                                                                 'tspace/conn/remote_can_async.py'),
+                                              'tspace.conn.remote_can_async.AsyncRemoteCanClient.get_signals_async': ( '04.conn.remote_can_async.html#asyncremotecanclient.get_signals_async',
+                                                                                                                       'tspace/conn/remote_can_async.py'),
+                                              'tspace.conn.remote_can_async.AsyncRemoteCanClient.open_session': ( '04.conn.remote_can_async.html#asyncremotecanclient.open_session',
+                                                                                                                  'tspace/conn/remote_can_async.py'),
+                                              'tspace.conn.remote_can_async.AsyncRemoteCanClient.post': ( '04.conn.remote_can_async.html#asyncremotecanclient.post',
+                                                                                                          'tspace/conn/remote_can_async.py'),
+                                              'tspace.conn.remote_can_async.AsyncRemoteCanClient.run': ( '04.conn.remote_can_async.html#asyncremotecanclient.run',
+                                                                                                         'tspace/conn/remote_can_async.py'),
+                                              'tspace.conn.remote_can_async.AsyncRemoteCanClient.send_torque_map': ( '04.conn.remote_can_async.html#asyncremotecanclient.send_torque_map',
+                                                                                                                     'tspace/conn/remote_can_async.py'),
+                                              'tspace.conn.remote_can_async.AsyncRemoteCanClient.send_torque_map_async': ( '04.conn.remote_can_async.html#asyncremotecanclient.send_torque_map_async',
+                                                                                                                           'tspace/conn/remote_can_async.py')},
             'tspace.conn.remote_can_client': { 'tspace.conn.remote_can_client.RemoteCanClient': ( '04.conn.remote_can_client.html#remotecanclient',
                                                                                                   'tspace/conn/remote_can_client.py'),
                                                'tspace.conn.remote_can_client.RemoteCanClient.__init__': ( '04.conn.remote_can_client.html#remotecanclient.__init__',
@@ -288,7 +439,11 @@ d = { 'settings': { 'branch': 'main',
                                                'tspace.conn.remote_can_client.TimeoutHTTPAdapter.__init__': ( '04.conn.remote_can_client.html#timeouthttpadapter.__init__',
                                                                                                               'tspace/conn/remote_can_client.py'),
                                                'tspace.conn.remote_can_client.TimeoutHTTPAdapter.send': ( '04.conn.remote_can_client.html#timeouthttpadapter.send',
-                                                                                                          'tspace/conn/remote_can_client.py')},
+                                                                                                          'tspace/conn/remote_can_client.py'),
+                                               'tspace.conn.remote_can_client.check_reply': ( '04.conn.remote_can_client.html#check_reply',
+                                                                                              'tspace/conn/remote_can_client.py'),
+                                               'tspace.conn.remote_can_client.torque_map_payload': ( '04.conn.remote_can_client.html#torque_map_payload',
+                                                                                                     'tspace/conn/remote_can_client.py')},
             'tspace.conn.remotecan.exceptions': { 'tspace.conn.remotecan.exceptions.RemoteCanException': ( '04.conn.remote_can_exceptions.html#remotecanexception',
                                                                                                            'tspace/conn/remotecan/exceptions.py'),
                                                   'tspace.conn.remotecan.exceptions.RemoteCanException.__post_init__': ( '04.conn.remote_can_exceptions.html#remotecanexception.__post_init__',
@@ -337,6 +492,16 @@ d = { 'settings': { 'branch': 'main',
                                   'tspace.data.core.configparser_as_dict': ( '01.data.core.html#configparser_as_dict',
                                                                              'tspace/data/core.py'),
                                   'tspace.data.core.get_filemeta_config': ('01.data.core.html#get_filemeta_config', 'tspace/data/core.py')},
+            'tspace.data.external.bson_utils': { 'tspace.data.external.bson_utils.BSONDocTemplate': ( '01.data.external.bson_utils.html#bsondoctemplate',
+                                                                                                      'tspace/data/external/bson_utils.py'),
+                                                 'tspace.data.external.bson_utils.BSONDocTemplate.compile': ( '01.data.external.bson_utils.html#bsondoctemplate.compile',
+                                                                                                              'tspace/data/external/bson_utils.py'),
+                                                 'tspace.data.external.bson_utils.BSONDocTemplate.encode': ( '01.data.external.bson_utils.html#bsondoctemplate.encode',
+                                                                                                             'tspace/data/external/bson_utils.py'),
+                                                 'tspace.data.external.bson_utils.bson_document': ( '01.data.external.bson_utils.html#bson_document',
+                                                                                                    'tspace/data/external/bson_utils.py'),
+                                                 'tspace.data.external.bson_utils.bson_element': ( '01.data.external.bson_utils.html#bson_element',
+                                                                                                   'tspace/data/external/bson_utils.py')},
             'tspace.data.external.numpy_utils': { 'tspace.data.external.numpy_utils.nan_helper_1d': ( '01.data.external.numpy_utils.html#nan_helper_1d',
                                                                                                       'tspace/data/external/numpy_utils.py'),
                                                   'tspace.data.external.numpy_utils.nan_interp_1d': ( '01.data.external.numpy_utils.html#nan_interp_1d',
@@ -357,16 +522,22 @@ d = { 'settings': { 'branch': 'main',
                                                                                                            'tspace/data/external/pandas_utils.py'),
                                                    'tspace.data.external.pandas_utils.avro_ep_encoding': ( '01.data.external.pandas_utils.html#avro_ep_encoding',
                                                                                                            'tspace/data/external/pandas_utils.py'),
+                                                   'tspace.data.external.pandas_utils.compile_nested_dict_template': ( '01.data.external.pandas_utils.html#compile_nested_dict_template',
+                                                                                                                       'tspace/data/external/pandas_utils.py'),
                                                    'tspace.data.external.pandas_utils.decode_episode_batch_to_padded_arrays': ( '01.data.external.pandas_utils.html#decode_episode_batch_to_padded_arrays',
                                                                                                                                 'tspace/data/external/pandas_utils.py'),
                                                    'tspace.data.external.pandas_utils.decode_mongo_episodes': ( '01.data.external.pandas_utils.html#decode_mongo_episodes',
                                                                                                                 'tspace/data/external/pandas_utils.py'),
+                                                   'tspace.data.external.pandas_utils.decode_mongo_episodes_to_padded_arrays': ( '01.data.external.pandas_utils.html#decode_mongo_episodes_to_padded_arrays',
+                                                                                                                                 'tspace/data/external/pandas_utils.py'),
                                                    'tspace.data.external.pandas_utils.decode_mongo_records': ( '01.data.external.pandas_utils.html#decode_mongo_records',
                                                                                                                'tspace/data/external/pandas_utils.py'),
                                                    'tspace.data.external.pandas_utils.df_to_ep_nested_dict': ( '01.data.external.pandas_utils.html#df_to_ep_nested_dict',
                                                                                                                'tspace/data/external/pandas_utils.py'),
                                                    'tspace.data.external.pandas_utils.df_to_nested_dict': ( '01.data.external.pandas_utils.html#df_to_nested_dict',
                                                                                                             'tspace/data/external/pandas_utils.py'),
+                                                   'tspace.data.external.pandas_utils.df_to_nested_dicts_by_template': ( '01.data.external.pandas_utils.html#df_to_nested_dicts_by_template',
+                                                                                                                         'tspace/data/external/pandas_utils.py'),
                                                    'tspace.data.external.pandas_utils.encode_dataframe_from_parquet': ( '01.data.external.pandas_utils.html#encode_dataframe_from_parquet',
                                                                                                                         'tspace/data/external/pandas_utils.py'),
                                                    'tspace.data.external.pandas_utils.encode_episode_dataframe_from_series': ( '01.data.external.pandas_utils.html#encode_episode_dataframe_from_series',
@@ -382,6 +553,20 @@ d = { 'settings': { 'branch': 'main',
             'tspace.data.location': { 'tspace.data.location.EosLocation': ('01.data.location.html#eoslocation', 'tspace/data/location.py'),
                                       'tspace.data.location.EosLocation.serialize_tz': ( '01.data.location.html#eoslocation.serialize_tz',
                                                                                          'tspace/data/location.py')},
+            'tspace.data.records': { 'tspace.data.records.motion_power_from_arrays': ( '01.data.records.html#motion_power_from_arrays',
+                                                                                       'tspace/data/records.py'),
+                                     'tspace.data.records.motion_power_from_frame': ( '01.data.records.html#motion_power_from_frame',
+                                                                                      'tspace/data/records.py'),
+                                     'tspace.data.records.motion_power_to_frame': ( '01.data.records.html#motion_power_to_frame',
+                                                                                    'tspace/data/records.py'),
+                                     'tspace.data.records.quadruple_dtype': ( '01.data.records.html#quadruple_dtype',
+                                                                              'tspace/data/records.py'),
+                                     'tspace.data.records.quadruples_from_frame': ( '01.data.records.html#quadruples_from_frame',
+                                                                                    'tspace/data/records.py'),
+                                     'tspace.data.records.records_from_arrow': ( '01.data.records.html#records_from_arrow',
+                                                                                 'tspace/data/records.py'),
+                                     'tspace.data.records.records_to_arrow': ( '01.data.records.html#records_to_arrow',
+                                                                               'tspace/data/records.py')},
             'tspace.data.time': {},
             'tspace.dataflow.cloud': { 'tspace.dataflow.cloud.Cloud': ('06.dataflow.cloud.html#cloud', 'tspace/dataflow/cloud.py'),
                                        'tspace.dataflow.cloud.Cloud.__post_init__': ( '06.dataflow.cloud.html#cloud.__post_init__',
@@ -444,6 +629,22 @@ d = { 'settings': { 'branch': 'main',
                                                                                                        'tspace/dataflow/filter/homo.py'),
                                              'tspace.dataflow.filter.homo.HomoFilter.filter': ( '06.dataflow.filter.homo.html#homofilter.filter',
                                                                                                 'tspace/dataflow/filter/homo.py')},
+            'tspace.dataflow.fleet': { 'tspace.dataflow.fleet.BatchedInference': ( '06.dataflow.fleet.html#batchedinference',
+                                                                                   'tspace/dataflow/fleet.py'),
+                                       'tspace.dataflow.fleet.BatchedInference.__post_init__': ( '06.dataflow.fleet.html#batchedinference.__post_init__',
+                                                                                                 'tspace/dataflow/fleet.py'),
+                                       'tspace.dataflow.fleet.BatchedInference.__str__': ( '06.dataflow.fleet.html#batchedinference.__str__',
+                                                                                           'tspace/dataflow/fleet.py'),
+                                       'tspace.dataflow.fleet.BatchedInference.gather': ( '06.dataflow.fleet.html#batchedinference.gather',
+                                                                                          'tspace/dataflow/fleet.py'),
+                                       'tspace.dataflow.fleet.BatchedInference.join': ( '06.dataflow.fleet.html#batchedinference.join',
+                                                                                        'tspace/dataflow/fleet.py'),
+                                       'tspace.dataflow.fleet.BatchedInference.predict': ( '06.dataflow.fleet.html#batchedinference.predict',
+                                                                                           'tspace/dataflow/fleet.py'),
+                                       'tspace.dataflow.fleet.BatchedInference.run': ( '06.dataflow.fleet.html#batchedinference.run',
+                                                                                       'tspace/dataflow/fleet.py'),
+                                       'tspace.dataflow.fleet.BatchedInference.start': ( '06.dataflow.fleet.html#batchedinference.start',
+                                                                                         'tspace/dataflow/fleet.py')},
             'tspace.dataflow.kvaser': { 'tspace.dataflow.kvaser.Kvaser': ('06.dataflow.kvaser.html#kvaser', 'tspace/dataflow/kvaser.py'),
                                         'tspace.dataflow.kvaser.Kvaser.__post_init__': ( '06.dataflow.kvaser.html#kvaser.__post_init__',
                                                                                          'tspace/dataflow/kvaser.py'),
@@ -455,16 +656,60 @@ d = { 'settings': { 'branch': 'main',
                                                                                          'tspace/dataflow/kvaser.py'),
                                         'tspace.dataflow.kvaser.Kvaser.init_internal_pipelines': ( '06.dataflow.kvaser.html#kvaser.init_internal_pipelines',
                                                                                                    'tspace/dataflow/kvaser.py'),
+                                        'tspace.dataflow.kvaser.Kvaser.motion_power_frame': ( '06.dataflow.kvaser.html#kvaser.motion_power_frame',
+                                                                                              'tspace/dataflow/kvaser.py'),
                                         'tspace.dataflow.kvaser.Kvaser.produce': ( '06.dataflow.kvaser.html#kvaser.produce',
                                                                                    'tspace/dataflow/kvaser.py')},
+            'tspace.dataflow.learner': { 'tspace.dataflow.learner.Learner': ( '06.dataflow.learner.html#learner',
+                                                                              'tspace/dataflow/learner.py'),
+                                         'tspace.dataflow.learner.Learner.__post_init__': ( '06.dataflow.learner.html#learner.__post_init__',
+                                                                                            'tspace/dataflow/learner.py'),
+                                         'tspace.dataflow.learner.Learner.__str__': ( '06.dataflow.learner.html#learner.__str__',
+                                                                                      'tspace/dataflow/learner.py'),
+                                         'tspace.dataflow.learner.Learner.budget': ( '06.dataflow.learner.html#learner.budget',
+                                                                                     'tspace/dataflow/learner.py'),
+                                         'tspace.dataflow.learner.Learner.has_budget': ( '06.dataflow.learner.html#learner.has_budget',
+                                                                                         'tspace/dataflow/learner.py'),
+                                         'tspace.dataflow.learner.Learner.join': ( '06.dataflow.learner.html#learner.join',
+                                                                                   'tspace/dataflow/learner.py'),
+                                         'tspace.dataflow.learner.Learner.notify_episode': ( '06.dataflow.learner.html#learner.notify_episode',
+                                                                                             'tspace/dataflow/learner.py'),
+                                         'tspace.dataflow.learner.Learner.publish': ( '06.dataflow.learner.html#learner.publish',
+                                                                                      'tspace/dataflow/learner.py'),
+                                         'tspace.dataflow.learner.Learner.run': ( '06.dataflow.learner.html#learner.run',
+                                                                                  'tspace/dataflow/learner.py'),
+                                         'tspace.dataflow.learner.Learner.start': ( '06.dataflow.learner.html#learner.start',
+                                                                                    'tspace/dataflow/learner.py'),
+                                         'tspace.dataflow.learner.Learner.sync': ( '06.dataflow.learner.html#learner.sync',
+                                                                                   'tspace/dataflow/learner.py')},
             'tspace.dataflow.pipeline.deque': { 'tspace.dataflow.pipeline.deque.PipelineDQ': ( '06.dataflow.pipeline.deque.html#pipelinedq',
                                                                                                'tspace/dataflow/pipeline/deque.py'),
+                                                'tspace.dataflow.pipeline.deque.PipelineDQ.__init__': ( '06.dataflow.pipeline.deque.html#pipelinedq.__init__',
+                                                                                                        'tspace/dataflow/pipeline/deque.py'),
                                                 'tspace.dataflow.pipeline.deque.PipelineDQ.clear': ( '06.dataflow.pipeline.deque.html#pipelinedq.clear',
                                                                                                      'tspace/dataflow/pipeline/deque.py'),
                                                 'tspace.dataflow.pipeline.deque.PipelineDQ.get_data': ( '06.dataflow.pipeline.deque.html#pipelinedq.get_data',
                                                                                                         'tspace/dataflow/pipeline/deque.py'),
                                                 'tspace.dataflow.pipeline.deque.PipelineDQ.put_data': ( '06.dataflow.pipeline.deque.html#pipelinedq.put_data',
-                                                                                                        'tspace/dataflow/pipeline/deque.py')},
+                                                                                                        'tspace/dataflow/pipeline/deque.py'),
+                                                'tspace.dataflow.pipeline.deque.PipelineDQ.wake': ( '06.dataflow.pipeline.deque.html#pipelinedq.wake',
+                                                                                                    'tspace/dataflow/pipeline/deque.py')},
+            'tspace.dataflow.pipeline.event': { 'tspace.dataflow.pipeline.event.NotifyingEvent': ( '06.dataflow.pipeline.event.html#notifyingevent',
+                                                                                                   'tspace/dataflow/pipeline/event.py'),
+                                                'tspace.dataflow.pipeline.event.NotifyingEvent.__init__': ( '06.dataflow.pipeline.event.html#notifyingevent.__init__',
+                                                                                                            'tspace/dataflow/pipeline/event.py'),
+                                                'tspace.dataflow.pipeline.event.NotifyingEvent._notify': ( '06.dataflow.pipeline.event.html#notifyingevent._notify',
+                                                                                                           'tspace/dataflow/pipeline/event.py'),
+                                                'tspace.dataflow.pipeline.event.NotifyingEvent.clear': ( '06.dataflow.pipeline.event.html#notifyingevent.clear',
+                                                                                                         'tspace/dataflow/pipeline/event.py'),
+                                                'tspace.dataflow.pipeline.event.NotifyingEvent.set': ( '06.dataflow.pipeline.event.html#notifyingevent.set',
+                                                                                                       'tspace/dataflow/pipeline/event.py'),
+                                                'tspace.dataflow.pipeline.event.NotifyingEvent.subscribe': ( '06.dataflow.pipeline.event.html#notifyingevent.subscribe',
+                                                                                                             'tspace/dataflow/pipeline/event.py'),
+                                                'tspace.dataflow.pipeline.event.NotifyingEvent.unsubscribe': ( '06.dataflow.pipeline.event.html#notifyingevent.unsubscribe',
+                                                                                                               'tspace/dataflow/pipeline/event.py'),
+                                                'tspace.dataflow.pipeline.event.wait_for_events': ( '06.dataflow.pipeline.event.html#wait_for_events',
+                                                                                                    'tspace/dataflow/pipeline/event.py')},
             'tspace.dataflow.pipeline.queue': { 'tspace.dataflow.pipeline.queue.Pipeline': ( '06.dataflow.pipeline.queue.html#pipeline',
                                                                                              'tspace/dataflow/pipeline/queue.py'),
                                                 'tspace.dataflow.pipeline.queue.Pipeline.clear': ( '06.dataflow.pipeline.queue.html#pipeline.clear',
@@ -473,12 +718,106 @@ d = { 'settings': { 'branch': 'main',
                                                                                                       'tspace/dataflow/pipeline/queue.py'),
                                                 'tspace.dataflow.pipeline.queue.Pipeline.put_data': ( '06.dataflow.pipeline.queue.html#pipeline.put_data',
                                                                                                       'tspace/dataflow/pipeline/queue.py')},
+            'tspace.dataflow.pipeline.ring': { 'tspace.dataflow.pipeline.ring.PipelineRing': ( '06.dataflow.pipeline.ring.html#pipelinering',
+                                                                                               'tspace/dataflow/pipeline/ring.py'),
+                                               'tspace.dataflow.pipeline.ring.PipelineRing.__init__': ( '06.dataflow.pipeline.ring.html#pipelinering.__init__',
+                                                                                                        'tspace/dataflow/pipeline/ring.py'),
+                                               'tspace.dataflow.pipeline.ring.PipelineRing.clear': ( '06.dataflow.pipeline.ring.html#pipelinering.clear',
+                                                                                                     'tspace/dataflow/pipeline/ring.py'),
+                                               'tspace.dataflow.pipeline.ring.PipelineRing.get_data': ( '06.dataflow.pipeline.ring.html#pipelinering.get_data',
+                                                                                                        'tspace/dataflow/pipeline/ring.py'),
+                                               'tspace.dataflow.pipeline.ring.PipelineRing.put_data': ( '06.dataflow.pipeline.ring.html#pipelinering.put_data',
+                                                                                                        'tspace/dataflow/pipeline/ring.py'),
+                                               'tspace.dataflow.pipeline.ring.PipelineRing.qsize': ( '06.dataflow.pipeline.ring.html#pipelinering.qsize',
+                                                                                                     'tspace/dataflow/pipeline/ring.py'),
+                                               'tspace.dataflow.pipeline.ring.PipelineRing.stats': ( '06.dataflow.pipeline.ring.html#pipelinering.stats',
+                                                                                                     'tspace/dataflow/pipeline/ring.py'),
+                                               'tspace.dataflow.pipeline.ring.RingPolicy': ( '06.dataflow.pipeline.ring.html#ringpolicy',
+                                                                                             'tspace/dataflow/pipeline/ring.py')},
+            'tspace.dataflow.pipeline.shm': { 'tspace.dataflow.pipeline.shm.MotionPowerPipelineShm': ( '06.dataflow.pipeline.shm.html#motionpowerpipelineshm',
+                                                                                                       'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.MotionPowerPipelineShm.__init__': ( '06.dataflow.pipeline.shm.html#motionpowerpipelineshm.__init__',
+                                                                                                                'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.MotionPowerPipelineShm.decode': ( '06.dataflow.pipeline.shm.html#motionpowerpipelineshm.decode',
+                                                                                                              'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.MotionPowerPipelineShm.encode': ( '06.dataflow.pipeline.shm.html#motionpowerpipelineshm.encode',
+                                                                                                              'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.PipelineShm': ( '06.dataflow.pipeline.shm.html#pipelineshm',
+                                                                                            'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.PipelineShm.__getstate__': ( '06.dataflow.pipeline.shm.html#pipelineshm.__getstate__',
+                                                                                                         'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.PipelineShm.__init__': ( '06.dataflow.pipeline.shm.html#pipelineshm.__init__',
+                                                                                                     'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.PipelineShm.clear': ( '06.dataflow.pipeline.shm.html#pipelineshm.clear',
+                                                                                                  'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.PipelineShm.close': ( '06.dataflow.pipeline.shm.html#pipelineshm.close',
+                                                                                                  'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.PipelineShm.decode': ( '06.dataflow.pipeline.shm.html#pipelineshm.decode',
+                                                                                                   'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.PipelineShm.empty': ( '06.dataflow.pipeline.shm.html#pipelineshm.empty',
+                                                                                                  'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.PipelineShm.encode': ( '06.dataflow.pipeline.shm.html#pipelineshm.encode',
+                                                                                                   'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.PipelineShm.get': ( '06.dataflow.pipeline.shm.html#pipelineshm.get',
+                                                                                                'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.PipelineShm.get_data': ( '06.dataflow.pipeline.shm.html#pipelineshm.get_data',
+                                                                                                     'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.PipelineShm.put': ( '06.dataflow.pipeline.shm.html#pipelineshm.put',
+                                                                                                'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.PipelineShm.put_data': ( '06.dataflow.pipeline.shm.html#pipelineshm.put_data',
+                                                                                                     'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.PipelineShm.qsize': ( '06.dataflow.pipeline.shm.html#pipelineshm.qsize',
+                                                                                                  'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.PipelineShm.slots': ( '06.dataflow.pipeline.shm.html#pipelineshm.slots',
+                                                                                                  'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.TorqueTablePipelineShm': ( '06.dataflow.pipeline.shm.html#torquetablepipelineshm',
+                                                                                                       'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.TorqueTablePipelineShm.__init__': ( '06.dataflow.pipeline.shm.html#torquetablepipelineshm.__init__',
+                                                                                                                'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.TorqueTablePipelineShm.decode': ( '06.dataflow.pipeline.shm.html#torquetablepipelineshm.decode',
+                                                                                                              'tspace/dataflow/pipeline/shm.py'),
+                                              'tspace.dataflow.pipeline.shm.TorqueTablePipelineShm.encode': ( '06.dataflow.pipeline.shm.html#torquetablepipelineshm.encode',
+                                                                                                              'tspace/dataflow/pipeline/shm.py')},
             'tspace.dataflow.producer': { 'tspace.dataflow.producer.Producer': ( '06.dataflow.producer.html#producer',
                                                                                  'tspace/dataflow/producer.py'),
                                           'tspace.dataflow.producer.Producer.__post_init__': ( '06.dataflow.producer.html#producer.__post_init__',
                                                                                                'tspace/dataflow/producer.py'),
                                           'tspace.dataflow.producer.Producer.produce': ( '06.dataflow.producer.html#producer.produce',
                                                                                          'tspace/dataflow/producer.py')},
+            'tspace.dataflow.scheduler': { 'tspace.dataflow.scheduler.Backoff': ( '06.dataflow.scheduler.html#backoff',
+                                                                                  'tspace/dataflow/scheduler.py'),
+                                           'tspace.dataflow.scheduler.Backoff.next': ( '06.dataflow.scheduler.html#backoff.next',
+                                                                                       'tspace/dataflow/scheduler.py'),
+                                           'tspace.dataflow.scheduler.Backoff.reset': ( '06.dataflow.scheduler.html#backoff.reset',
+                                                                                        'tspace/dataflow/scheduler.py'),
+                                           'tspace.dataflow.scheduler.Scheduler': ( '06.dataflow.scheduler.html#scheduler',
+                                                                                    'tspace/dataflow/scheduler.py'),
+                                           'tspace.dataflow.scheduler.Scheduler.__post_init__': ( '06.dataflow.scheduler.html#scheduler.__post_init__',
+                                                                                                  'tspace/dataflow/scheduler.py'),
+                                           'tspace.dataflow.scheduler.Scheduler.__str__': ( '06.dataflow.scheduler.html#scheduler.__str__',
+                                                                                            'tspace/dataflow/scheduler.py'),
+                                           'tspace.dataflow.scheduler.Scheduler.call_every': ( '06.dataflow.scheduler.html#scheduler.call_every',
+                                                                                               'tspace/dataflow/scheduler.py'),
+                                           'tspace.dataflow.scheduler.Scheduler.call_later': ( '06.dataflow.scheduler.html#scheduler.call_later',
+                                                                                               'tspace/dataflow/scheduler.py'),
+                                           'tspace.dataflow.scheduler.Scheduler.pending': ( '06.dataflow.scheduler.html#scheduler.pending',
+                                                                                            'tspace/dataflow/scheduler.py'),
+                                           'tspace.dataflow.scheduler.Scheduler.pop_due': ( '06.dataflow.scheduler.html#scheduler.pop_due',
+                                                                                            'tspace/dataflow/scheduler.py'),
+                                           'tspace.dataflow.scheduler.Scheduler.run': ( '06.dataflow.scheduler.html#scheduler.run',
+                                                                                        'tspace/dataflow/scheduler.py'),
+                                           'tspace.dataflow.scheduler.Scheduler.schedule': ( '06.dataflow.scheduler.html#scheduler.schedule',
+                                                                                             'tspace/dataflow/scheduler.py'),
+                                           'tspace.dataflow.scheduler.Scheduler.start': ( '06.dataflow.scheduler.html#scheduler.start',
+                                                                                          'tspace/dataflow/scheduler.py'),
+                                           'tspace.dataflow.scheduler.Scheduler.stop': ( '06.dataflow.scheduler.html#scheduler.stop',
+                                                                                         'tspace/dataflow/scheduler.py'),
+                                           'tspace.dataflow.scheduler.Timer': ( '06.dataflow.scheduler.html#timer',
+                                                                                'tspace/dataflow/scheduler.py'),
+                                           'tspace.dataflow.scheduler.Timer.active': ( '06.dataflow.scheduler.html#timer.active',
+                                                                                       'tspace/dataflow/scheduler.py'),
+                                           'tspace.dataflow.scheduler.Timer.cancel': ( '06.dataflow.scheduler.html#timer.cancel',
+                                                                                       'tspace/dataflow/scheduler.py')},
             'tspace.dataflow.vehicle_interface': { 'tspace.dataflow.vehicle_interface.VehicleInterface': ( '06.dataflow.vehicle_interface.html#vehicleinterface',
                                                                                                            'tspace/dataflow/vehicle_interface.py'),
                                                    'tspace.dataflow.vehicle_interface.VehicleInterface.__post_init__': ( '06.dataflow.vehicle_interface.html#vehicleinterface.__post_init__',
@@ -501,6 +840,10 @@ d = { 'settings': { 'branch': 'main',
                                                                                                                         'tspace/dataflow/vehicle_interface.py'),
                                                    'tspace.dataflow.vehicle_interface.VehicleInterface.produce': ( '06.dataflow.vehicle_interface.html#vehicleinterface.produce',
                                                                                                                    'tspace/dataflow/vehicle_interface.py'),
+                                                   'tspace.dataflow.vehicle_interface.VehicleInterface.stamp_table_versions': ( '06.dataflow.vehicle_interface.html#vehicleinterface.stamp_table_versions',
+                                                                                                                                'tspace/dataflow/vehicle_interface.py'),
+                                                   'tspace.dataflow.vehicle_interface.VehicleInterface.table_version_at': ( '06.dataflow.vehicle_interface.html#vehicleinterface.table_version_at',
+                                                                                                                            'tspace/dataflow/vehicle_interface.py'),
                                                    'tspace.dataflow.vehicle_interface.VehicleInterface.watch_dog': ( '06.dataflow.vehicle_interface.html#vehicleinterface.watch_dog',
                                                                                                                      'tspace/dataflow/vehicle_interface.py')},
             'tspace.sandbox': { 'tspace.sandbox.HelloSayer': ('sandbox.html#hellosayer', 'tspace/sandbox.py'),
@@ -518,6 +861,10 @@ d = { 'settings': { 'branch': 'main',
                                                                                                          'tspace/storage/buffer/buffer.py'),
                                               'tspace.storage.buffer.buffer.Buffer.__post_init__': ( '05.storage.buffer.buffer.html#buffer.__post_init__',
                                                                                                      'tspace/storage/buffer/buffer.py'),
+                                              'tspace.storage.buffer.buffer.Buffer.bucket_queries': ( '05.storage.buffer.buffer.html#buffer.bucket_queries',
+                                                                                                      'tspace/storage/buffer/buffer.py'),
+                                              'tspace.storage.buffer.buffer.Buffer.bucket_query': ( '05.storage.buffer.buffer.html#buffer.bucket_query',
+                                                                                                    'tspace/storage/buffer/buffer.py'),
                                               'tspace.storage.buffer.buffer.Buffer.close': ( '05.storage.buffer.buffer.html#buffer.close',
                                                                                              'tspace/storage/buffer/buffer.py'),
                                               'tspace.storage.buffer.buffer.Buffer.find': ( '05.storage.buffer.buffer.html#buffer.find',
@@ -527,7 +874,9 @@ d = { 'settings': { 'branch': 'main',
                                               'tspace.storage.buffer.buffer.Buffer.sample': ( '05.storage.buffer.buffer.html#buffer.sample',
                                                                                               'tspace/storage/buffer/buffer.py'),
                                               'tspace.storage.buffer.buffer.Buffer.store': ( '05.storage.buffer.buffer.html#buffer.store',
-                                                                                             'tspace/storage/buffer/buffer.py')},
+                                                                                             'tspace/storage/buffer/buffer.py'),
+                                              'tspace.storage.buffer.buffer.tbptt_bucket_edges': ( '05.storage.buffer.buffer.html#tbptt_bucket_edges',
+                                                                                                   'tspace/storage/buffer/buffer.py')},
             'tspace.storage.buffer.dask': { 'tspace.storage.buffer.dask.DaskBuffer': ( '05.storage.buffer.dask.html#daskbuffer',
                                                                                        'tspace/storage/buffer/dask.py'),
                                             'tspace.storage.buffer.dask.DaskBuffer.__post_init__': ( '05.storage.buffer.dask.html#daskbuffer.__post_init__',
@@ -568,6 +917,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                                 'tspace/storage/pool/avro/avro.py'),
                                                'tspace.storage.pool.avro.avro.AvroPool.get_query': ( '05.storage.pool.avro.avro.html#avropool.get_query',
                                                                                                      'tspace/storage/pool/avro/avro.py'),
+                                               'tspace.storage.pool.avro.avro.AvroPool.length_query': ( '05.storage.pool.avro.avro.html#avropool.length_query',
+                                                                                                        'tspace/storage/pool/avro/avro.py'),
                                                'tspace.storage.pool.avro.avro.AvroPool.load': ( '05.storage.pool.avro.avro.html#avropool.load',
                                                                                                 'tspace/storage/pool/avro/avro.py'),
                                                'tspace.storage.pool.avro.avro.AvroPool.remove_episode': ( '05.storage.pool.avro.avro.html#avropool.remove_episode',
@@ -608,16 +959,22 @@ d = { 'settings': { 'branch': 'main',
                                                                                            'tspace/storage/pool/mongo.py'),
                                            'tspace.storage.pool.mongo.MongoPool.drop_collection': ( '05.storage.pool.mongo.html#mongopool.drop_collection',
                                                                                                     'tspace/storage/pool/mongo.py'),
+                                           'tspace.storage.pool.mongo.MongoPool.encode_observations': ( '05.storage.pool.mongo.html#mongopool.encode_observations',
+                                                                                                        'tspace/storage/pool/mongo.py'),
                                            'tspace.storage.pool.mongo.MongoPool.find': ( '05.storage.pool.mongo.html#mongopool.find',
                                                                                          'tspace/storage/pool/mongo.py'),
                                            'tspace.storage.pool.mongo.MongoPool.find_item': ( '05.storage.pool.mongo.html#mongopool.find_item',
                                                                                               'tspace/storage/pool/mongo.py'),
+                                           'tspace.storage.pool.mongo.MongoPool.get_doc_template': ( '05.storage.pool.mongo.html#mongopool.get_doc_template',
+                                                                                                     'tspace/storage/pool/mongo.py'),
                                            'tspace.storage.pool.mongo.MongoPool.load': ( '05.storage.pool.mongo.html#mongopool.load',
                                                                                          'tspace/storage/pool/mongo.py'),
                                            'tspace.storage.pool.mongo.MongoPool.parse_query': ( '05.storage.pool.mongo.html#mongopool.parse_query',
                                                                                                 'tspace/storage/pool/mongo.py'),
                                            'tspace.storage.pool.mongo.MongoPool.sample': ( '05.storage.pool.mongo.html#mongopool.sample',
                                                                                            'tspace/storage/pool/mongo.py'),
+                                           'tspace.storage.pool.mongo.MongoPool.sample_docs': ( '05.storage.pool.mongo.html#mongopool.sample_docs',
+                                                                                                'tspace/storage/pool/mongo.py'),
                                            'tspace.storage.pool.mongo.MongoPool.store': ( '05.storage.pool.mongo.html#mongopool.store',
                                                                                           'tspace/storage/pool/mongo.py'),
                                            'tspace.storage.pool.mongo.MongoPool.store_episode': ( '05.storage.pool.mongo.html#mongopool.store_episode',
@@ -668,6 +1025,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                     'tspace/storage/pool/pool.py'),
                                           'tspace.storage.pool.pool.Pool.find': ( '05.storage.pool.pool.html#pool.find',
                                                                                   'tspace/storage/pool/pool.py'),
+                                          'tspace.storage.pool.pool.Pool.length_query': ( '05.storage.pool.pool.html#pool.length_query',
+                                                                                          'tspace/storage/pool/pool.py'),
                                           'tspace.storage.pool.pool.Pool.load': ( '05.storage.pool.pool.html#pool.load',
                                                                                   'tspace/storage/pool/pool.py'),
                                           'tspace.storage.pool.pool.Pool.sample': ( '05.storage.pool.pool.html#pool.sample',
@@ -688,9 +1047,57 @@ d = { 'settings': { 'branch': 'main',
                                                                                                           'tspace/system/graceful_killer.py'),
                                                'tspace.system.graceful_killer.GracefulKiller.exit_gracefully': ( '02.system.gracefulkiller.html#gracefulkiller.exit_gracefully',
                                                                                                                  'tspace/system/graceful_killer.py')},
-            'tspace.system.log': {'tspace.system.log.set_root_logger': ('02.system.log.html#set_root_logger', 'tspace/system/log.py')},
+            'tspace.system.log': { 'tspace.system.log.RingQueueHandler': ('02.system.log.html#ringqueuehandler', 'tspace/system/log.py'),
+                                   'tspace.system.log.RingQueueHandler.__init__': ( '02.system.log.html#ringqueuehandler.__init__',
+                                                                                    'tspace/system/log.py'),
+                                   'tspace.system.log.RingQueueHandler.enqueue': ( '02.system.log.html#ringqueuehandler.enqueue',
+                                                                                   'tspace/system/log.py'),
+                                   'tspace.system.log.RingQueueHandler.prepare': ( '02.system.log.html#ringqueuehandler.prepare',
+                                                                                   'tspace/system/log.py'),
+                                   'tspace.system.log.RingQueueListener': ('02.system.log.html#ringqueuelistener', 'tspace/system/log.py'),
+                                   'tspace.system.log.RingQueueListener.__init__': ( '02.system.log.html#ringqueuelistener.__init__',
+                                                                                     'tspace/system/log.py'),
+                                   'tspace.system.log.RingQueueListener.enqueue_sentinel': ( '02.system.log.html#ringqueuelistener.enqueue_sentinel',
+                                                                                             'tspace/system/log.py'),
+                                   'tspace.system.log.ThreadSamplingFilter': ( '02.system.log.html#threadsamplingfilter',
+                                                                               'tspace/system/log.py'),
+                                   'tspace.system.log.ThreadSamplingFilter.__init__': ( '02.system.log.html#threadsamplingfilter.__init__',
+                                                                                        'tspace/system/log.py'),
+                                   'tspace.system.log.ThreadSamplingFilter.filter': ( '02.system.log.html#threadsamplingfilter.filter',
+                                                                                      'tspace/system/log.py'),
+                                   'tspace.system.log.set_root_logger': ('02.system.log.html#set_root_logger', 'tspace/system/log.py')},
             'tspace.system.plot': { 'tspace.system.plot.plot_3d_figure': ('02.system.plot.html#plot_3d_figure', 'tspace/system/plot.py'),
                                     'tspace.system.plot.plot_to_image': ('02.system.plot.html#plot_to_image', 'tspace/system/plot.py')},
+            'tspace.system.trace': { 'tspace.system.trace.LatencyHistogram': ( '02.system.trace.html#latencyhistogram',
+                                                                               'tspace/system/trace.py'),
+                                     'tspace.system.trace.LatencyHistogram.__init__': ( '02.system.trace.html#latencyhistogram.__init__',
+                                                                                        'tspace/system/trace.py'),
+                                     'tspace.system.trace.LatencyHistogram.bucket_index': ( '02.system.trace.html#latencyhistogram.bucket_index',
+                                                                                            'tspace/system/trace.py'),
+                                     'tspace.system.trace.LatencyHistogram.bucket_upper_bound': ( '02.system.trace.html#latencyhistogram.bucket_upper_bound',
+                                                                                                  'tspace/system/trace.py'),
+                                     'tspace.system.trace.LatencyHistogram.record': ( '02.system.trace.html#latencyhistogram.record',
+                                                                                      'tspace/system/trace.py'),
+                                     'tspace.system.trace.LatencyHistogram.summary': ( '02.system.trace.html#latencyhistogram.summary',
+                                                                                       'tspace/system/trace.py'),
+                                     'tspace.system.trace.LatencyHistogram.value_at_percentile': ( '02.system.trace.html#latencyhistogram.value_at_percentile',
+                                                                                                   'tspace/system/trace.py'),
+                                     'tspace.system.trace.StageTracer': ('02.system.trace.html#stagetracer', 'tspace/system/trace.py'),
+                                     'tspace.system.trace.StageTracer.__init__': ( '02.system.trace.html#stagetracer.__init__',
+                                                                                   'tspace/system/trace.py'),
+                                     'tspace.system.trace.StageTracer.flush': ( '02.system.trace.html#stagetracer.flush',
+                                                                                'tspace/system/trace.py'),
+                                     'tspace.system.trace.StageTracer.reset': ( '02.system.trace.html#stagetracer.reset',
+                                                                                'tspace/system/trace.py'),
+                                     'tspace.system.trace.StageTracer.span': ( '02.system.trace.html#stagetracer.span',
+                                                                               'tspace/system/trace.py'),
+                                     'tspace.system.trace.StageTracer.stop': ( '02.system.trace.html#stagetracer.stop',
+                                                                               'tspace/system/trace.py'),
+                                     'tspace.system.trace.StageTracer.summary': ( '02.system.trace.html#stagetracer.summary',
+                                                                                  'tspace/system/trace.py'),
+                                     'tspace.system.trace.StageTracer.write_summary': ( '02.system.trace.html#stagetracer.write_summary',
+                                                                                        'tspace/system/trace.py'),
+                                     'tspace.system.trace.get_tracer': ('02.system.trace.html#get_tracer', 'tspace/system/trace.py')},
             'tspace.utils': { 'tspace.utils.generate_action': ('utils.html#generate_action', 'tspace/utils.py'),
                               'tspace.utils.generate_df_multiindex': ('utils.html#generate_df_multiindex', 'tspace/utils.py'),
                               'tspace.utils.generate_eos_df': ('utils.html#generate_eos_df', 'tspace/utils.py'),
@@ -3,6 +3,7 @@
 # %% ../../nbs/07.agent.ddpg.ipynb 3
 from __future__ import annotations
 import os
+import time
 from contextlib import redirect_stdout
 from dataclasses import dataclass
 from pathlib import Path
@@ -11,19 +12,22 @@ import numpy as np
 import pandas as pd
 import tensorflow as tf
 from tensorflow import keras
-from typeguard import check_type
 
 # %% auto 0
 __all__ = ['DDPG']
 
 # %% ../../nbs/07.agent.ddpg.ipynb 4
 from .dpg import DPG
+from ..config.drivers import Driver
+from ..config.vehicles import Truck
 from tspace.agent.utils.hyperparams import (
     HyperParamDDPG,
     HyperParamRDPG,
     HyperParamIDQL,
 )
-from .utils.ou_action_noise import OUActionNoise
+from .utils.ou_action_noise import BatchedOUActionNoise
+from .utils.inference import InferenceBackend, make_backend
+from .utils.checkpoint import async_checkpoint_options
 from ..storage.buffer.dask import DaskBuffer
 from ..storage.buffer.mongo import MongoBuffer
 from ..data.core import PoolQuery  # type: ignore
@@ -54,6 +58,8 @@ class DDPG(DPG):
             target actor network, default is None
         _target_critic_model: Optional[tf.keras.Model] = None
             target critic network, default is None
+        _acting_actor_model: Optional[tf.keras.Model] = None
+            acting copy of the actor network for inference, default is None
         manager_critic: Optional[tf.train.CheckpointManager] = None
             manager for saving critic network, default is None
         ckpt_critic: Optional[tf.train.Checkpoint] = None
@@ -66,6 +72,12 @@ class DDPG(DPG):
             path for saving actor network as saved model, default is None
         critic_saved_model_path: Optional[Path] = None
             path for saving critic network as saved model, default is None
+        inference_backend: str = "keras"
+            runtime of the acting actor, "keras", "tflite" or "onnx", default is "keras"
+        backend: Optional[InferenceBackend] = None
+            acting actor exported into the inference backend, default is None
+        noise_seed: Optional[int] = None
+            seed of the exploration noise streams, default is None for fresh entropy
 
     """
 
@@ -85,6 +97,9 @@ class DDPG(DPG):
     _target_critic_model: Optional[tf.keras.Model] = (
         None  # field(default_factory=tf.keras.Model)
     )
+    _acting_actor_model: Optional[tf.keras.Model] = (
+        None  # field(default_factory=tf.keras.Model)
+    )
     manager_critic: Optional[tf.train.CheckpointManager] = (
         None  # manager_critic_default
     )
@@ -93,6 +108,9 @@ class DDPG(DPG):
     ckpt_actor: Optional[tf.train.Checkpoint] = None  # ckpt_actor_default
     actor_saved_model_path: Optional[Path] = None  # Path("./actor")
     critic_saved_model_path: Optional[Path] = None  # Path("./critic")
+    inference_backend: str = "keras"  # "keras", "tflite" or "onnx"
+    backend: Optional[InferenceBackend] = None
+    noise_seed: Optional[int] = None  # seed of the exploration noise streams
 
     def __post_init__(self):
         """initialize the DDPG agent, including buffer, hyperparameters, networks, optimizers, checkpoints, etc."""
@@ -154,6 +172,16 @@ class DDPG(DPG):
             self.hyper_param.ActionBias,  # 0.0
         )
 
+        # acting copy for inference, so that training never mutates the actor in use
+        self.acting_actor_model = self.get_actor(
+            self.truck.observation_numel,
+            self.truck.torque_flash_numel,
+            self.hyper_param.ActorInputDenseDimension1,  # 256
+            self.hyper_param.ActorInputDenseDimension2,  # 256
+            self.hyper_param.NLayerActor,  # 2
+            self.hyper_param.ActionBias,  # 0.0
+        )
+
         self.critic_model = self.get_critic(
             self.truck.observation_numel,
             self.truck.torque_flash_numel,
@@ -183,14 +211,16 @@ class DDPG(DPG):
             self.hyper_param.CriticLR
         )  # 0.002
 
-        # ou_noise is a row vector of num_actions dimension
+        # ou_noise has a row vector of num_actions dimension for each stream, fleet copies add their own streams
         self.ou_noise_std_dev = 0.2
-        self.ou_noise = OUActionNoise(
+        self.ou_noise = BatchedOUActionNoise(
             mean=np.zeros(self.truck.torque_flash_numel),
             std_deviation=float(self.ou_noise_std_dev)
             * np.ones(self.truck.torque_flash_numel),
+            seed=self.noise_seed,
         )
         self.init_checkpoint()
+        self.swap_backend()
         # super().__post_init__()
         self.touch_gpu()
 
@@ -327,6 +357,7 @@ class DDPG(DPG):
 
         # Making the weights equal initially after checkpoints load
         self.target_actor_model.set_weights(self.actor_model.get_weights())
+        self.acting_actor_model.set_weights(self.actor_model.get_weights())
         self.target_critic_model.set_weights(self.critic_model.get_weights())
 
         self.actor_saved_model_path = Path(self.data_folder).joinpath(
@@ -412,18 +443,26 @@ class DDPG(DPG):
                 tf.lite.experimental.Analyzer.analyze(tflite_file_path)
 
     def save_ckpt(self):
-        """Save checkpoints for the actor and critic networks"""
+        """
+        Save checkpoints for the actor and critic networks.
+
+        The checkpoints are written in the background, see `async_checkpoint_options`.
+        """
 
         if int(self.ckpt_actor.step) % self.hyper_param.CkptInterval == 0:  # type: ignore
-            save_path_actor = self.manager_actor.save()
+            save_path_actor = self.manager_actor.save(
+                options=async_checkpoint_options()
+            )
             self.logger.info(
-                f"Saved checkpoint for step {int(self.ckpt_actor.step)}: {save_path_actor}",  # type: ignore
+                f"Saving checkpoint for step {int(self.ckpt_actor.step)}: {save_path_actor}",  # type: ignore
                 extra=self.dict_logger,
             )
         if int(self.ckpt_critic.step) % self.hyper_param.CkptInterval == 0:  # type: ignore
-            save_path_critic = self.manager_critic.save()
+            save_path_critic = self.manager_critic.save(
+                options=async_checkpoint_options()
+            )
             self.logger.info(
-                f"Saved checkpoint for step {int(self.ckpt_actor.step)}: {save_path_critic}",  # type: ignore
+                f"Saving checkpoint for step {int(self.ckpt_actor.step)}: {save_path_critic}",  # type: ignore
                 extra=self.dict_logger,
             )
         self.ckpt_actor.step.assign_add(1)  # type: ignore
@@ -594,22 +633,14 @@ class DDPG(DPG):
 
         # We make sure action is within bounds
         # legal_action = np.clip(sampled_actions, action_lower, action_upper)
-        # get flat interleaved (not column-wise stacked) tensor from dataframe
-        state_flat = None
-        try:
-            state_flat = tf.convert_to_tensor(
-                state.values, dtype=tf.float32
-            )  # pd.Series values already flattened.
-        except Exception as e:
-            print(f"Exception: {e}")
-
-        states = tf.expand_dims(
-            check_type(state_flat, tf.Tensor), 0
-        )  # motion states is 30*3 matrix
-        sampled_actions = self.infer_single_sample(states)
+        # get flat interleaved (not column-wise stacked) array from dataframe
+        states = np.expand_dims(
+            state.values.astype(np.float32), 0
+        )  # pd.Series values already flattened, add the batch dimension
+        sampled_actions = self.backend.predict(states)[0]
         self.logger.info(f"Inference DDPG done!", extra=self.dict_logger)
         # return np.squeeze(sampled_actions)  # ? might be unnecessary
-        return sampled_actions + self.ou_noise()
+        return sampled_actions + self.ou_noise(self.noise_stream)
 
     def actor_predict(self, state: pd.Series):
         """
@@ -618,14 +649,60 @@ class DDPG(DPG):
         """
         return self.policy(state)
 
-    @tf.function
-    def infer_single_sample(self, state_flat: tf.Tensor):
-        """Get a single sample from inferring"""
-        # logger.info(f"Tracing", extra=self.dict_logger)
-        print("Tracing infer!")
-        sampled_actions = tf.squeeze(self.actor_model(state_flat))
-        # Adding noise to action
-        return sampled_actions
+    def actor_predict_batch(
+        self,
+        states: np.ndarray,  # flat states of several trucks, [N, observation_numel]
+        streams: Optional[np.ndarray] = None,  # noise streams of the trucks, [N]
+    ) -> np.ndarray:  # actions with additive ou noise, [N, torque_flash_numel]
+        """
+        Evaluate the acting actor for the observations of several trucks in one batch.
+
+        The ou noise of all trucks is advanced in one vectorized step, each from its own stream.
+        Without streams, the rows take the streams 0..N-1.
+        """
+        sampled_actions = self.backend.predict(states)
+        if streams is None:
+            streams = np.arange(len(states))
+        missing = int(np.max(streams)) + 1 - self.ou_noise.num_streams
+        if missing > 0:
+            self.ou_noise.add_streams(missing)
+        return sampled_actions + self.ou_noise(streams)
+
+    def fleet_copy(
+        self,
+        truck: Truck,  # another truck of the same type
+        driver: Driver,  # driver of the truck
+    ) -> DDPG:
+        """Shallow copy of the agent for another truck in a fleet with its own ou noise stream, see `DPG.fleet_copy`"""
+        agent = super().fleet_copy(truck, driver)
+        agent.noise_stream = int(self.ou_noise.add_streams(1)[0])
+        return agent
+
+    def start_episode(self, ts: pd.Timestamp):
+        """initialize observation list and reset the ou noise stream of the truck"""
+        super().start_episode(ts)
+        self.ou_noise.reset(self.noise_stream)
+
+    def export_backend(self) -> InferenceBackend:
+        """Export the acting actor into a new inference backend"""
+        t0 = time.perf_counter()
+        backend = make_backend(self.inference_backend, self.acting_actor_model)
+        self.logger.info(
+            f"{{'header': 'inference backend exported', "
+            f"'backend': '{self.inference_backend}', "
+            f"'export time': {time.perf_counter() - t0:.3f}}}",
+            extra=self.dict_logger,
+        )
+        return backend
+
+    def swap_backend(self, backend: Optional[InferenceBackend] = None):
+        """
+        Swap the inference backend in, exported from the acting actor if `backend` is None.
+
+        The new backend is built aside and swapped in by a single reference assignment,
+        so a concurrent `predict` runs on either the old or the new backend.
+        """
+        self.backend = backend if backend is not None else self.export_backend()
 
     def touch_gpu(self):
         """touch gpu to initialize the graph"""
@@ -673,79 +750,12 @@ class DDPG(DPG):
                 )
 
     def sample_minibatch(self):
-        """Convert batch type from DataFrames to flattened tensors."""
-        if (
-            self.buffer.pool.cnt == 0
-        ):  # bootstrap for Episode 0 from the current self.observations list
-            self.logger.info(
-                f"no data in pool, bootstrap from observation_list, "
-                f"truck: {self.truck.vid}, driver: {self.driver.pid}.",
-                extra=self.dict_logger,
-            )
-            assert (
-                len(self.observations) > 0
-            ), "no data in temporary buffer self.observations!"
-
-            # sample from self.observations
-
-            batch_idx = np.random.choice(
-                len(self.observations), self.hyper_param.BatchSize  # 4
-            )
-            observation_samples = [
-                self.observations[i] for i in batch_idx
-            ]  # a sampled list of Series
-
-            idx = pd.IndexSlice
-            state = []
-            action = []
-            reward = []
-            nstate = []
-            for (
-                observation
-            ) in (
-                observation_samples
-            ):  # each observation is a Series, contiguous storage in rows (already flattened!)
-                state.append(
-                    observation.loc[
-                        idx["state", ["velocity", "thrust", "brake"]]
-                    ].values
-                )
-                action.append(
-                    observation.loc[idx["action", self.torque_table_row_names]].values
-                )
-                reward.append(observation.loc[idx["reward", ["work"]]].values)
-                nstate.append(
-                    observation.loc[
-                        idx["nstate", ["velocity", "thrust", "brake"]]
-                    ].values
-                )
-
-            # convert to tensors by stacking so that the first dimension is batch_size
-            states = tf.convert_to_tensor(np.stack(state), dtype=tf.float32)
-            actions = tf.convert_to_tensor(np.stack(action), dtype=tf.float32)
-            rewards = tf.convert_to_tensor(np.stack(reward), dtype=tf.float32)
-            next_states = tf.convert_to_tensor(np.stack(nstate), dtype=tf.float32)
-
-        else:  # otherwise sample from pool, ignoring the current ongoing episode to reduce complexity
-            # TODO combine current episode with pool, need evenly sampling pool and list of observations, then combine
-            # get sampling range, if not enough data, batch is small
-            self.logger.info(
-                f"start sample from pool with size: {self.hyper_param.BatchSize}, "
-                f"truck: {self.truck.vid}, driver: {self.driver.pid}.",
-                extra=self.dict_logger,
-            )
-
-            (
-                states,
-                actions,
-                rewards,
-                nstates,
-            ) = self.buffer.sample()  # for both mongo and arrow pool
-
-            states = tf.convert_to_tensor(states, dtype=tf.float32)
-            actions = tf.convert_to_tensor(actions, dtype=tf.float32)
-            rewards = tf.convert_to_tensor(rewards, dtype=tf.float32)
-            next_states = tf.convert_to_tensor(nstates, dtype=tf.float32)
+        """Convert the sampled minibatch to tensors, batch size is the first dimension."""
+        states, actions, rewards, nstates = self.sample_minibatch_arrays()
+        states = tf.convert_to_tensor(states, dtype=tf.float32)
+        actions = tf.convert_to_tensor(actions, dtype=tf.float32)
+        rewards = tf.convert_to_tensor(rewards, dtype=tf.float32)
+        next_states = tf.convert_to_tensor(nstates, dtype=tf.float32)
 
         return states, actions, rewards, next_states
 
@@ -763,6 +773,62 @@ class DDPG(DPG):
         )
         return critic_loss, actor_loss
 
+    def train_n(
+        self,
+        n: int,  # number of gradient updates
+    ) -> tuple:
+        """
+        Train the networks n times in one graph call.
+
+        The n minibatches are sampled up front and stacked along a leading update axis,
+        so that the updates and the soft target updates run in a single `tf.function` call
+        without Python dispatch in between.
+
+        Return:
+
+            tuple: (critic_loss, actor_loss) of the last update
+        raise:
+
+            ValueError: if n is not positive
+        """
+        if n < 1:
+            raise ValueError(f"number of updates must be positive, got {n}")
+        batches = [self.sample_minibatch_arrays() for _ in range(n)]
+        state_batches, action_batches, reward_batches, next_state_batches = (
+            tf.convert_to_tensor(np.stack(batch), dtype=tf.float32)
+            for batch in zip(*batches)
+        )  # [n, B, D]
+        return self.update_n(
+            state_batches, action_batches, reward_batches, next_state_batches
+        )
+
+    @tf.function(reduce_retracing=True)
+    def update_n(
+        self,
+        state_batches,  # [n, B, D]
+        action_batches,  # [n, B, D]
+        reward_batches,  # [n, B, 1]
+        next_state_batches,  # [n, B, D]
+    ):
+        """
+        Run an update and a soft target update for each of the stacked minibatches, in graph.
+
+        `tf.range` lets autograph turn the loop into a `tf.while_loop`,
+        so the graph size does not grow with the number of updates.
+        """
+        print("Tracing update_n!")
+        critic_loss = tf.constant(0.0, dtype=tf.float32)
+        actor_loss = tf.constant(0.0, dtype=tf.float32)
+        for k in tf.range(tf.shape(state_batches)[0]):
+            critic_loss, actor_loss = self.update_with_batch(
+                state_batches[k],
+                action_batches[k],
+                reward_batches[k],
+                next_state_batches[k],
+            )
+            self.soft_update_target()
+        return critic_loss, actor_loss
+
     @tf.function
     def update_with_batch(
         self,
@@ -855,6 +921,30 @@ class DDPG(DPG):
         )
         return critic_loss, actor_loss
 
+    def get_actor_weights(self) -> tuple[list[np.ndarray], Optional[InferenceBackend]]:
+        """
+        Get a copy of the moving actor weights, with a new backend exported from them
+        if the backend is a snapshot (tflite or onnx).
+
+        It's called by the publishing thread, i.e. the learner, so the conversion
+        never stalls the inference; the acting actor is then only the export source.
+        """
+        weights = self.actor_model.get_weights()
+        if self.inference_backend == "keras":  # keras runs the acting actor in place
+            return weights, None
+        self.acting_actor_model.set_weights(weights)
+        return weights, self.export_backend()
+
+    def set_acting_weights(
+        self, snapshot: tuple[list[np.ndarray], Optional[InferenceBackend]]
+    ):
+        """Load a snapshot from `get_actor_weights` into the acting actor, or only swap in its exported backend"""
+        weights, backend = snapshot
+        if backend is None:
+            self.acting_actor_model.set_weights(weights)
+        else:
+            self.swap_backend(backend)
+
     @property
     def actor_model(self) -> tf.keras.Model:
         return self._actor_model
@@ -886,3 +976,11 @@ class DDPG(DPG):
     @target_critic_model.setter
     def target_critic_model(self, target_critic_model: tf.keras.Model):
         self._target_critic_model = target_critic_model
+
+    @property
+    def acting_actor_model(self) -> tf.keras.Model:
+        return self._acting_actor_model
+
+    @acting_actor_model.setter
+    def acting_actor_model(self, acting_actor_model: tf.keras.Model):
+        self._acting_actor_model = acting_actor_model
@@ -3,11 +3,13 @@
 # %% ../../nbs/07.agent.dpg.ipynb 3
 from __future__ import annotations
 import abc
+import copy
 import re
 from collections.abc import Hashable
 from dataclasses import dataclass
 from typing import ClassVar, Optional, Union
 import logging
+import numpy as np
 import pandas as pd
 
 # %% auto 0
@@ -35,6 +37,7 @@ from tspace.data.external.pandas_utils import (
 
 # %% ../../nbs/07.agent.dpg.ipynb 5
 from .utils.hyperparams import HyperParamDDPG, HyperParamRDPG, HyperParamIDQL  # type: ignore
+from .utils.observation_block import ObservationBlock
 
 # %% ../../nbs/07.agent.dpg.ipynb 8
 @dataclass(kw_only=True)
@@ -59,9 +62,12 @@ class DPG(Hashable):
         -observation_meta: metadata of the observation, either from Cloud or from Kvaser
         _torque_table_row_name: list of str, ['r0', 'r1', 'r2', ...]
         _observations: list of pd.Series, the observation quadruple (s, a, r, s')
+        _observation_block: ObservationBlock, numeric columns of the observations of the current episode for sampling
         _epi_no: int, sequence number of the episode
         logger: logging.Logger, logging object
         dict_logger: dict, logging format specs
+        episode_mix_ratio: float, fraction of a minibatch drawn from the current episode when sampling from the pool, RECORD agents only
+        noise_stream: int, index of the exploration noise stream of the truck in a fleet
     """
 
     truck_type: ClassVar[Truck] = trucks_by_id[
@@ -98,9 +104,12 @@ class DPG(Hashable):
     _observations: Optional[list[pd.Series]] = (
         None  # field(default_factory=list[pd.Series])
     )
+    _observation_block: Optional[ObservationBlock] = None
     _epi_no: Optional[int] = None
     logger: Optional[logging.Logger] = None  # logging.Logger("eos.agent.ddpg.ddpg")
     dict_logger: Optional[dict] = None  # dict_logger
+    episode_mix_ratio: float = 0.0  # 0 for pool only, 1 for the current episode only
+    noise_stream: int = 0  # stream of the exploration noise, one per truck in a fleet
 
     def __post_init__(self):
         """
@@ -153,6 +162,16 @@ class DPG(Hashable):
         self.torque_table_row_names = (
             self.observation_meta.get_torque_table_row_names()
         )  # part of the action MultiIndex
+        if not 0.0 <= self.episode_mix_ratio <= 1.0:
+            raise ValueError(
+                f"episode_mix_ratio must be in [0, 1], got {self.episode_mix_ratio}"
+            )
+        if self.coll_type == "EPISODE" and self.episode_mix_ratio > 0.0:
+            raise ValueError(
+                f"episode_mix_ratio applies to RECORD agents only, "
+                f"the pool of an EPISODE agent is sampled as whole sequences, got {self.episode_mix_ratio}"
+            )
+        self.observation_block = self.new_observation_block()
         login_pattern = re.compile(RE_DB_KEY)
         recipe_pattern = re.compile(RE_RECIPEKEY)
         # if pool_key is an url or a mongodb name
@@ -225,6 +244,54 @@ class DPG(Hashable):
         """
         pass
 
+    def actor_predict_batch(
+        self,
+        states: np.ndarray,  # flat states of several trucks, [N, observation_numel]
+        streams: Optional[np.ndarray] = None,  # noise streams of the trucks, [N]
+    ) -> np.ndarray:  # actions, [N, torque_flash_numel]
+        """
+        Evaluate the acting actor for the observations of several trucks in a fleet.
+
+        By default the observations are evaluated one by one with `actor_predict`,
+        derived agents with a stateless actor evaluate them in one batch
+        and add the exploration noise of each truck from its own stream.
+        """
+        return np.stack(
+            [np.reshape(self.actor_predict(pd.Series(state)), -1) for state in states]
+        )
+
+    def fleet_copy(
+        self,
+        truck: Truck,  # another truck of the same type
+        driver: Driver,  # driver of the truck
+    ) -> DPG:
+        """
+        Shallow copy of the agent for another truck in a fleet.
+
+        The copy shares the networks, the acting actor and the buffer (thus the pool connection),
+        the episode state (observations, episode number and start time) is its own.
+
+        raise:
+            ValueError, if the truck is of another type or has other dimensions of observation and action
+        """
+        if (
+            type(truck) is not type(self.truck)
+            or truck.observation_length != self.truck.observation_length
+            or truck.observation_numel != self.truck.observation_numel
+            or truck.torque_flash_numel != self.truck.torque_flash_numel
+        ):
+            raise ValueError(
+                f"truck {truck.vid} does not match the fleet agent of {self.truck.vid}"
+            )
+        agent = copy.copy(self)
+        agent._truck = truck
+        agent._driver = driver
+        agent._observations = None
+        agent._observation_block = self.new_observation_block()
+        agent._epi_no = 0
+        agent._episode_start_dt = pd.Timestamp.now(truck.site.tz)
+        return agent
+
     def start_episode(self, ts: pd.Timestamp):
         """initialize observation list"""
         # self.logger.info(f'Episode start at {dt}', extra=self.dict_logger)
@@ -236,6 +303,7 @@ class DPG(Hashable):
         self.observations: list[pd.Series] = (
             []
         )  # create a new empty list for each episode
+        self.observation_block.clear()  # keep the allocated rows
 
     # @abc.abstractmethod
     def deposit(
@@ -277,6 +345,7 @@ class DPG(Hashable):
         self.observations.append(
             observation  # type: ignore
         )  # each observation is a series for the quadruple (s,a,r,s')
+        self.observation_block.append(observation)  # type: ignore
 
     # @abc.abstractmethod
     def end_episode(self):
@@ -298,6 +367,64 @@ class DPG(Hashable):
         )
         self.buffer.store(episode)
 
+    def new_observation_block(self) -> ObservationBlock:
+        """Create an empty observation block with the selectors of the state, action, reward and next state"""
+        idx = pd.IndexSlice
+        return ObservationBlock(
+            selectors={
+                "state": idx["state", ["velocity", "thrust", "brake"]],
+                "action": idx["action", self.torque_table_row_names],
+                "reward": idx["reward", ["work"]],
+                "nstate": idx["nstate", ["velocity", "thrust", "brake"]],
+            }
+        )
+
+    def sample_minibatch_arrays(
+        self,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Sample a minibatch of (s, a, r, s') as float32 arrays with the batch as the first dimension.
+
+        Bootstrap from the current episode if the pool is empty.
+        Otherwise the pool is sampled, and `episode_mix_ratio` of the rows are replaced
+        by the samples from the current episode.
+        """
+        batch_size = self.hyper_param.BatchSize
+        if (
+            self.buffer.pool.cnt == 0
+        ):  # bootstrap for Episode 0 from the current episode
+            self.logger.info(
+                f"no data in pool, bootstrap from observation_list, "
+                f"truck: {self.truck.vid}, driver: {self.driver.pid}.",
+                extra=self.dict_logger,
+            )
+            assert (
+                len(self.observation_block) > 0
+            ), "no data in temporary buffer self.observations!"
+            return self.observation_block.sample(batch_size)  # type: ignore
+
+        # get sampling range, if not enough data, batch is small
+        self.logger.info(
+            f"start sample from pool with size: {batch_size}, "
+            f"truck: {self.truck.vid}, driver: {self.driver.pid}.",
+            extra=self.dict_logger,
+        )
+        pool_batch = [
+            np.asarray(part, dtype=np.float32) for part in self.buffer.sample()
+        ]  # for both mongo and arrow pool
+        n_episode = (
+            min(int(round(self.episode_mix_ratio * batch_size)), batch_size)
+            if len(self.observation_block) > 0
+            else 0
+        )
+        if n_episode == 0:
+            return tuple(pool_batch)  # type: ignore
+        episode_batch = self.observation_block.sample(n_episode)
+        return tuple(  # type: ignore
+            np.concatenate([pool_part[: batch_size - n_episode], episode_part])
+            for pool_part, episode_part in zip(pool_batch, episode_batch)
+        )
+
     @abc.abstractmethod
     def train(self):
         """
@@ -309,6 +436,29 @@ class DPG(Hashable):
         """
         pass
 
+    def train_n(
+        self,
+        n: int,  # number of gradient updates
+    ) -> tuple:
+        """
+        Train the networks n times, each update followed by the soft update of the targets.
+
+        Agents may override it to fuse the updates into one graph call.
+
+        Return:
+
+            tuple: the losses of the last update
+        raise:
+
+            ValueError: if n is not positive
+        """
+        if n < 1:
+            raise ValueError(f"number of updates must be positive, got {n}")
+        for _ in range(n):
+            losses = self.train()
+            self.soft_update_target()
+        return losses
+
     @abc.abstractmethod
     def get_losses(self):
         """
@@ -332,6 +482,30 @@ class DPG(Hashable):
         """
         pass
 
+    def close_ckpt(self):
+        """
+        Finish the checkpoints written in the background, called once the training has stopped.
+
+        By default the checkpoints are written in place, there is nothing to finish.
+        """
+        pass
+
+    def get_actor_weights(self):
+        """
+        Get a snapshot of the moving actor weights, to be published to the acting actor.
+
+        By default the acting actor is the moving actor itself, there is nothing to snapshot.
+        """
+        return None
+
+    def set_acting_weights(self, weights):
+        """
+        Load a snapshot from `get_actor_weights` into the acting actor used by `actor_predict`.
+
+        By default the acting actor is the moving actor itself, there is nothing to load.
+        """
+        pass
+
     @property
     def pool_key(self) -> str:
         return self._pool_key
@@ -422,6 +596,14 @@ class DPG(Hashable):
     def observations(self, value: list[pd.Series]):
         self._observations = value
 
+    @property
+    def observation_block(self) -> Optional[ObservationBlock]:
+        return self._observation_block
+
+    @observation_block.setter
+    def observation_block(self, value: ObservationBlock):
+        self._observation_block = value
+
     @property
     def epi_no(self) -> Optional[int]:
         return self._epi_no
@@ -469,9 +651,12 @@ class DPG(Hashable):
         -observation_meta: metadata of the observation, either from Cloud or from Kvaser
         _torque_table_row_name: list of str, ['r0', 'r1', 'r2', ...]
         _observations: list of pd.Series, the observation quadruple (s, a, r, s')
+        _observation_block: ObservationBlock, numeric columns of the observations of the current episode for sampling
         _epi_no: int, sequence number of the episode
         logger: logging.Logger, logging object
         dict_logger: dict, logging format specs
+        episode_mix_ratio: float, fraction of a minibatch drawn from the current episode when sampling from the pool, RECORD agents only
+        noise_stream: int, index of the exploration noise stream of the truck in a fleet
     """
 
     truck_type: ClassVar[Truck] = trucks_by_id[
@@ -508,9 +693,12 @@ class DPG(Hashable):
     _observations: Optional[list[pd.Series]] = (
         None  # field(default_factory=list[pd.Series])
     )
+    _observation_block: Optional[ObservationBlock] = None
     _epi_no: Optional[int] = None
     logger: Optional[logging.Logger] = None  # logging.Logger("eos.agent.ddpg.ddpg")
     dict_logger: Optional[dict] = None  # dict_logger
+    episode_mix_ratio: float = 0.0  # 0 for pool only, 1 for the current episode only
+    noise_stream: int = 0  # stream of the exploration noise, one per truck in a fleet
 
     def __post_init__(self):
         """
@@ -563,6 +751,16 @@ class DPG(Hashable):
         self.torque_table_row_names = (
             self.observation_meta.get_torque_table_row_names()
         )  # part of the action MultiIndex
+        if not 0.0 <= self.episode_mix_ratio <= 1.0:
+            raise ValueError(
+                f"episode_mix_ratio must be in [0, 1], got {self.episode_mix_ratio}"
+            )
+        if self.coll_type == "EPISODE" and self.episode_mix_ratio > 0.0:
+            raise ValueError(
+                f"episode_mix_ratio applies to RECORD agents only, "
+                f"the pool of an EPISODE agent is sampled as whole sequences, got {self.episode_mix_ratio}"
+            )
+        self.observation_block = self.new_observation_block()
         login_pattern = re.compile(RE_DB_KEY)
         recipe_pattern = re.compile(RE_RECIPEKEY)
         # if pool_key is an url or a mongodb name
@@ -635,6 +833,54 @@ class DPG(Hashable):
         """
         pass
 
+    def actor_predict_batch(
+        self,
+        states: np.ndarray,  # flat states of several trucks, [N, observation_numel]
+        streams: Optional[np.ndarray] = None,  # noise streams of the trucks, [N]
+    ) -> np.ndarray:  # actions, [N, torque_flash_numel]
+        """
+        Evaluate the acting actor for the observations of several trucks in a fleet.
+
+        By default the observations are evaluated one by one with `actor_predict`,
+        derived agents with a stateless actor evaluate them in one batch
+        and add the exploration noise of each truck from its own stream.
+        """
+        return np.stack(
+            [np.reshape(self.actor_predict(pd.Series(state)), -1) for state in states]
+        )
+
+    def fleet_copy(
+        self,
+        truck: Truck,  # another truck of the same type
+        driver: Driver,  # driver of the truck
+    ) -> DPG:
+        """
+        Shallow copy of the agent for another truck in a fleet.
+
+        The copy shares the networks, the acting actor and the buffer (thus the pool connection),
+        the episode state (observations, episode number and start time) is its own.
+
+        raise:
+            ValueError, if the truck is of another type or has other dimensions of observation and action
+        """
+        if (
+            type(truck) is not type(self.truck)
+            or truck.observation_length != self.truck.observation_length
+            or truck.observation_numel != self.truck.observation_numel
+            or truck.torque_flash_numel != self.truck.torque_flash_numel
+        ):
+            raise ValueError(
+                f"truck {truck.vid} does not match the fleet agent of {self.truck.vid}"
+            )
+        agent = copy.copy(self)
+        agent._truck = truck
+        agent._driver = driver
+        agent._observations = None
+        agent._observation_block = self.new_observation_block()
+        agent._epi_no = 0
+        agent._episode_start_dt = pd.Timestamp.now(truck.site.tz)
+        return agent
+
     def start_episode(self, ts: pd.Timestamp):
         """initialize observation list"""
         # self.logger.info(f'Episode start at {dt}', extra=self.dict_logger)
@@ -646,6 +892,7 @@ class DPG(Hashable):
         self.observations: list[pd.Series] = (
             []
         )  # create a new empty list for each episode
+        self.observation_block.clear()  # keep the allocated rows
 
     # @abc.abstractmethod
     def deposit(
@@ -687,6 +934,7 @@ class DPG(Hashable):
         self.observations.append(
             observation  # type: ignore
         )  # each observation is a series for the quadruple (s,a,r,s')
+        self.observation_block.append(observation)  # type: ignore
 
     # @abc.abstractmethod
     def end_episode(self):
@@ -708,6 +956,64 @@ class DPG(Hashable):
         )
         self.buffer.store(episode)
 
+    def new_observation_block(self) -> ObservationBlock:
+        """Create an empty observation block with the selectors of the state, action, reward and next state"""
+        idx = pd.IndexSlice
+        return ObservationBlock(
+            selectors={
+                "state": idx["state", ["velocity", "thrust", "brake"]],
+                "action": idx["action", self.torque_table_row_names],
+                "reward": idx["reward", ["work"]],
+                "nstate": idx["nstate", ["velocity", "thrust", "brake"]],
+            }
+        )
+
+    def sample_minibatch_arrays(
+        self,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Sample a minibatch of (s, a, r, s') as float32 arrays with the batch as the first dimension.
+
+        Bootstrap from the current episode if the pool is empty.
+        Otherwise the pool is sampled, and `episode_mix_ratio` of the rows are replaced
+        by the samples from the current episode.
+        """
+        batch_size = self.hyper_param.BatchSize
+        if (
+            self.buffer.pool.cnt == 0
+        ):  # bootstrap for Episode 0 from the current episode
+            self.logger.info(
+                f"no data in pool, bootstrap from observation_list, "
+                f"truck: {self.truck.vid}, driver: {self.driver.pid}.",
+                extra=self.dict_logger,
+            )
+            assert (
+                len(self.observation_block) > 0
+            ), "no data in temporary buffer self.observations!"
+            return self.observation_block.sample(batch_size)  # type: ignore
+
+        # get sampling range, if not enough data, batch is small
+        self.logger.info(
+            f"start sample from pool with size: {batch_size}, "
+            f"truck: {self.truck.vid}, driver: {self.driver.pid}.",
+            extra=self.dict_logger,
+        )
+        pool_batch = [
+            np.asarray(part, dtype=np.float32) for part in self.buffer.sample()
+        ]  # for both mongo and arrow pool
+        n_episode = (
+            min(int(round(self.episode_mix_ratio * batch_size)), batch_size)
+            if len(self.observation_block) > 0
+            else 0
+        )
+        if n_episode == 0:
+            return tuple(pool_batch)  # type: ignore
+        episode_batch = self.observation_block.sample(n_episode)
+        return tuple(  # type: ignore
+            np.concatenate([pool_part[: batch_size - n_episode], episode_part])
+            for pool_part, episode_part in zip(pool_batch, episode_batch)
+        )
+
     @abc.abstractmethod
     def train(self):
         """
@@ -719,6 +1025,29 @@ class DPG(Hashable):
         """
         pass
 
+    def train_n(
+        self,
+        n: int,  # number of gradient updates
+    ) -> tuple:
+        """
+        Train the networks n times, each update followed by the soft update of the targets.
+
+        Agents may override it to fuse the updates into one graph call.
+
+        Return:
+
+            tuple: the losses of the last update
+        raise:
+
+            ValueError: if n is not positive
+        """
+        if n < 1:
+            raise ValueError(f"number of updates must be positive, got {n}")
+        for _ in range(n):
+            losses = self.train()
+            self.soft_update_target()
+        return losses
+
     @abc.abstractmethod
     def get_losses(self):
         """
@@ -742,6 +1071,30 @@ class DPG(Hashable):
         """
         pass
 
+    def close_ckpt(self):
+        """
+        Finish the checkpoints written in the background, called once the training has stopped.
+
+        By default the checkpoints are written in place, there is nothing to finish.
+        """
+        pass
+
+    def get_actor_weights(self):
+        """
+        Get a snapshot of the moving actor weights, to be published to the acting actor.
+
+        By default the acting actor is the moving actor itself, there is nothing to snapshot.
+        """
+        return None
+
+    def set_acting_weights(self, weights):
+        """
+        Load a snapshot from `get_actor_weights` into the acting actor used by `actor_predict`.
+
+        By default the acting actor is the moving actor itself, there is nothing to load.
+        """
+        pass
+
     @property
     def pool_key(self) -> str:
         return self._pool_key
@@ -832,6 +1185,14 @@ class DPG(Hashable):
     def observations(self, value: list[pd.Series]):
         self._observations = value
 
+    @property
+    def observation_block(self) -> Optional[ObservationBlock]:
+        return self._observation_block
+
+    @observation_block.setter
+    def observation_block(self, value: ObservationBlock):
+        self._observation_block = value
+
     @property
     def epi_no(self) -> Optional[int]:
         return self._epi_no
@@ -1,20 +1,17 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/07.agent.idql.ipynb.
 
 # %% auto 0
-__all__ = ['DatasetDict', 'IDQL']
+__all__ = ['DatasetDict', 'update_learner', 'eval_learner_loss', 'sample_implicit_policy', 'flatten_valid_steps', 'IDQL']
 
 # %% ../../nbs/07.agent.idql.ipynb 3
 import logging
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Tuple
 import numpy as np
 import pandas as pd
-import tensorflow as tf
-from typeguard import check_type
 import jax
-import jax.numpy as jnp
 
 # %% ../../nbs/07.agent.idql.ipynb 4
 from tspace.agent.utils.hyperparams import (
@@ -22,6 +19,7 @@ from tspace.agent.utils.hyperparams import (
     HyperParamRDPG,
     HyperParamIDQL,
 )
+from ..storage.buffer.buffer import tbptt_bucket_edges
 from ..storage.buffer.dask import DaskBuffer
 from ..storage.buffer.mongo import MongoBuffer  # type: ignore
 from ..data.core import PoolQuery  # type: ignore
@@ -31,6 +29,7 @@ from ..data.time import veos_lifetime_end_date, veos_lifetime_start_date
 
 # %% ../../nbs/07.agent.idql.ipynb 5
 from .dpg import DPG  # type: ignore
+from .utils.checkpoint import AsyncWriter, write_atomic
 
 # %% ../../nbs/07.agent.idql.ipynb 6
 from ..config.vehicles import Truck, TruckInCloud, trucks_by_id
@@ -52,12 +51,62 @@ from tspace.data.core import (
 from jaxrl5.agents import DDPMIQLLearner
 from jaxrl5.types import DataType
 from flax.core import FrozenDict
+import flax.serialization
 import gymnasium as gym
 
 # %% ../../nbs/07.agent.idql.ipynb 8
 DatasetDict = dict[str, DataType]
 
 # %% ../../nbs/07.agent.idql.ipynb 9
+@jax.jit
+def update_learner(
+    agent: DDPMIQLLearner,  # the learner, a pytree of networks, optimizer states and rng
+    batch: FrozenDict,  # device resident batch of the learner
+) -> Tuple[DDPMIQLLearner, dict]:  # updated learner and the loss info
+    """Jit-compiled update of the IDQL learner, retraced only for new batch shapes"""
+    return agent.update(batch)
+
+
+@jax.jit
+def eval_learner_loss(
+    agent: DDPMIQLLearner,  # the learner
+    batch: FrozenDict,  # device resident batch of the learner
+) -> Tuple[DDPMIQLLearner, dict]:  # learner and the loss info
+    """Jit-compiled loss evaluation of the IDQL learner"""
+    return agent.eval_loss(batch)
+
+
+@jax.jit
+def sample_implicit_policy(
+    agent: DDPMIQLLearner,  # the learner
+    observations: jax.Array,  # flat observations, [N, observation_numel]
+    key: jax.Array,  # PRNG key for the diffusion sampler
+) -> jax.Array:  # sampled actions
+    """Jit-compiled sampling of the implicit policy with the noise drawn from key"""
+    return agent.replace(rng=key).sample_implicit_policy(observations)
+
+
+def flatten_valid_steps(
+    arrays: tuple[np.ndarray, ...],  # episode arrays [B, T, F], states first
+    padding_value: float,  # value the buffer pads the shorter episodes with
+    n_steps: int,  # number of steps in the flat batch
+    rng: np.random.Generator,  # generator to draw the steps with
+) -> tuple[np.ndarray, ...]:  # flat arrays [n_steps, F]
+    """
+    Draw a fixed number of valid steps from a padded episode batch.
+
+    A step is valid if its state is not all padding. The valid steps are drawn without replacement
+    if there are enough of them, otherwise with replacement, so the learner never sees padding
+    and the jit-compiled update always gets the same batch shape.
+    """
+    valid = np.any(arrays[0] != padding_value, axis=-1)  # [B, T]
+    n_valid = int(valid.sum())
+    if n_valid == 0:
+        raise ValueError("episode batch has no valid steps")
+    idx = rng.choice(n_valid, size=n_steps, replace=n_valid < n_steps)
+    return tuple(x[valid][idx] for x in arrays)
+
+# %% ../../nbs/07.agent.idql.ipynb 10
 @dataclass
 class IDQL(DPG):
     """IDQL agent for VEOS.
@@ -75,6 +124,10 @@ class IDQL(DPG):
                 The immplicit policy is re-weighting the sample from the behavior actor network with the importance weights
                 recommending the expectile loss by the paper
             _ckpt_idql_dir: checkpoint directory for critic
+            ckpt_writer: background writer of the learner checkpoints, shared by the fleet copies
+            ckpt_step: number of save_ckpt calls, a checkpoint is written every CkptInterval calls
+            policy_key: PRNG key stream of the implicit policy sampler, split for every inference
+            length_buckets: sequence length edges for bucketed episode sampling, None for whole tbptt_k1 chunks, () to disable
 
     """
 
@@ -82,6 +135,13 @@ class IDQL(DPG):
     idql_net: Optional[DDPMIQLLearner] = None  # actor_net_default
     action_space: Optional[gym.spaces.Space] = None  # action_space_default
     observation_space: Optional[gym.spaces.Space] = None  # action_space_default
+    policy_key: Optional[jax.Array] = None  # policy sampler key stream
+    ckpt_writer: Optional[AsyncWriter] = None
+    ckpt_step: int = 0
+    length_buckets: Optional[tuple[int, ...]] = None  # episode length bucket edges
+    _step_rng: np.random.Generator = field(
+        default_factory=np.random.default_rng, init=False, repr=False
+    )  # draws the valid steps of episode batches
     _ckpt_idql_dir: Optional[Path] = None  # Path("")
 
     def __post_init__(
@@ -128,6 +188,13 @@ class IDQL(DPG):
             seq_len_to=self.hyper_param.tbptt_k1 + 100,  # to 300
         )
         self.buffer.pool.query = self.buffer.query
+        self.buffer.bucket_edges = (
+            self.length_buckets
+            if self.length_buckets is not None
+            else tbptt_bucket_edges(
+                self.hyper_param.tbptt_k1, self.buffer.query.seq_len_to
+            )
+        )
 
         # actor network (w/ target network)
         self.init_checkpoint()
@@ -144,6 +211,15 @@ class IDQL(DPG):
             observation_space=self.observation_space,
             action_space=self.action_space,
         )
+        self.policy_key = jax.random.PRNGKey(42)
+        self.ckpt_writer = AsyncWriter(logger=self.logger, dict_logger=self.dict_logger)
+        if self.ckpt_path.exists():  # restore the learner from the last good checkpoint
+            self.idql_net = flax.serialization.from_bytes(
+                self.idql_net, self.ckpt_path.read_bytes()
+            )
+            self.logger.info(
+                f"Restored IDQL learner from {self.ckpt_path}", extra=self.dict_logger
+            )
 
         self.touch_gpu()
 
@@ -170,12 +246,10 @@ class IDQL(DPG):
 
         _ = self.actor_predict(init_states)
         self.logger.info(
-            f"manual load tf library by calling convert_to_tensor",
+            f"compiled the implicit policy sampler",
             extra=self.dict_logger,
         )
 
-        self.actor_net.ou_noise.reset()
-
         # warm up the gpu training graph execution pipeline
         if self.buffer.pool.cnt != 0:
             if not self.infer_mode:
@@ -207,19 +281,24 @@ class IDQL(DPG):
         )
 
         try:
-            os.makedirs(self._ckpt_actor_dir)
+            os.makedirs(self._ckpt_idql_dir)
             self.logger.info(
-                "created checkpoint directory for actor: %s",
-                self._ckpt_actor_dir,
+                "created checkpoint directory for idql: %s",
+                self._ckpt_idql_dir,
                 extra=self.dict_logger,
             )
         except FileExistsError:
             self.logger.info(
-                "actor checkpoint directory already exists: %s",
-                self._ckpt_actor_dir,
+                "idql checkpoint directory already exists: %s",
+                self._ckpt_idql_dir,
                 extra=self.dict_logger,
             )
 
+    @property
+    def ckpt_path(self) -> Path:
+        """file of the learner checkpoint"""
+        return self._ckpt_idql_dir.joinpath("idql.msgpack")
+
     # TODO for infer only mode, implement a method without noisy exploration.
     def actor_predict(
         self, state: pd.Series  # state sequence of the current episode
@@ -232,124 +311,69 @@ class IDQL(DPG):
         Action outputs and noise object are all row vectors of length 21*17 (r*c), output numpy array
         """
 
-        # We make sure action is within bounds
-        # legal_action = np.clip(sampled_actions, action_lower, action_upper)
-        # get flat interleaved (not column-wise stacked) tensor from dataframe
-
-        state_flat = None
-        try:
-            state_flat = jnp.array(state.to_numpy())
-        except Exception as e:
-            print(f"Exception: {e}")
-
-        states = jnp.expand_dims(
-            check_type(state_flat, jnp.ndarray), 0
-        )  # motion states is 30*3 matrix
+        # get flat interleaved (not column-wise stacked) array from the series, motion states is 30*3 matrix
+        states = jax.device_put(state.to_numpy(dtype=np.float32)[np.newaxis])
 
         # sample implicit policy (not the behavior poicly), batch dimension in result is squeezed
-        sampled_actions = self.idql_net.sample_implicit_policy(states)
+        sampled_actions = sample_implicit_policy(
+            self.idql_net, states, self.next_policy_key()
+        )
 
         self.logger.info(f"Inference IDQL done!", extra=self.dict_logger)
-        # return np.squeeze(sampled_actions)  # ? might be unnecessary
-        return sampled_actions
-
-    def sample_minibatch(self):
-        """Convert batch type from DataFrames to flattened tensors."""
-        if (
-            self.buffer.pool.cnt == 0
-        ):  # bootstrap for Episode 0 from the current self.observations list
-            self.logger.info(
-                f"no data in pool, bootstrap from observation_list, "
-                f"truck: {self.truck.vid}, driver: {self.driver.pid}.",
-                extra=self.dict_logger,
-            )
-            assert (
-                len(self.observations) > 0
-            ), "no data in temporary buffer self.observations!"
+        return np.asarray(sampled_actions)
 
-            # sample from self.observations
+    def actor_predict_batch(
+        self,
+        states: np.ndarray,  # flat states of several trucks, [N, observation_numel]
+        streams: Optional[np.ndarray] = None,  # unused, see policy_key
+    ) -> np.ndarray:  # actions, [N, torque_flash_numel]
+        """Sample the implicit policy for the observations of several trucks in one batch"""
+        sampled_actions = sample_implicit_policy(
+            self.idql_net,
+            jax.device_put(np.asarray(states, dtype=np.float32)),
+            self.next_policy_key(),
+        )
+        return np.asarray(sampled_actions).reshape(len(states), -1)
 
-            batch_idx = np.random.choice(
-                len(self.observations), self.hyper_param.BatchSize  # 4
-            )
-            observation_samples = [
-                self.observations[i] for i in batch_idx
-            ]  # a sampled list of Series
-
-            idx = pd.IndexSlice
-            state = []
-            action = []
-            reward = []
-            nstate = []
-            for (
-                observation
-            ) in (
-                observation_samples
-            ):  # each observation is a Series, contiguous storage in rows (already flattened!)
-                state.append(
-                    observation.loc[
-                        idx["state", ["velocity", "thrust", "brake"]]
-                    ].values
-                )
-                action.append(
-                    observation.loc[idx["action", self.torque_table_row_names]].values
-                )
-                reward.append(observation.loc[idx["reward", ["work"]]].values)
-                nstate.append(
-                    observation.loc[
-                        idx["nstate", ["velocity", "thrust", "brake"]]
-                    ].values
-                )
+    def next_policy_key(self) -> jax.Array:
+        """Split a fresh key for the implicit policy sampler off the key stream"""
+        self.policy_key, key = jax.random.split(self.policy_key)
+        return key
 
-            # convert to tensors by stacking so that the first dimension is batch_size
-            states = tf.convert_to_tensor(np.stack(state), dtype=tf.float32)
-            actions = tf.convert_to_tensor(np.stack(action), dtype=tf.float32)
-            rewards = tf.convert_to_tensor(np.stack(reward), dtype=tf.float32)
-            next_states = tf.convert_to_tensor(np.stack(nstate), dtype=tf.float32)
+    def sample_minibatch(self) -> FrozenDict:
+        """
+        Sample a minibatch and place it on the device as the batch dict of the learner.
 
-        else:  # otherwise sample from pool, ignoring the current ongoing episode to reduce complexity
-            # TODO combine current episode with pool, need evenly sampling pool and list of observations, then combine
-            # get sampling range, if not enough data, batch is small
-            self.logger.info(
-                f"start sample from pool with size: {self.hyper_param.BatchSize}, "
-                f"truck: {self.truck.vid}, driver: {self.driver.pid}.",
-                extra=self.dict_logger,
+        The learner updates on single transitions, so an episode batch [B, T, F] is flattened
+        to BatchSize * tbptt_k1 valid steps, see `flatten_valid_steps`. The episodes are
+        truncated rather than terminated, hence the masks are all ones.
+        """
+        states, actions, rewards, nstates = self.sample_minibatch_arrays()
+        if states.ndim == 3:  # episode batch [B, T, F]
+            states, actions, rewards, nstates = flatten_valid_steps(
+                (states, actions, rewards, nstates),
+                self.hyper_param.PaddingValue,
+                self.hyper_param.BatchSize * self.hyper_param.tbptt_k1,
+                self._step_rng,
             )
-
-            (
-                states,
-                actions,
-                rewards,
-                nstates,
-            ) = self.buffer.sample()  # for both mongo and arrow pool
-
-            states = tf.convert_to_tensor(states, dtype=tf.float32)
-            actions = tf.convert_to_tensor(actions, dtype=tf.float32)
-            rewards = tf.convert_to_tensor(rewards, dtype=tf.float32)
-            next_states = tf.convert_to_tensor(nstates, dtype=tf.float32)
-
-        return states, actions, rewards, next_states
+        rewards = rewards.reshape(len(rewards))
+
+        return jax.device_put(
+            FrozenDict(
+                {
+                    "actions": actions,
+                    "rewards": rewards,
+                    "masks": np.ones_like(rewards),
+                    "observations": states,
+                    "next_observations": nstates,
+                }
+            )
+        )
 
     def train(self):
         """Train the networks on the batch sampled from the pool."""
-        (
-            states,
-            actions,
-            rewards,
-            next_states,
-        ) = self.sample_minibatch()
-
-        batch = FrozenDict(
-            {
-                "actions": actions,
-                "rewards": rewards,
-                "observations": states,
-                "next_observations": next_states,
-            }
-        )
-
-        agent, info = self.agent.update(batch)
-        self.agent = agent
+        batch = self.sample_minibatch()
+        self.idql_net, info = update_learner(self.idql_net, batch)
         critic_loss = info["critic_loss"]
         actor_loss = info["actor_loss"]
         _ = info["value_loss"]
@@ -363,29 +387,34 @@ class IDQL(DPG):
     # we only calculate the loss
 
     def save_ckpt(self):
-        """TODO Save the checkpoint of the actor, critic and value network in Flax."""
-        pass
+        """
+        Save the checkpoint of the actor, critic and value network in Flax.
+
+        The learner is copied to host memory here, the writer thread serializes the copy
+        and replaces the checkpoint file atomically, so a crash keeps the last good checkpoint.
+        """
+        self.ckpt_step += 1
+        if self.ckpt_step % self.hyper_param.CkptInterval != 0:
+            return
+        snapshot = jax.device_get(self.idql_net)
+        ckpt_path = self.ckpt_path
+        self.ckpt_writer.submit(
+            lambda: write_atomic(ckpt_path, flax.serialization.to_bytes(snapshot))
+        )
+        self.logger.info(
+            f"Saving checkpoint for step {self.ckpt_step}: {ckpt_path}",
+            extra=self.dict_logger,
+        )
+
+    def close_ckpt(self):
+        """Join the checkpoint writer, shared by the fleet copies, once the training has stopped"""
+        self.ckpt_writer.close()
 
     # We only compute the loss and don't update parameters
     def get_losses(self):
         """Get the losses of the networks on the batch sampled from the pool."""
-        (
-            states,
-            actions,
-            rewards,
-            next_states,
-        ) = self.sample_minibatch()
-
-        batch = FrozenDict(
-            {
-                "actions": actions,
-                "rewards": rewards,
-                "observations": states,
-                "next_observations": next_states,
-            }
-        )
-
-        agent, info = self.agent.eval_loss(batch)
+        batch = self.sample_minibatch()
+        _, info = eval_learner_loss(self.idql_net, batch)
 
         critic_loss = 0.0
         actor_loss = info["actor_loss"]
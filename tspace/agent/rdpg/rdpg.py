@@ -20,6 +20,7 @@ from tspace.agent.utils.hyperparams import (
     HyperParamDDPG,
     HyperParamIDQL,
 )
+from ...storage.buffer.buffer import tbptt_bucket_edges
 from ...storage.buffer.dask import DaskBuffer
 from ...storage.buffer.mongo import MongoBuffer  # type: ignore
 from ...data.core import PoolQuery  # type: ignore
@@ -51,6 +52,13 @@ class RDPG(DPG):
         actor_net: actor network
         critic_net: critic network
         target_actor_net: target actor network
+        acting_actor_net: acting copy of the actor network for inference
+        acting_cell_state: lstm hidden and cell states of the acting actor, carried across the steps of an episode
+        last_action: last action cached by deposit for the next inference
+        jit_compile: whether to compile the train step with XLA
+        length_buckets: sequence length edges for bucketed episode sampling, None for whole tbptt_k1 chunks, () to disable
+        train_step_traces: number of times the train step has been traced, stays constant after the first call
+            (which traces twice while the optimizers create their slot variables)
         target_critic_net: target critic network
         _ckpt_actor_dir: checkpoint directory for actor
         _ckpt_critic_dir: checkpoint directory for critic
@@ -61,6 +69,11 @@ class RDPG(DPG):
     critic_net: Optional[SeqCritic] = None  # critic_net_default
     target_actor_net: Optional[SeqActor] = None  # actor_net_default
     target_critic_net: Optional[SeqCritic] = None  # critic_net_default
+    acting_actor_net: Optional[SeqActor] = None  # actor_net_default
+    acting_cell_state: Optional[tf.Tensor] = None  # [n_layers, 2, 1, hidden_dim]
+    last_action: Optional[np.ndarray] = None  # [1, torque_flash_numel]
+    jit_compile: bool = True  # compile the train step with XLA
+    length_buckets: Optional[tuple[int, ...]] = None  # episode length bucket edges
     _ckpt_actor_dir: Optional[Path] = None  # Path("")
     _ckpt_critic_dir: Optional[Path] = None  # Path("")
 
@@ -107,6 +120,13 @@ class RDPG(DPG):
             seq_len_to=self.hyper_param.tbptt_k1 + 100,  # to 300
         )
         self.buffer.pool.query = self.buffer.query
+        self.buffer.bucket_edges = (
+            self.length_buckets
+            if self.length_buckets is not None
+            else tbptt_bucket_edges(
+                self.hyper_param.tbptt_k1, self.buffer.query.seq_len_to
+            )
+        )
 
         # actor network (w/ target network)
         self.init_checkpoint()
@@ -143,6 +163,24 @@ class RDPG(DPG):
         # clone necessary for the first time training
         self.target_actor_net.clone_weights(self.actor_net)
 
+        # acting copy for inference, so that training never mutates the actor in use
+        self.acting_actor_net = SeqActor(
+            self.truck.observation_numel,
+            self.truck.torque_flash_numel,
+            self.hyper_param.HiddenDimension,  # 256
+            self.hyper_param.NLayerActor,  # 2
+            self.hyper_param.BatchSize,  # 4
+            self.hyper_param.PaddingValue,  # -10000
+            self.hyper_param.TauActor,  # 0.005
+            self.hyper_param.ActorLR,  # 0.001
+            self._ckpt_actor_dir,
+            self.hyper_param.CkptInterval,  # 5
+            self.logger,
+            self.dict_logger,
+        )
+        self.acting_actor_net.clone_weights(self.actor_net)
+        self.reset_acting_state()
+
         # critic network (w/ target network)
 
         self.critic_net = SeqCritic(
@@ -176,6 +214,26 @@ class RDPG(DPG):
         )
         # clone necessary for the first time training
         self.target_critic_net.clone_weights(self.critic_net)
+
+        # every tbptt chunk is padded to the same static shape, so the train step compiles once
+        self.train_step_traces = 0
+        self.train_step_graph = tf.function(
+            self.train_step,
+            input_signature=[
+                tf.TensorSpec(
+                    shape=[self.hyper_param.BatchSize, self.hyper_param.tbptt_k1, dim],
+                    dtype=tf.float32,
+                )
+                for dim in (
+                    self.truck.observation_numel,  # states
+                    self.truck.torque_flash_numel,  # actions
+                    1,  # rewards
+                    self.truck.observation_numel,  # next states
+                    1,  # mask
+                )
+            ],
+            jit_compile=self.jit_compile,
+        )
         self.touch_gpu()
 
     def __repr__(self):
@@ -200,6 +258,7 @@ class RDPG(DPG):
         # init_states = tf.expand_dims(input_array, 0)  # motion states is 30*2 matrix
 
         _ = self.actor_predict(init_states)
+        self.reset_acting_state()
         self.logger.info(
             f"manual load tf library by calling convert_to_tensor",
             extra=self.dict_logger,
@@ -283,102 +342,78 @@ class RDPG(DPG):
     ) -> np.ndarray:  # action sequence of the current episode
         """get the action given a single observations by inference
 
-        batch size cannot be 1.
-        For LSTM to be stateful, batch size must match the training scheme.
+        The acting actor runs a single sample through its LSTM cells,
+        carrying the hidden and cell states across the steps of the episode,
+        so the inference cost does not depend on the training batch size.
+        The last action is cached by `deposit`, zeros at the first step of the episode.
         """
 
-        # get the current episode so far from self.observations stored by DPG.deposit()
-        # self.state_t = np.ones((1, t + 1, self._num_states))
-        # self.state_t[0, 0, :] = obs
-        # expand the batch dimension and turn obs_t into a numpy array
-
-        # expand states to 3D tensor [4, 1, 600] for cloud / [4, 1, 90] for kvaser
+        # [1, 600] for cloud / [1, 90] for kvaser
         states = tf.convert_to_tensor(
-            np.expand_dims(
-                np.outer(
-                    np.ones((self.hyper_param.BatchSize, 1)),  # type: ignore
-                    state.values,  # type: ignore
-                ),
-                axis=1,
-            ),
+            np.expand_dims(state.values, axis=0),  # type: ignore
             dtype=tf.float32,
         )
-
-        # expand actions to 3D tensor [4, 1, 68] for cloud / [4, 1, 68] for kvaser
-        idx = pd.IndexSlice
-        try:
-            last_actions = tf.convert_to_tensor(
-                np.expand_dims(
-                    np.outer(
-                        np.ones(self.hyper_param.BatchSize),
-                        self.observations[-1]  # last observation contains last action!
-                        .sort_index()
-                        .loc[idx["action", self.torque_table_row_names, :]]
-                        .values.astype(np.float32),  # type convert to float32
-                    ),
-                    axis=1,  # observation (with subpart action is Multi-Indexed Series, its values are flatted
-                ),  # get last_actions from last observation,
-                dtype=tf.float32,  # and add batch and time dimension twice at axis 0
-            )  # so that last_actions is a 3D tensor
-        except (
-            IndexError,
-            TypeError,
-        ):  # if no last action in case of the first step of the episode, then use zeros
-            last_actions = tf.zeros(
-                shape=(
-                    self.hyper_param.BatchSize,
-                    1,
-                    self.truck.torque_flash_numel,
-                ),  # [1, 1, 4*17]
-                dtype=tf.float32,
-            )  # first zero last_actions is a 3D tensor
-        # self.logger.info(
-        #     f"states.shape: {states.shape}; last_actions.shape: {last_actions.shape}",
-        #     extra=self.dict_logger,
-        # )
-        # action = self.actor_net.predict(input_array)
-        actions = self.actor_predict_step(
-            states, last_actions
-        )  # both states and last_actions are 3d tensors [B,T,D]
-        action = actions.numpy()[
-            0, :
-        ]  # [1, 68] for cloud / [1, 68] for kvaser, squeeze the batch dimension
-        # self.logger.info(f"action.shape: {action.shape}", extra=self.dict_logger)
+        action, self.acting_cell_state = self.actor_predict_step(
+            states, self.last_action, self.acting_cell_state
+        )
+        action = (
+            action.numpy()[0, :] + self.acting_actor_net.ou_noise()
+        )  # [68] for cloud / [68] for kvaser, squeeze the batch dimension, noise is a row vector
         assert (
             type(action) == np.ndarray
         ), f"action type {type(action)} is not np.ndarray"
         return action
 
-    @tf.function(
-        input_signature=[
-            tf.TensorSpec(
-                shape=[None, None, DPG.truck_type.observation_numel],
-                dtype=tf.float32,
-            ),  # [None, None, 600] for cloud / [None, None, 90] for kvaser
-            tf.TensorSpec(
-                shape=[None, None, DPG.truck_type.torque_flash_numel], dtype=tf.float32
-            ),  # [None, None, 68] for both cloud and kvaser
-        ]
-    )
     def actor_predict_step(
         self,
-        states: tf.Tensor,  # state, dimension: [B,T,D]
-        last_actions: tf.Tensor,  # last action, dimension [B,T,D]
-    ) -> tf.Tensor:
+        state: tf.Tensor,  # state, dimension: [1,D]
+        last_action: np.ndarray,  # last action, dimension [1,D]
+        cell_state: tf.Tensor,  # lstm state of the acting actor, dimension [L,2,1,H]
+    ) -> Tuple[tf.Tensor, tf.Tensor]:
         """
-        evaluate the actors given a single observations.
+        evaluate the acting actor given a single observation.
 
         batch size is 1.
+        Return:
+            tuple: (action without noise, updated lstm state)
         """
-        # logger.info(f"tracing", extra=self.dict_logger)
-        print("tracing!")
-        action = self.actor_net.predict(
-            states, last_actions
-        )  # already un-squeezed inside Actor function
+        action, cell_state = self.acting_actor_net.predict_cell(
+            state, tf.convert_to_tensor(last_action, dtype=tf.float32), cell_state
+        )
         assert isinstance(
             action, tf.Tensor
         ), f"action type {type(action)} is not tf.Tensor"
-        return action
+        return action, cell_state
+
+    def reset_acting_state(self):
+        """reset the lstm state of the acting actor and the cached last action for a new episode"""
+        self.acting_cell_state = self.acting_actor_net.initial_cell_state()
+        self.last_action = np.zeros(
+            (1, self.truck.torque_flash_numel), dtype=np.float32
+        )  # first zero last action, [1, 4*17]
+
+    def start_episode(self, ts: pd.Timestamp):
+        """initialize observation list and the acting state"""
+        super().start_episode(ts)
+        self.reset_acting_state()
+
+    def deposit(
+        self,
+        timestamp: pd.Timestamp,  #   timestamp of the quadruple
+        state: pd.Series,  # state, pd.Series [brake row -> thrust row  -> timestep row -> velocity row ]
+        action: pd.Series,  # action, pd.Series [r0, r1, r2, ... rows -> speed row -> throttle row-> (flash) timestep row ]
+        reward: pd.Series,  # reward, pd.Series [timestep row -> work row]
+        nstate: pd.Series,  # next state, like state
+    ):
+        """Deposit the experience quadruple and cache the action as the last action for the next inference."""
+        super().deposit(timestamp, state, action, reward, nstate)
+        idx = pd.IndexSlice
+        self.last_action = np.expand_dims(
+            action.sort_index()
+            .loc[idx[self.torque_table_row_names, :]]
+            .values.astype(np.float32),  # type convert to float32
+            axis=0,
+        )  # the torque rows of the action, flattened in the same order as in the observation
 
     def train(self) -> Tuple[float, float]:
         """
@@ -423,91 +458,92 @@ class RDPG(DPG):
         # # while trainings extend only to the end of each sub-batch by default of train_step
         # # out of tf.GradientTape() context, the tensors are detached like .detach() in pytorch
 
-        # if s_n_t.shape[1] > check_type(self.hyper_param, HyperParamRDPG).tbptt_k1:
-        ind_split = (
-            np.arange(
-                s_n_t.shape[1] // check_type(self.hyper_param, HyperParamRDPG).tbptt_k1
-            )
-            + 1
-        ) * check_type(
-            self.hyper_param, HyperParamRDPG
-        ).tbptt_k1  # split index is np.arange(l//s)[1:]*s
-        # else: for l==s, split in original array and np.array([])
-        # for l<s    ind_split = np.array([])  # no split for l <= split size
+        tbptt_k1 = check_type(self.hyper_param, HyperParamRDPG).tbptt_k1
+        s_n_t, a_n_t, r_n_t, ns_n_t, m_n_t = self.pad_to_chunks(
+            s_n_t, a_n_t, r_n_t, ns_n_t
+        )  # time axis padded to a multiple of tbptt_k1, with the mask of the valid steps
+        split_num = s_n_t.shape[1] // tbptt_k1
 
         self.logger.info(
-            f"{{'header': 'Batch splitting', " f"'split_num': '{ind_split}'}}",
+            f"{{'header': 'Batch splitting', " f"'split_num': '{split_num}'}}",
             extra=self.dict_logger,
         )
 
-        for i, batch_t in enumerate(  # split on the time axis (axis=1)
-            zip(
-                np.array_split(s_n_t, ind_split, axis=1),
-                np.array_split(a_n_t, ind_split, axis=1),
-                np.array_split(r_n_t, ind_split, axis=1),
-                np.array_split(ns_n_t, ind_split, axis=1),
-            )
-        ):  # all actor critic have stateful LSTMs so that the LSTM states are kept between sub-batches,
+        for i in range(split_num):  # split on the time axis (axis=1)
+            # all actor critic have stateful LSTMs so that the LSTM states are kept between sub-batches,
             # while trainings extend only to the end of each sub-batch by default of train_step
             # out of tf.GradientTape() context, the tensors are detached like .detach() in pytorch
-            s_n_t_sub, a_n_t_sub, r_n_t_sub, ns_n_t_sub = batch_t
-            if s_n_t_sub is np.array([]):
-                self.logger.warning(
-                    f"batch sub sequence s_n_t: {i} is empty!", extra=self.dict_logger
-                )
-                continue
-            else:
-                self.logger.info(
-                    f"batch sub sequences s_n_t: {i} is valid. ", extra=self.dict_logger
-                )
-
-            actor_loss, critic_loss = self.train_step(
-                s_n_t_sub, a_n_t_sub, r_n_t_sub, ns_n_t_sub
-            )
+            chunk = slice(i * tbptt_k1, (i + 1) * tbptt_k1)
+            actor_loss, critic_loss = self.train_step_graph(
+                s_n_t[:, chunk],
+                a_n_t[:, chunk],
+                r_n_t[:, chunk],
+                ns_n_t[:, chunk],
+                m_n_t[:, chunk],
+            )  # every chunk has the same static shape, compiled once
             self.logger.info(
                 f"batch actor loss: {actor_loss.numpy()}; batch critic loss: {critic_loss.numpy()}",
                 extra=self.dict_logger,
             )
+        self.logger.info(
+            f"{{'header': 'train_step traces', "
+            f"'traces': {self.train_step_traces}}}",
+            extra=self.dict_logger,
+        )
 
         # return the last actor and critic loss
         # return actor_loss.numpy()[0], critic_loss.numpy()[0]
         return actor_loss.numpy(), critic_loss.numpy()
 
-    @tf.function(
-        input_signature=[
-            tf.TensorSpec(
-                shape=[
-                    DPG.rdpg_hyper_type.BatchSize,
-                    None,
-                    DPG.truck_type.observation_numel,
-                ],
-                dtype=tf.float32,
-            ),
-            tf.TensorSpec(
-                shape=[
-                    DPG.rdpg_hyper_type.BatchSize,
-                    None,
-                    DPG.truck_type.torque_flash_numel,
-                ],
-                dtype=tf.float32,
-            ),
-            tf.TensorSpec(
-                shape=[DPG.rdpg_hyper_type.BatchSize, None, 1], dtype=tf.float32
-            ),
-            tf.TensorSpec(
-                shape=[
-                    DPG.rdpg_hyper_type.BatchSize,
-                    None,
-                    DPG.truck_type.observation_numel,
-                ],
-                dtype=tf.float32,
-            ),
+    def pad_to_chunks(
+        self,
+        s_n_t: np.ndarray,  # states, [B, T, D]
+        a_n_t: np.ndarray,  # actions, [B, T, D]
+        r_n_t: np.ndarray,  # rewards, [B, T, 1]
+        ns_n_t: np.ndarray,  # next states, [B, T, D]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Pad the time axis with the padding value to a multiple of tbptt_k1.
+
+        The steps whose states are all padding, either padded by the buffer for shorter episodes or here,
+        are masked out of the losses.
+
+        Return:
+            tuple: padded (s_n_t, a_n_t, r_n_t, ns_n_t) and the mask [B, T, 1] of the valid steps, all float32
+        """
+        tbptt_k1 = check_type(self.hyper_param, HyperParamRDPG).tbptt_k1
+        padding_value = self.hyper_param.PaddingValue
+        seq_len = s_n_t.shape[1]
+        pad_len = -seq_len % tbptt_k1 if seq_len > 0 else tbptt_k1
+        padded = [
+            np.pad(
+                np.asarray(x, dtype=np.float32),
+                ((0, 0), (0, pad_len), (0, 0)),
+                constant_values=padding_value,
+            )
+            for x in (s_n_t, a_n_t, r_n_t, ns_n_t)
         ]
-    )
-    def train_step(self, s_n_t, a_n_t, r_n_t, ns_n_t) -> Tuple[tf.Tensor, tf.Tensor]:
-        """train in one step the critic using bptt"""
+        m_n_t = np.any(padded[0] != padding_value, axis=-1, keepdims=True).astype(
+            np.float32
+        )
+        return (*padded, m_n_t)  # type: ignore
+
+    def train_step(
+        self, s_n_t, a_n_t, r_n_t, ns_n_t, m_n_t
+    ) -> Tuple[tf.Tensor, tf.Tensor]:
+        """train in one step the critic using bptt
+
+        Compiled in `__post_init__` as `train_step_graph` with the static shape [BatchSize, tbptt_k1, D],
+        the padded steps are masked out of the losses by m_n_t.
+        """
+        self.train_step_traces += 1  # python side effect, runs only when tracing
         print("tracing train_step!")
-        self.logger.info(f"start train_step with tracing")
+        self.logger.info(
+            f"start train_step with tracing, traces: {self.train_step_traces}"
+        )
+        # mask of the valid steps from the second step on, [B, T-1, 1]
+        m_n_t1 = m_n_t[:, 1:, :]
+        n_valid = tf.maximum(tf.reduce_sum(m_n_t1), 1.0)
         # logger.info(f"start train_step")
 
         gamma = tf.convert_to_tensor(self.hyper_param.Gamma, dtype=tf.float32)
@@ -542,12 +578,18 @@ class RDPG(DPG):
             # self.logger.info(f"y_n_t.shape: {y_n_t.shape}")
             print(f"y_n_t.shape: {y_n_t.shape}")
 
-            # scalar value, average over the batch, time steps
-            critic_loss = tf.math.reduce_mean(
-                y_n_t
-                - self.critic_net.evaluate_q(
-                    s_n_t[:, 1:, :], a_n_t[:, :-1, :], a_n_t[:, 1:, :]
-                )  # Q(s_t, a_{t-1}, a_t): Q(s_0, a_-1, a_0), Q(s_1, a_0, a_1), ..., Q(s_n, a_{n-1}, a_n)
+            # scalar value, average over the batch, valid time steps
+            critic_loss = (
+                tf.math.reduce_sum(
+                    m_n_t1
+                    * (
+                        y_n_t
+                        - self.critic_net.evaluate_q(
+                            s_n_t[:, 1:, :], a_n_t[:, :-1, :], a_n_t[:, 1:, :]
+                        )  # Q(s_t, a_{t-1}, a_t): Q(s_0, a_-1, a_0), Q(s_1, a_0, a_1), ..., Q(s_n, a_{n-1}, a_n)
+                    )
+                )
+                / n_valid
             )
         critic_grad = tape.gradient(
             critic_loss, self.critic_net.eager_model.trainable_variables
@@ -579,8 +621,8 @@ class RDPG(DPG):
             # logger.info(f"a_ht.shape: {self.a_ht.shape}")
             # logger.info(f"q_ht.shape: {self.q_ht.shape}")
             # -1 because we want to maximize the q_ht
-            # scalar value, average over the batch and time steps
-            actor_loss = -tf.math.reduce_mean(q_ht)
+            # scalar value, average over the batch and valid time steps
+            actor_loss = -tf.math.reduce_sum(m_n_t1 * q_ht) / n_valid
 
         actor_grad = tape.gradient(
             actor_loss, self.actor_net.eager_model.trainable_variables
@@ -604,6 +646,7 @@ class RDPG(DPG):
         self.critic_net.eager_model.reset_states()
         self.target_actor_net.eager_model.reset_states()
         self.target_critic_net.eager_model.reset_states()
+        self.reset_acting_state()
 
     def get_losses(self):
         """get the losses of the actor and critic networks"""
@@ -669,3 +712,11 @@ class RDPG(DPG):
         """save the checkpoints of the actor and critic networks"""
         self.actor_net.save_ckpt()
         self.critic_net.save_ckpt()
+
+    def get_actor_weights(self) -> list[np.ndarray]:
+        """get a copy of the moving actor weights"""
+        return self.actor_net.eager_model.get_weights()
+
+    def set_acting_weights(self, weights: list[np.ndarray]):
+        """load the actor weights into the acting actor for inference"""
+        self.acting_actor_net.eager_model.set_weights(weights)
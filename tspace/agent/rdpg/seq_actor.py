@@ -14,6 +14,7 @@ from tensorflow import keras
 # %% ../../../nbs/07.agent.rdpg.actor.ipynb 3
 from ..utils.hyperparams import HyperParamRDPG
 from ..utils.ou_action_noise import OUActionNoise
+from ..utils.checkpoint import async_checkpoint_options
 from ...system.exception import ReadOnlyError
 
 # %% ../../../nbs/07.agent.rdpg.actor.ipynb 4
@@ -93,36 +94,46 @@ class SeqActor:
             x
         )  # input (observation) padded with -10000.0, on the time dimension
 
-        x = keras.layers.Dense(hidden_dim, activation="relu")(
+        self.input_dense = keras.layers.Dense(hidden_dim, activation="relu")
+        x = self.input_dense(
             x
         )  # linear layer to map [states + actions] to [hidden_dim]
 
+        self.lstm_layers: list[keras.layers.LSTM] = []
+
         # if n_layers <= 1, the loop will be skipped in default
         for i in range(n_layers - 1):
-            x = keras.layers.LSTM(
-                hidden_dim,
-                batch_input_shape=(batch_size, None, hidden_dim),
-                return_sequences=True,
-                return_state=False,
-                stateful=True,  # stateful for batches of long sequences split into batches of shorter sequences
-                name=f"lstm_{i}",
-            )(
+            self.lstm_layers.append(
+                keras.layers.LSTM(
+                    hidden_dim,
+                    batch_input_shape=(batch_size, None, hidden_dim),
+                    return_sequences=True,
+                    return_state=False,
+                    stateful=True,  # stateful for batches of long sequences split into batches of shorter sequences
+                    name=f"lstm_{i}",
+                )
+            )
+            x = self.lstm_layers[-1](
                 x
             )  # only return full sequences of hidden states, necessary for stacking LSTM layers,
             # last hidden state is not needed
 
-        lstm_output = keras.layers.LSTM(
-            hidden_dim,
-            batch_input_shape=(batch_size, None, hidden_dim),
-            return_sequences=True,
-            return_state=False,  # return hidden and cell states for inference of each time step,
-            stateful=True,  # stateful for batches of long sequences split into batches of shorter sequences
-            name=f"lstm_{n_layers - 1}",
-            # need to reset_states when the episode ends
-        )(x)
+        self.lstm_layers.append(
+            keras.layers.LSTM(
+                hidden_dim,
+                batch_input_shape=(batch_size, None, hidden_dim),
+                return_sequences=True,
+                return_state=False,  # return hidden and cell states for inference of each time step,
+                stateful=True,  # stateful for batches of long sequences split into batches of shorter sequences
+                name=f"lstm_{n_layers - 1}",
+                # need to reset_states when the episode ends
+            )
+        )
+        lstm_output = self.lstm_layers[-1](x)
 
         # rescale the output of the lstm layer to (-1, 1)
-        action_output = keras.layers.Dense(action_dim, activation="tanh")(lstm_output)
+        self.output_dense = keras.layers.Dense(action_dim, activation="tanh")
+        action_output = self.output_dense(lstm_output)
 
         self.eager_model = tf.keras.Model([states, last_actions], action_output)
         # no need to evaluate the last action separately
@@ -176,12 +187,12 @@ class SeqActor:
         )
 
     def save_ckpt(self):
-        """Save the checkpoint."""
+        """Save the checkpoint in the background, see `async_checkpoint_options`."""
         self.ckpt.step.assign_add(1)
         if int(self.ckpt.step) % self.ckpt_interval == 0:
-            save_path = self.ckpt_manager.save()
+            save_path = self.ckpt_manager.save(options=async_checkpoint_options())
             self.logger.info(
-                f"Saved ckpt for step {int(self.ckpt.step)}: {save_path}",
+                f"Saving ckpt for step {int(self.ckpt.step)}: {save_path}",
                 extra=self.dict_logger,
             )
 
@@ -243,6 +254,49 @@ class SeqActor:
         action = action_seq[:, -1, :]  # get the last step action
         return action
 
+    def initial_cell_state(self) -> tf.Tensor:
+        """Zero LSTM state for single-sample inference, shape [n_layers, 2 (h, c), 1, hidden_dim]."""
+        return tf.zeros(
+            (len(self.lstm_layers), 2, 1, self._hidden_dim), dtype=tf.float32
+        )
+
+    @tf.function(
+        input_signature=[
+            tf.TensorSpec(
+                shape=[1, None], dtype=tf.float32
+            ),  # [1, 600] for cloud / [1, 90] for kvaser
+            tf.TensorSpec(
+                shape=[1, None], dtype=tf.float32
+            ),  # [1, 68] for both cloud and kvaser
+            tf.TensorSpec(
+                shape=[None, 2, 1, None], dtype=tf.float32
+            ),  # [n_layers, (h, c), 1, hidden_dim]
+        ]
+    )
+    def predict_cell(self, state, last_action, cell_state):
+        """Predict the action of a single time step with explicit LSTM state.
+
+        For inferring. The step runs through the cells of the training LSTM layers,
+        so the weights are shared with `eager_model`, while the state is carried by the caller
+        instead of the fixed-batch stateful layers.
+
+        Args:
+
+            state (tf.Tensor): State of the current step, [1, state_dim].
+            last_action (tf.Tensor): Last action, [1, action_dim].
+            cell_state (tf.Tensor): LSTM state from the last step, [n_layers, 2, 1, hidden_dim].
+
+        Return:
+            tuple: action [1, action_dim] without noise and the updated LSTM state
+        """
+        x = self.input_dense(tf.concat([state, last_action], axis=-1))
+        next_cell_state = []
+        for i, lstm in enumerate(self.lstm_layers):
+            x, (h, c) = lstm.cell(x, [cell_state[i, 0], cell_state[i, 1]])
+            next_cell_state.append(tf.stack([h, c]))
+        action = self.output_dense(x)
+        return action, tf.stack(next_cell_state)
+
     @tf.function(
         input_signature=[
             tf.TensorSpec(
@@ -12,6 +12,7 @@ from tensorflow import keras
 
 # %% ../../../nbs/07.agent.rdpg.critic.ipynb 4
 from ..utils.hyperparams import HyperParamRDPG
+from ..utils.checkpoint import async_checkpoint_options
 from ...system.exception import ReadOnlyError
 
 # %% ../../../nbs/07.agent.rdpg.critic.ipynb 5
@@ -173,12 +174,12 @@ class SeqCritic:
         )
 
     def save_ckpt(self):
-        """Save the checkpoint."""
+        """Save the checkpoint in the background, see `async_checkpoint_options`."""
         self.ckpt.step.assign_add(1)  # type: ignore
         if int(self.ckpt.step) % self.ckpt_interval == 0:  # type: ignore
-            save_path = self.ckpt_manager.save()
+            save_path = self.ckpt_manager.save(options=async_checkpoint_options())
             self.logger.info(
-                f"Saved ckpt for step {int(self.ckpt.step)}: {save_path}",  # type: ignore
+                f"Saving ckpt for step {int(self.ckpt.step)}: {save_path}",  # type: ignore
                 extra=self.dict_logger,
             )
 
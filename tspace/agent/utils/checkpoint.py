@@ -0,0 +1,107 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../../../nbs/07.agent.utils.checkpoint.ipynb.
+
+# %% auto 0
+__all__ = ['async_checkpoint_options', 'write_atomic', 'AsyncWriter']
+
+# %% ../../../nbs/07.agent.utils.checkpoint.ipynb 3
+import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from threading import BoundedSemaphore
+from typing import Callable, Optional
+import tensorflow as tf
+
+# %% ../../../nbs/07.agent.utils.checkpoint.ipynb 4
+def async_checkpoint_options() -> tf.train.CheckpointOptions:
+    """
+    Options for `tf.train.CheckpointManager.save` to write the checkpoint asynchronously.
+
+    The variables are copied to the host and written by a background thread of the checkpoint,
+    a new save waits for the previous one of the same checkpoint, so at most one save per checkpoint is in flight.
+    The checkpoint manager records the new checkpoint as the latest only when its files are written.
+    Falls back to the synchronous default if the TensorFlow version has no asynchronous checkpoint.
+    """
+    for option in ("enable_async", "experimental_enable_async_checkpoint"):
+        try:
+            return tf.train.CheckpointOptions(**{option: True})
+        except TypeError:
+            continue
+    return tf.train.CheckpointOptions()
+
+# %% ../../../nbs/07.agent.utils.checkpoint.ipynb 5
+def write_atomic(
+    path: Path,  # destination file
+    data: bytes,  # file content
+):
+    """Write the file next to its destination and rename it, so the destination is either the old or the new file"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+# %% ../../../nbs/07.agent.utils.checkpoint.ipynb 6
+class AsyncWriter:
+    """
+    Background writer for checkpoints that are not TensorFlow variables, e.g. Flax parameters.
+
+    The caller snapshots the state into host memory and submits the write of the snapshot.
+    Writes run one after another in a single thread; `submit` blocks while `max_in_flight` writes are pending,
+    which bounds the memory held by the snapshots. A failed write is logged as soon as it finishes,
+    the owner closes the writer at the end of training to join the pending writes.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 1,  # maximal number of pending writes
+        name: str = "ckpt_writer",  # name prefix of the writer thread
+        logger: Optional[logging.Logger] = None,  # logger of the failed writes
+        dict_logger: Optional[dict] = None,  # logger format specs
+    ):
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be positive, got {max_in_flight}")
+        self.slots = BoundedSemaphore(max_in_flight)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self.last: Optional[Future] = None
+        self.logger = logger if logger is not None else logging.getLogger(__name__)
+        self.dict_logger = dict_logger
+
+    def submit(
+        self,
+        write: Callable[[], None],  # writes a snapshot already taken
+    ) -> Future:  # done when the snapshot is on disk
+        """Queue a write, blocking while the writer is full"""
+        self.slots.acquire()
+        try:
+            future = self.executor.submit(write)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(self.done)
+        self.last = future
+        return future
+
+    def done(
+        self,
+        future: Future,  # the finished write
+    ):
+        """Free the slot of a finished write and log its exception if it failed"""
+        self.slots.release()
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.error(
+                "checkpoint write failed: %s",
+                future.exception(),
+                exc_info=future.exception(),
+                extra=self.dict_logger,
+            )
+
+    def sync(self):
+        """Wait for the pending writes, raise the exception of the last one if it failed"""
+        if self.last is not None:
+            self.last.result()
+
+    def close(self):
+        """Finish the pending writes and stop the writer thread"""
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,151 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../../../nbs/07.agent.utils.inference.ipynb.
+
+# %% auto 0
+__all__ = ['backends', 'backend_requirements', 'InferenceBackend', 'KerasBackend', 'TFLiteBackend', 'OnnxBackend',
+           'available_backends', 'make_backend']
+
+# %% ../../../nbs/07.agent.utils.inference.ipynb 3
+import abc
+import importlib.util
+from threading import Lock
+from typing import Callable
+import numpy as np
+import tensorflow as tf
+
+# %% ../../../nbs/07.agent.utils.inference.ipynb 4
+class InferenceBackend(abc.ABC):
+    """
+    Abstract inference backend of a feed-forward actor with one input and one output.
+
+    `predict` takes and returns numpy arrays with the batch as the first dimension.
+    """
+
+    name: str = ""
+
+    @abc.abstractmethod
+    def predict(
+        self, states: np.ndarray  # flat states, [N, observation_numel]
+    ) -> np.ndarray:  # actions without noise, [N, torque_flash_numel]
+        """Evaluate the actor on a batch of states"""
+        pass
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
+
+# %% ../../../nbs/07.agent.utils.inference.ipynb 5
+class KerasBackend(InferenceBackend):
+    """
+    Run the Keras model in a `tf.function`.
+
+    The model is not copied, so later weight updates of the model take effect immediately.
+    """
+
+    name = "keras"
+
+    def __init__(self, model: tf.keras.Model):
+        self.model = model
+        self.infer = tf.function(model, reduce_retracing=True)
+
+    def predict(self, states: np.ndarray) -> np.ndarray:
+        return self.infer(tf.convert_to_tensor(states, dtype=tf.float32)).numpy()
+
+# %% ../../../nbs/07.agent.utils.inference.ipynb 6
+class TFLiteBackend(InferenceBackend):
+    """
+    Run a TFLite conversion of the Keras model in the TFLite interpreter on the CPU.
+
+    The interpreter is not thread safe, the calls are serialized by a lock.
+    The input tensor is resized when the batch size changes.
+    """
+
+    name = "tflite"
+
+    def __init__(self, model: tf.keras.Model):
+        self.content = tf.lite.TFLiteConverter.from_keras_model(model).convert()
+        self.interpreter = tf.lite.Interpreter(model_content=self.content)
+        self.input_index = self.interpreter.get_input_details()[0]["index"]
+        self.output_index = self.interpreter.get_output_details()[0]["index"]
+        self.batch_size = 0
+        self.lock = Lock()
+
+    def predict(self, states: np.ndarray) -> np.ndarray:
+        states = np.asarray(states, dtype=np.float32)
+        with self.lock:
+            if len(states) != self.batch_size:
+                self.interpreter.resize_tensor_input(self.input_index, states.shape)
+                self.interpreter.allocate_tensors()
+                self.batch_size = len(states)
+            self.interpreter.set_tensor(self.input_index, states)
+            self.interpreter.invoke()
+            return self.interpreter.get_tensor(self.output_index).copy()
+
+# %% ../../../nbs/07.agent.utils.inference.ipynb 7
+class OnnxBackend(InferenceBackend):
+    """
+    Run an ONNX conversion of the Keras model in ONNX Runtime on the CPU.
+
+    Requires the optional packages `tf2onnx` and `onnxruntime`.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model: tf.keras.Model):
+        import onnxruntime  # type: ignore
+        import tf2onnx  # type: ignore
+
+        spec = (
+            tf.TensorSpec(
+                (None, *model.inputs[0].shape[1:]), tf.float32, name="states"
+            ),
+        )
+        proto, _ = tf2onnx.convert.from_keras(model, input_signature=spec)
+        self.session = onnxruntime.InferenceSession(
+            proto.SerializeToString(), providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict(self, states: np.ndarray) -> np.ndarray:
+        return self.session.run(
+            None, {self.input_name: np.asarray(states, dtype=np.float32)}
+        )[0]
+
+# %% ../../../nbs/07.agent.utils.inference.ipynb 8
+backends: dict[str, Callable[[tf.keras.Model], InferenceBackend]] = {
+    "keras": KerasBackend,
+    "tflite": TFLiteBackend,
+    "onnx": OnnxBackend,
+}
+backend_requirements: dict[str, list[str]] = {
+    "keras": [],
+    "tflite": [],
+    "onnx": ["tf2onnx", "onnxruntime"],
+}
+
+
+def available_backends() -> list[str]:
+    """names of the backends whose optional packages are installed"""
+    return [
+        name
+        for name, packages in backend_requirements.items()
+        if all(importlib.util.find_spec(package) is not None for package in packages)
+    ]
+
+
+def make_backend(
+    name: str,  # backend name, one of `backends`
+    model: tf.keras.Model,  # keras model to export
+) -> InferenceBackend:
+    """
+    Export the model into the named backend.
+
+    raise: ValueError if the name is unknown, ImportError if the optional packages are missing
+    """
+    if name not in backends:
+        raise ValueError(
+            f"inference backend {name} unknown, choose from {list(backends)}"
+        )
+    if name not in available_backends():
+        raise ImportError(
+            f"inference backend {name} requires {backend_requirements[name]}"
+        )
+    return backends[name](model)
@@ -0,0 +1,86 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../../../nbs/07.agent.utils.observation_block.ipynb.
+
+# %% auto 0
+__all__ = ['ObservationBlock']
+
+# %% ../../../nbs/07.agent.utils.observation_block.ipynb 3
+from dataclasses import dataclass, field
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+# %% ../../../nbs/07.agent.utils.observation_block.ipynb 4
+@dataclass
+class ObservationBlock:
+    """
+    Growable float32 block of the observations of the current episode.
+
+    The column positions of each part of the observation are resolved from the MultiIndex of the first
+    observation by the same `.loc` selectors as for the Series, which keeps the column order.
+    The rows are stored contiguously, the parts are contiguous column slices of the block.
+
+    Attributes:
+
+        - selectors: dict, `.loc` selector of each part, e.g. {"state": idx["state", ["velocity", "thrust", "brake"]]}
+        - capacity: int, initial number of rows, doubled when full
+        - seed: Optional[int], seed of the random generator for sampling
+    """
+
+    selectors: dict
+    capacity: int = 256
+    seed: Optional[int] = None
+    count: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        """Allocate the random generator, the block is allocated at the first observation"""
+        if self.capacity < 1:
+            raise ValueError(f"capacity must be positive, got {self.capacity}")
+        self.rng = np.random.default_rng(self.seed)
+        self.columns: Optional[np.ndarray] = None  # positions in the observation Series
+        self.slices: dict[str, slice] = {}  # column slices of the parts in the block
+        self.block: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def resolve(self, observation: pd.Series):
+        """Resolve the column positions and the part slices from the index of an observation"""
+        positions = pd.Series(np.arange(len(observation)), index=observation.index)
+        columns = []
+        start = 0
+        for name, selector in self.selectors.items():
+            part = np.asarray(positions.loc[selector].values, dtype=np.int64)
+            columns.append(part)
+            self.slices[name] = slice(start, start + len(part))
+            start += len(part)
+        self.columns = np.concatenate(columns)
+        self.block = np.empty((self.capacity, len(self.columns)), dtype=np.float32)
+
+    def append(self, observation: pd.Series):
+        """Gather the numeric columns of an observation into the next row, doubling the block if full"""
+        if self.columns is None:
+            self.resolve(observation)
+        assert self.block is not None and self.columns is not None
+        if self.count == len(self.block):
+            self.block = np.concatenate([self.block, np.empty_like(self.block)])
+        self.block[self.count] = observation.values[self.columns].astype(np.float32)
+        self.count += 1
+
+    def clear(self):
+        """Drop the rows for a new episode, keeping the allocated block and the resolved columns"""
+        self.count = 0
+
+    def sample(
+        self, batch_size: int  # number of rows to sample with replacement
+    ) -> tuple[np.ndarray, ...]:
+        """
+        Sample rows with replacement by a single gather.
+
+        return: tuple of arrays of the parts in the order of `selectors`, each [batch_size, part width]
+        raise: ValueError if the block is empty
+        """
+        if self.count == 0:
+            raise ValueError("no observation in the block")
+        assert self.block is not None
+        rows = self.block[self.rng.integers(0, self.count, batch_size)]
+        return tuple(rows[:, part] for part in self.slices.values())
@@ -1,9 +1,10 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../../nbs/07.agent.utils.ou_action_noise.ipynb.
 
 # %% auto 0
-__all__ = ['OUActionNoise']
+__all__ = ['OUActionNoise', 'BatchedOUActionNoise']
 
 # %% ../../../nbs/07.agent.utils.ou_action_noise.ipynb 3
+from threading import Lock
 import numpy as np
 
 # %% ../../../nbs/07.agent.utils.ou_action_noise.ipynb 4
@@ -47,3 +48,76 @@ class OUActionNoise:
             self.x_prev = self.x_initial
         else:
             self.x_prev = np.zeros_like(self.mean)
+
+# %% ../../../nbs/07.agent.utils.ou_action_noise.ipynb 5
+class BatchedOUActionNoise:
+    """Independent Ornstein-Uhlenbeck processes of several streams (e.g. the trucks of a fleet), advanced in one vectorized step."""
+
+    def __init__(
+        self,
+        mean,  # mean of the noise, [action_dim]
+        std_deviation,  # standard deviation of the noise, [action_dim]
+        num_streams=1,  # number of independent noise streams
+        theta=0.15,  # $\theta$ is the rate of mean reversion
+        dt=1e-2,  # dt is the time step
+        x_initial=None,  # x_initial is the initial value of x, [action_dim]
+        seed=None,  # seed of the random generator, None for fresh entropy
+    ):
+        self.theta = theta
+        self.mean = np.asarray(mean)
+        self.std_dev = np.asarray(std_deviation)
+        self.dt = dt
+        self.x_initial = x_initial
+        self.rng = np.random.default_rng(seed)
+        self.lock = (
+            Lock()
+        )  # streams are reset by the crunchers while the inference thread advances them
+        self.x_prev = np.empty((num_streams, *self.mean.shape))
+        self.reset()
+
+    @property
+    def num_streams(self) -> int:
+        """Number of noise streams"""
+        return len(self.x_prev)
+
+    def add_streams(
+        self,
+        n=1,  # number of new streams
+    ) -> np.ndarray:  # indices of the new streams
+        """Append n freshly reset streams, e.g. for the trucks joining a fleet."""
+        with self.lock:
+            start = self.num_streams
+            self.x_prev = np.concatenate([self.x_prev, np.empty((n, *self.mean.shape))])
+        self.reset(np.arange(start, start + n))
+        return np.arange(start, start + n)
+
+    def __call__(
+        self,
+        streams=None,  # index (int, array or slice) of the streams to advance, None for all
+    ) -> (
+        np.ndarray
+    ):  # noise of the streams, [len(streams), action_dim], [action_dim] for an int index
+        """
+        Advance the selected streams by one step, the others keep their state.
+
+        Formula taken from [Ornstein-Uhlenbeck](https://www.wikipedia.org/wiki/Ornstein-Uhlenbeck_process).
+        """
+        idx = slice(None) if streams is None else streams
+        with self.lock:
+            x_prev = self.x_prev[idx]
+            x = (
+                x_prev
+                + self.theta * (self.mean - x_prev) * self.dt
+                + self.std_dev * np.sqrt(self.dt) * self.rng.normal(size=x_prev.shape)
+            )
+            self.x_prev[idx] = x
+        return x
+
+    def reset(
+        self,
+        streams=None,  # index (int, array or slice) of the streams to reset, None for all
+    ):
+        """Reset the selected streams, e.g. at the episode boundary of a truck."""
+        idx = slice(None) if streams is None else streams
+        with self.lock:
+            self.x_prev[idx] = 0.0 if self.x_initial is None else self.x_initial
@@ -1,12 +1,13 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/00.avatar.ipynb.
 
 # %% auto 0
-__all__ = ['repo', 'proj_root', 'parser', 'Avatar', 'main']
+__all__ = ['repo', 'proj_root', 'parser', 'Avatar', 'main_multiprocess', 'get_data_root', 'make_agent', 'main_fleet', 'main']
 
 # %% ../nbs/00.avatar.ipynb 3
 import abc
 import argparse
 import concurrent.futures
+import multiprocessing as mp
 
 import logging
 
@@ -50,10 +51,15 @@ from tspace.config.utils import (
 
 from .dataflow.cloud import Cloud
 from .dataflow.cruncher import Cruncher
+from .dataflow.fleet import BatchedInference
 from .dataflow.kvaser import Kvaser
+from .dataflow.learner import Learner
 from .dataflow.pipeline.queue import Pipeline
+from .dataflow.pipeline.event import NotifyingEvent
+from .dataflow.pipeline.shm import MotionPowerPipelineShm, TorqueTablePipelineShm
 from .system.log import set_root_logger
 from .system.graceful_killer import GracefulKiller
+from .system.trace import get_tracer
 
 # %% ../nbs/00.avatar.ipynb 5
 from .agent.dpg import DPG
@@ -78,10 +84,15 @@ from tspace.config.utils import (
 
 from .dataflow.cloud import Cloud
 from .dataflow.cruncher import Cruncher
+from .dataflow.fleet import BatchedInference
 from .dataflow.kvaser import Kvaser
+from .dataflow.learner import Learner
 from .dataflow.pipeline.queue import Pipeline
+from .dataflow.pipeline.event import NotifyingEvent
+from .dataflow.pipeline.shm import MotionPowerPipelineShm, TorqueTablePipelineShm
 from .system.log import set_root_logger
 from .system.graceful_killer import GracefulKiller
+from .system.trace import get_tracer
 
 # %% ../nbs/00.avatar.ipynb 6
 repo = Repo(".", search_parent_directories=True)
@@ -103,6 +114,12 @@ class Avatar(abc.ABC):
         _trip_server: TripMessenger
         _resume: bool
         _infer_mode: bool
+        background_learning: bool
+        updates_per_episode: float
+        pipelined_flash: bool
+        remotecan_connections: int
+        learner: Optional[Learner], background learner shared by the avatars of a fleet
+        engine: Optional[BatchedInference], batched inference shared by the avatars of a fleet
         logger: logging.Logger
         dict_logger: dict
         data_root: Path
@@ -120,6 +137,12 @@ class Avatar(abc.ABC):
     _resume: bool = True
     _infer_mode: bool = False
     cruncher: Optional[Cruncher] = None
+    background_learning: bool = False
+    updates_per_episode: float = 6.0
+    pipelined_flash: bool = False
+    remotecan_connections: int = 1
+    learner: Optional[Learner] = None
+    engine: Optional[BatchedInference] = None
     data_root: Path = Path(".") / "data"
     log_root: Optional[Path] = None
 
@@ -167,6 +190,15 @@ class Avatar(abc.ABC):
             f"{{'header': 'Tensorflow Imported!'}}", extra=self.dict_logger
         )
 
+        # raw spans of the per-stage latency tracing, summaries go to TensorBoard by the cruncher
+        get_tracer().jsonl_path = self.data_root.joinpath(
+            "trace-"
+            + self.truck.vid
+            + "-"
+            + pd.Timestamp.now(self.truck.site.tz).isoformat()
+            + ".jsonl"
+        )
+
         if self.can_server.protocol == "udp":
             self.vehicle_interface: Kvaser = Kvaser(  # Producer~Consumer~Filter
                 truck=cast(TruckInField, self.truck),
@@ -174,6 +206,7 @@ class Avatar(abc.ABC):
                 can_server=self.can_server,
                 resume=self.resume,
                 data_dir=self.data_root,
+                pipelined_flash=self.pipelined_flash,
                 logger=self.logger,
                 dict_logger=self.dict_logger,
             )
@@ -185,10 +218,20 @@ class Avatar(abc.ABC):
                 trip_server=self.trip_server,
                 resume=self.resume,
                 data_dir=self.data_root,
+                pipelined_flash=self.pipelined_flash,
+                remotecan_connections=self.remotecan_connections,
                 logger=self.logger,
                 dict_logger=self.dict_logger,
             )
 
+        learner = self.learner
+        if learner is None and self.background_learning and not self.infer_mode:
+            learner = Learner(  # trains in the background while the cruncher infers
+                agent=self.agent,
+                updates_per_episode=self.updates_per_episode,
+                logger=self.logger,
+                dict_logger=self.dict_logger,
+            )
         self.cruncher = Cruncher(  # Consumer
             agent=self.agent,
             truck=self.truck,
@@ -198,6 +241,11 @@ class Avatar(abc.ABC):
             data_dir=self.data_root,
             logger=self.logger,
             dict_logger=self.dict_logger,
+            learner=learner,
+            updates_per_episode=max(int(self.updates_per_episode), 1),
+            pipelined_flash=self.pipelined_flash,
+            engine=self.engine,
+            close_pool_on_exit=self.engine is None,  # the fleet closes its shared pool
         )
 
     @property
@@ -392,54 +440,188 @@ parser.add_argument(
     "system will exit",
 )
 
+# %% ../nbs/00.avatar.ipynb 28
+parser.add_argument(
+    "--multiprocess",
+    default=False,
+    help="run the vehicle interface (HMI, capture, filter, flash, watchdog) in a separate process, "
+    "the cruncher (inference and training) stays in the main process; "
+    "observations and torque tables are passed through shared memory, events are cross-process",
+    action="store_true",
+)
+
 # %% ../nbs/00.avatar.ipynb 29
-def main(args: argparse.Namespace) -> None:
-    """
-    Description: main function to start the Avatar.
+parser.add_argument(
+    "--background_learning",
+    default=False,
+    help="train in a background learner thread while the cruncher keeps inferring, "
+    "the acting actor picks up the latest published weights at the start of each episode; "
+    "otherwise train inline at the end of each episode",
+    action="store_true",
+)
 
-    Initialize the Avatar with truck, driver, can server, trip server, and agent for input arguments.
-    Create the first tier of the cascaded threading pools for vehicle interface and crucher.
+# %% ../nbs/00.avatar.ipynb 30
+parser.add_argument(
+    "--updates_per_episode",
+    type=float,
+    default=6.0,
+    help="ratio of gradient updates to collected episodes; "
+    "the background learner runs freely without throttling if <= 0",
+)
 
-    """
-    # set up logging
-    # set up data folder (logging, checkpoint, table)
+# %% ../nbs/00.avatar.ipynb 31
+parser.add_argument(
+    "--pipelined_flash",
+    default=False,
+    help="capture the next observation window while the current torque table is flashed, "
+    "each window records the versions of the active table; "
+    "not supported with --multiprocess, where capture and flash stay in lockstep",
+    action="store_true",
+)
 
-    # set up data folder (logging, checkpoint, table)
-    try:
-        truck: Union[TruckInField, TruckInCloud] = str_to_truck(args.vehicle)
-    except KeyError:
-        raise KeyError(f"vehicle {args.vehicle} not found in config file")
-    else:
-        print(f"Vehicle found. vid:{truck.vid}, vin: {truck.vin}.")
+# %% ../nbs/00.avatar.ipynb 32
+parser.add_argument(
+    "--log_sample_every",
+    type=int,
+    default=1,
+    help="log only every n-th info record of the real-time threads (cruncher and vehicle interface filters), "
+    "warnings and errors are always logged",
+)
 
-    try:
-        driver: Driver = str_to_driver(args.driver)
-    except KeyError:
-        raise KeyError(f"driver {args.driver} not found in config file")
-    else:
-        print(f"Driver found. pid:{driver.pid}, name: {driver.name}.")
+# %% ../nbs/00.avatar.ipynb 33
+parser.add_argument(
+    "--remotecan_connections",
+    type=int,
+    default=1,
+    help="concurrent connections to the remote can server in cloud mode; "
+    "if > 1, the asynchronous client fetches signals and flashes tables concurrently",
+)
 
-    # remotecan_srv: str = 'can_intra'
-    try:
-        can_server = str_to_can_server(args.interface)
-    except KeyError:
-        raise KeyError(f"can server {args.interface} not found in config file")
-    else:
-        print(f"CAN Server found: {can_server.server_name}")
+# %% ../nbs/00.avatar.ipynb 34
+parser.add_argument(
+    "--fleet",
+    type=str,
+    default=None,
+    help="host a fleet of cloud trucks in one process, comma-separated list of vehicle[:driver[:trip]]; "
+    "the trucks share the networks, the pool and a batched inference engine",
+)
+
+# %% ../nbs/00.avatar.ipynb 35
+parser.add_argument(
+    "--fleet_max_wait",
+    type=float,
+    default=0.005,
+    help="seconds the fleet inference engine waits to fill a batch after the first state",
+)
+
+# %% ../nbs/00.avatar.ipynb 36
+parser.add_argument(
+    "--episode_mix_ratio",
+    type=float,
+    default=0.0,
+    help="fraction of a ddpg minibatch drawn from the current episode when sampling from the pool, 0 for pool only, "
+    "episode agents (rdpg/idql) sample whole sequences and reject a nonzero ratio",
+)
 
+# %% ../nbs/00.avatar.ipynb 37
+parser.add_argument(
+    "--inference_backend",
+    type=str,
+    default="keras",
+    choices=["keras", "tflite", "onnx"],
+    help="runtime of the ddpg acting actor; tflite and onnx run a cpu snapshot re-exported at each weight update, "
+    "onnx requires tf2onnx and onnxruntime",
+)
+
+# %% ../nbs/00.avatar.ipynb 39
+def main_multiprocess(
+    avatar: Avatar,  # initialized avatar with vehicle interface and cruncher
+    args: argparse.Namespace,  # command line arguments
+    logger: logging.Logger,  # logger
+    dict_logger: dict,  # logger dict
+) -> None:
+    """
+    Run the vehicle interface in a child process and the cruncher in the main process.
+
+    Capture jitter of the vehicle interface is thus decoupled from inference and training in the cruncher,
+    which no longer share a GIL. The observation and flash pipelines are rings in shared memory,
+    the events are `multiprocessing` events (polled by `wait_for_events`).
+    The child process is forked to inherit the initialized vehicle interface, it doesn't use TensorFlow.
+    """
+    ctx = mp.get_context("fork")
+    truck = avatar.truck
+    observe_pipeline = MotionPowerPipelineShm(
+        observation_length=truck.observation_length,
+        tz=truck.site.tz,
+        maxsize=3,
+        ctx=ctx,
+    )  # shared memory pipeline for observations
+    flash_pipeline = TorqueTablePipelineShm(
+        row_number=truck.torque_table_row_num_flash,
+        pedal_scale=truck.pedal_scale,
+        maxsize=3,
+        ctx=ctx,
+    )  # shared memory pipeline for flashing torque tables
+    start_event = ctx.Event()
+    stop_event = ctx.Event()
+    interrupt_event = ctx.Event()
+    exit_event = ctx.Event()
+    flash_event = ctx.Event()
+
+    # Gracefulkiller instance can be created only in the main thread!
+    killer = GracefulKiller(exit_event)
+    vehicle_process = ctx.Process(
+        target=avatar.vehicle_interface.ignite,  # observe process (spawns threads for input, HMI and output)
+        args=(
+            observe_pipeline,  # input port; output
+            flash_pipeline,  # out port; input
+            start_event,
+            stop_event,
+            interrupt_event,
+            flash_event,
+            exit_event,
+            float(args.watchdog_nap_time),
+            int(args.watchdog_capture_error_upper_bound),
+            int(args.watchdog_flash_error_upper_bound),
+        ),
+        name="vehicle_interface",
+    )
+    vehicle_process.start()
+    logger.info(
+        f"{{'header': 'vehicle interface process starts!', 'pid': {vehicle_process.pid}}}",
+        extra=dict_logger,
+    )
     try:
-        trip_server = str_to_trip_server(args.trip)
-    except KeyError:
-        raise KeyError(f"trip server {args.web} not found in config file")
-    else:
-        print(f"Trip Server found: {trip_server.server_name}")
+        avatar.cruncher.filter(  # data crunch in the main process
+            observe_pipeline,  # output port; input
+            flash_pipeline,  # input port; output
+            start_event,
+            stop_event,
+            interrupt_event,
+            flash_event,
+            exit_event,
+        )
+    finally:
+        exit_event.set()
+        vehicle_process.join()
+        observe_pipeline.close()
+        flash_pipeline.close()
+        logger.info(
+            f"{{'header': 'vehicle interface process dies!', 'exitcode': {vehicle_process.exitcode}}}",
+            extra=dict_logger,
+        )
 
-    assert args.agent in [
-        "ddpg",
-        "rdpg",
-        "idql",
-    ], "agent must be either ddpg, rdpg or idql"
+# %% ../nbs/00.avatar.ipynb 40
+def get_data_root(
+    args: argparse.Namespace,  # command line arguments
+    truck: Union[TruckInField, TruckInCloud],  # truck of the session
+    driver: Driver,  # driver of the session
+) -> Path:
+    """
+    Get the data folder (logging, checkpoint, table) of a truck and driver.
 
+    return: data root under `data/` when resuming, under `data/scratch/` otherwise
+    """
     if args.resume:
         data_root = proj_root.joinpath("data/" + truck.vin + "-" + driver.pid).joinpath(
             args.path
@@ -448,17 +630,22 @@ def main(args: argparse.Namespace) -> None:
         data_root = proj_root.joinpath(
             "data/scratch/" + truck.vin + "-" + driver.pid
         ).joinpath(args.path)
+    return data_root
 
-    logger, dict_logger = set_root_logger(
-        name="eos",
-        data_root=data_root,
-        agent=args.agent,
-        tz=truck.site.tz,
-        truck=truck.vid,
-        driver=driver.pid,
-    )
-    logger.info(f"{{'header': 'Start Logging'}}", extra=dict_logger)
 
+def make_agent(
+    args: argparse.Namespace,  # command line arguments
+    truck: Union[TruckInField, TruckInCloud],  # truck of the session
+    driver: Driver,  # driver of the session
+    data_root: Path,  # data folder of the agent
+    logger: logging.Logger,  # root logger
+    dict_logger: dict,  # logger format specs
+) -> DPG:
+    """
+    Create the agent selected by `args.agent`.
+
+    return: DDPG, RDPG or IDQL agent
+    """
     if args.agent == "ddpg":
         agent: DDPG = DDPG(
             _coll_type="RECORD",
@@ -471,6 +658,8 @@ def main(args: argparse.Namespace) -> None:
             _resume=args.resume,
             logger=logger,
             dict_logger=dict_logger,
+            episode_mix_ratio=args.episode_mix_ratio,
+            inference_backend=args.inference_backend,
         )
     elif args.agent == "rdpg":
         agent: RDPG = RDPG(  # type: ignore
@@ -497,8 +686,249 @@ def main(args: argparse.Namespace) -> None:
             _resume=args.resume,
             logger=logger,
             dict_logger=dict_logger,
+            episode_mix_ratio=args.episode_mix_ratio,
+        )
+    return agent
+
+# %% ../nbs/00.avatar.ipynb 41
+def main_fleet(args: argparse.Namespace) -> None:
+    """
+    Description: host a fleet of cloud trucks in one process.
+
+    Each truck gets its own Avatar (vehicle interface and cruncher) and its own episode state,
+    while the networks, the data pool and the learner are shared.
+    All crunchers submit their states to a single BatchedInference engine,
+    so that one forward pass serves the whole fleet.
+    `args.fleet` is a comma-separated list of `vehicle[:driver[:trip]]`,
+    the driver and trip server default to `args.driver` and `args.trip`.
+
+    raise: ValueError if the fleet is empty, a truck is not a cloud truck or the agent is RDPG
+    """
+    defaults = [None, args.driver, args.trip]
+    specs = []
+    for item in args.fleet.split(","):
+        if not item.strip():
+            continue
+        parts = item.strip().split(":")
+        specs.append(parts + defaults[len(parts) :])
+    if not specs:
+        raise ValueError(f"fleet {args.fleet} has no truck")
+    if args.agent not in ["ddpg", "idql"]:
+        raise ValueError(
+            f"agent {args.agent} not supported in fleet mode, the stateful rdpg actor cannot be shared"
+        )
+
+    members = []
+    for vehicle, driver_name, trip in specs:
+        try:
+            truck = str_to_truck(vehicle)
+        except KeyError:
+            raise KeyError(f"vehicle {vehicle} not found in config file")
+        if not isinstance(truck, TruckInCloud):
+            raise ValueError(f"fleet mode supports only cloud trucks, got {vehicle}")
+        try:
+            driver: Driver = str_to_driver(driver_name)
+        except KeyError:
+            raise KeyError(f"driver {driver_name} not found in config file")
+        try:
+            trip_server = str_to_trip_server(trip)
+        except KeyError:
+            raise KeyError(f"trip server {trip} not found in config file")
+        members.append((truck, driver, trip_server))
+    print(f"Fleet found: {[truck.vid for truck, _, _ in members]}")
+
+    try:
+        can_server = str_to_can_server(args.interface)
+    except KeyError:
+        raise KeyError(f"can server {args.interface} not found in config file")
+
+    fleet_root = proj_root.joinpath(
+        "data/fleet-" + "-".join(truck.vid for truck, _, _ in members)
+    ).joinpath(args.path)
+    logger, dict_logger = set_root_logger(
+        name="eos",
+        data_root=fleet_root,
+        agent=args.agent,
+        tz=members[0][0].site.tz,
+        truck="fleet",
+        driver="fleet",
+        sample_every={  # sample the step-level records of the real-time threads
+            thread_name: args.log_sample_every
+            for thread_name in ("cruncher_consume", "kvaser_filter", "cloud_filter")
+        },
+    )
+    logger.info(f"{{'header': 'Start Logging'}}", extra=dict_logger)
+
+    # the first truck owns the networks and the pool, the others are shallow copies
+    truck, driver, _ = members[0]
+    agent = make_agent(
+        args, truck, driver, get_data_root(args, truck, driver), logger, dict_logger
+    )
+    agents = [agent] + [
+        agent.fleet_copy(truck, driver) for truck, driver, _ in members[1:]
+    ]
+
+    learner = None
+    if args.learning:
+        learner = Learner(  # one learner trains the shared networks for the whole fleet
+            agent=agent,
+            updates_per_episode=args.updates_per_episode,
+            logger=logger,
+            dict_logger=dict_logger,
+        )
+    engine = BatchedInference(
+        agent=agent,
+        max_batch=len(members),
+        max_wait=args.fleet_max_wait,
+        learner=learner,
+        logger=logger,
+        dict_logger=dict_logger,
+    )
+
+    avatars = []
+    for (truck, driver, trip_server), member_agent in zip(members, agents):
+        data_root = get_data_root(args, truck, driver)
+        data_root.mkdir(parents=True, exist_ok=True)
+        avatars.append(
+            Avatar(
+                _truck=truck,
+                _driver=driver,
+                _agent=member_agent,
+                _can_server=can_server,
+                _trip_server=trip_server,
+                logger=logger,
+                dict_logger=dict_logger,
+                _resume=args.resume,
+                _infer_mode=(not args.learning),
+                background_learning=True,
+                updates_per_episode=args.updates_per_episode,
+                remotecan_connections=args.remotecan_connections,
+                data_root=data_root,
+                learner=learner,
+                engine=engine,
+            )
         )
 
+    # one exit event stops the whole fleet
+    exit_event = NotifyingEvent()
+    killer = GracefulKiller(exit_event)
+    if learner is not None:
+        learner.start(exit_event)
+    engine.start(exit_event)
+
+    logger.info(f"{{'header': 'fleet Thread Pool starts!'}}", extra=dict_logger)
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=2 * len(avatars), thread_name_prefix="Fleet"
+    ) as executor:
+        for avatar in avatars:
+            observe_pipeline = Pipeline[pd.DataFrame](maxsize=3)
+            flash_pipeline = Pipeline[pd.DataFrame](maxsize=3)
+            start_event = NotifyingEvent()
+            stop_event = NotifyingEvent()
+            interrupt_event = NotifyingEvent()
+            flash_event = NotifyingEvent()
+            executor.submit(
+                avatar.vehicle_interface.ignite,
+                observe_pipeline,
+                flash_pipeline,
+                start_event,
+                stop_event,
+                interrupt_event,
+                flash_event,
+                exit_event,
+                float(args.watchdog_nap_time),
+                int(args.watchdog_capture_error_upper_bound),
+                int(args.watchdog_flash_error_upper_bound),
+            )
+            executor.submit(
+                avatar.cruncher.filter,
+                observe_pipeline,
+                flash_pipeline,
+                start_event,
+                stop_event,
+                interrupt_event,
+                flash_event,
+                exit_event,
+            )
+
+    engine.join()
+    if learner is not None:
+        learner.join()
+    agent.buffer.close()  # the crunchers leave the shared pool open
+    agent.close_ckpt()  # and the shared checkpoint writer
+    logger.info(f"{{'header': 'fleet Thread Pool dies!'}}", extra=dict_logger)
+    logger.info("Program exit!")
+
+# %% ../nbs/00.avatar.ipynb 43
+def main(args: argparse.Namespace) -> None:
+    """
+    Description: main function to start the Avatar.
+
+    Initialize the Avatar with truck, driver, can server, trip server, and agent for input arguments.
+    Create the first tier of the cascaded threading pools for vehicle interface and crucher.
+
+    """
+    if args.fleet:
+        main_fleet(args)
+        return
+
+    # set up logging
+    # set up data folder (logging, checkpoint, table)
+
+    # set up data folder (logging, checkpoint, table)
+    try:
+        truck: Union[TruckInField, TruckInCloud] = str_to_truck(args.vehicle)
+    except KeyError:
+        raise KeyError(f"vehicle {args.vehicle} not found in config file")
+    else:
+        print(f"Vehicle found. vid:{truck.vid}, vin: {truck.vin}.")
+
+    try:
+        driver: Driver = str_to_driver(args.driver)
+    except KeyError:
+        raise KeyError(f"driver {args.driver} not found in config file")
+    else:
+        print(f"Driver found. pid:{driver.pid}, name: {driver.name}.")
+
+    # remotecan_srv: str = 'can_intra'
+    try:
+        can_server = str_to_can_server(args.interface)
+    except KeyError:
+        raise KeyError(f"can server {args.interface} not found in config file")
+    else:
+        print(f"CAN Server found: {can_server.server_name}")
+
+    try:
+        trip_server = str_to_trip_server(args.trip)
+    except KeyError:
+        raise KeyError(f"trip server {args.web} not found in config file")
+    else:
+        print(f"Trip Server found: {trip_server.server_name}")
+
+    assert args.agent in [
+        "ddpg",
+        "rdpg",
+        "idql",
+    ], "agent must be either ddpg, rdpg or idql"
+
+    data_root = get_data_root(args, truck, driver)
+
+    logger, dict_logger = set_root_logger(
+        name="eos",
+        data_root=data_root,
+        agent=args.agent,
+        tz=truck.site.tz,
+        truck=truck.vid,
+        driver=driver.pid,
+        sample_every={  # sample the step-level records of the real-time threads
+            thread_name: args.log_sample_every
+            for thread_name in ("cruncher_consume", "kvaser_filter", "cloud_filter")
+        },
+    )
+    logger.info(f"{{'header': 'Start Logging'}}", extra=dict_logger)
+
+    agent = make_agent(args, truck, driver, data_root, logger, dict_logger)
+
     try:
         avatar = Avatar(
             _truck=truck,
@@ -510,6 +940,10 @@ def main(args: argparse.Namespace) -> None:
             dict_logger=dict_logger,
             _resume=args.resume,
             _infer_mode=(not args.learning),
+            background_learning=args.background_learning,
+            updates_per_episode=args.updates_per_episode,
+            pipelined_flash=args.pipelined_flash and not args.multiprocess,
+            remotecan_connections=args.remotecan_connections,
             data_root=data_root,
         )
     except TypeError as e:
@@ -525,6 +959,11 @@ def main(args: argparse.Namespace) -> None:
         )
         sys.exit(1)
 
+    if args.multiprocess:
+        main_multiprocess(avatar, args, logger, dict_logger)
+        logger.info("Program exit!")
+        return
+
     # initialize dataflow: pipelines, sync events among the threads
     observe_pipeline = Pipeline[pd.DataFrame](
         maxsize=3
@@ -532,11 +971,11 @@ def main(args: argparse.Namespace) -> None:
     flash_pipeline = Pipeline[pd.DataFrame](
         maxsize=3
     )  # pipeline for flashing torque tables (type dataframe)
-    start_event = Event()
-    stop_event = Event()
-    interrupt_event = Event()
-    exit_event = Event()
-    flash_event = Event()
+    start_event = NotifyingEvent()
+    stop_event = NotifyingEvent()
+    interrupt_event = NotifyingEvent()
+    exit_event = NotifyingEvent()
+    flash_event = NotifyingEvent()
 
     logger.info(f"{{'header': 'main Thread Pool starts!'}}", extra=dict_logger)
 
@@ -574,7 +1013,7 @@ def main(args: argparse.Namespace) -> None:
     # default behavior is "observe" will start and send out all the events to orchestrate other three threads.
     logger.info("Program exit!")
 
-# %% ../nbs/00.avatar.ipynb 34
+# %% ../nbs/00.avatar.ipynb 48
 if (
     __name__ == "__main__" and "__file__" in globals()
 ):  # in order to be compatible for both script and notebnook
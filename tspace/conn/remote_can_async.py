@@ -0,0 +1,201 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/04.conn.remote_can_async.ipynb.
+
+# %% auto 0
+__all__ = ['AsyncRemoteCanClient']
+
+# %% ../../nbs/04.conn.remote_can_async.ipynb 2
+import asyncio
+import concurrent.futures
+import logging
+from threading import Thread
+from typing import Any, Coroutine, Dict, Optional
+
+# %% ../../nbs/04.conn.remote_can_async.ipynb 3
+import aiohttp
+import pandas as pd
+
+# %% ../../nbs/04.conn.remote_can_async.ipynb 4
+from ..config.vehicles import Truck
+from .remote_can_client import check_reply, torque_map_payload
+from .remotecan.exceptions import RemoteCanException  # type: ignore
+
+# %% ../../nbs/04.conn.remote_can_async.ipynb 6
+class AsyncRemoteCanClient:
+    """
+    AsyncRemoteCanClient is the asyncio counterpart of `RemoteCanClient` on top of aiohttp.
+
+    A single `aiohttp.ClientSession` keeps a persistent pool of at most `max_connections` connections
+    to the remote can server, so that a signal fetch and a flash can be in flight at the same time
+    when the server permits. Each request carries its own timeout, no adapter is re-mounted.
+    The event loop runs in a dedicated daemon thread. The coroutines `get_signals_async` and
+    `send_torque_map_async` can be awaited on that loop, while the blocking `get_signals` and
+    `send_torque_map` make the client a drop-in replacement of `RemoteCanClient` for the threads of `Cloud`.
+
+    Attributes:
+
+        url: str
+            The url of the remote can server, generated from host and port.
+        truck: Truck
+            The truck object.
+        proxy: Optional[str]
+            The http proxy used to connect to the remote can server.
+        max_connections: int
+            The maximum number of concurrent connections to the remote can server.
+        retries: int
+            The number of retries on connection errors and retryable status codes.
+        backoff_factor: float
+            The retry delay is backoff_factor * 2**attempt seconds.
+        logger: Optional[logging.Logger]
+            The logger used to log the information.
+        dict_logger: Optional[Dict]
+            The dictionary logger used to log the information.
+    """
+
+    status_forcelist = (413, 429, 500, 502, 503, 504)  # retryable status codes
+
+    def __init__(
+        self,
+        host: str,  # host name for remote can server
+        port: str,  # port number for remote can server
+        truck: Truck,  # truck object which AsyncRemoteCanClient is attached to
+        proxies: Optional[Dict] = None,  # optional proxies for remote can server
+        max_connections: int = 2,  # maximum number of concurrent connections to remote can server
+        retries: int = 3,  # retries on connection errors and retryable status codes
+        backoff_factor: float = 0.1,  # retry delay is backoff_factor * 2**attempt seconds
+        logger: Optional[logging.Logger] = None,  # logger for AsyncRemoteCanClient
+        dict_logger: Optional[
+            Dict
+        ] = None,  # dictionary logger for AsyncRemoteCanClient
+    ):
+        self.logger = logger.getChild("remote_can_async")
+        self.dict_logger = dict_logger
+        self.url = "http://" + host + ":" + port + "/"  # type: ignore
+        self.proxy = None if proxies is None else proxies.get("http")
+        self.truck = truck
+        self.max_connections = max_connections
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = Thread(
+            target=self.loop.run_forever, name="remotecan_loop", daemon=True
+        )
+        self.thread.start()
+        self.session: aiohttp.ClientSession = self.run(
+            self.open_session()
+        )  # the session is bound to the loop it is created in
+        self.logger.info(
+            f"{{'header': 'async remote can url: {self.url}, proxy: {self.proxy}', "
+            f"'max_connections': {max_connections}, "
+            f"'retries': {retries}, "
+            f"'backoff_factor': {backoff_factor}}}",
+            extra=self.dict_logger,
+        )
+
+    async def open_session(self) -> aiohttp.ClientSession:
+        """create the session with the persistent connection pool"""
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections),
+            trust_env=False,
+        )
+
+    def run(
+        self,
+        coro: Coroutine,  # coroutine to run on the loop of the client
+        timeout: Optional[
+            float
+        ] = None,  # timeout in seconds, None to rely on the request timeout
+    ) -> Any:
+        """run a coroutine on the loop of the client and block the calling thread for the result"""
+        future: concurrent.futures.Future = asyncio.run_coroutine_threadsafe(
+            coro, self.loop
+        )
+        return future.result(timeout)
+
+    async def post(
+        self,
+        endpoint: str,  # endpoint of the remote can server
+        json_data: Dict,  # json payload
+        timeout: float,  # total timeout of the request in seconds
+    ) -> Dict:  # decoded json reply if successful
+        """
+        Post a request with retries and backoff on connection errors and retryable status codes.
+
+        raise:
+            RemoteCanException, 1000 for connection errors, 1002 for timeouts, 1001 otherwise,
+            or the error code in the reply of the server
+        """
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            try:
+                async with self.session.post(
+                    self.url + endpoint,
+                    json=json_data,
+                    timeout=client_timeout,
+                    proxy=self.proxy,
+                ) as response:
+                    text = await response.text()
+                    status = response.status
+            except (
+                asyncio.TimeoutError,
+                aiohttp.ServerTimeoutError,
+            ) as e:  # before ClientConnectionError, the base of ServerTimeoutError
+                raise RemoteCanException(err_code=1002) from e
+            except aiohttp.ClientConnectionError as e:
+                if last_attempt:
+                    raise RemoteCanException(err_code=1000) from e
+            except Exception as e:
+                raise RemoteCanException(err_code=1001) from e
+            else:
+                if status not in self.status_forcelist or last_attempt:
+                    return check_reply(status, text)
+            await asyncio.sleep(self.backoff_factor * 2**attempt)
+
+    async def send_torque_map_async(
+        self,
+        pedal_map: pd.DataFrame,  # The torque map to be sent to the remote can server.
+        swap: bool = True,  # Whether to swap the pedal map.
+        timeout=32,  # The timeout for the request.
+    ) -> Dict:  # The response from the remote can server if successful
+        """Send torque map to the remote can server."""
+        json_data = torque_map_payload(self.truck, pedal_map, swap)
+        json_ret = await self.post("set_torque", json_data, timeout)
+        return {"json_ret": json_ret}
+
+    async def get_signals_async(
+        self,
+        duration,  # The duration of the signals to be retrieved.
+        timeout=32,  # The timeout for the request.
+    ) -> Dict:  # The observation from the remote can server if successful
+        """Get observation signals from the remote can server."""
+        json_data = {"vin": self.truck.vin, "signal_duration": duration}
+        json_ret = await self.post("get_signal", json_data, timeout)
+        self.logger.info("{'header': 'get_signal Success!'}", extra=self.dict_logger)
+        return json_ret
+
+    def send_torque_map(
+        self,
+        pedal_map: pd.DataFrame,  # The torque map to be sent to the remote can server.
+        swap: bool = True,  # Whether to swap the pedal map.
+        timeout=32,  # The timeout for the request.
+    ) -> Dict:  # The response from the remote can server if successful
+        """Send torque map to the remote can server, blocking the calling thread."""
+        return self.run(self.send_torque_map_async(pedal_map, swap, timeout))
+
+    def get_signals(
+        self,
+        duration,  # The duration of the signals to be retrieved.
+        timeout=32,  # The timeout for the request.
+    ) -> Dict:  # The observation from the remote can server if successful
+        """Get observation signals from the remote can server, blocking the calling thread."""
+        return self.run(self.get_signals_async(duration, timeout))
+
+    def close(self):
+        """close the connection pool and stop the loop"""
+        if self.loop.is_closed():
+            return
+        self.run(self.session.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
@@ -1,7 +1,7 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/04.conn.remote_can_client.ipynb.
 
 # %% auto 0
-__all__ = ['DEFAULT_TIMEOUT', 'TimeoutHTTPAdapter', 'RemoteCanClient']
+__all__ = ['DEFAULT_TIMEOUT', 'TimeoutHTTPAdapter', 'torque_map_payload', 'check_reply', 'RemoteCanClient']
 
 # %% ../../nbs/04.conn.remote_can_client.ipynb 2
 import json
@@ -45,6 +45,78 @@ class TimeoutHTTPAdapter(HTTPAdapter):
         return super().send(request, **kwargs)
 
 # %% ../../nbs/04.conn.remote_can_client.ipynb 8
+def torque_map_payload(
+    truck: Truck,  # truck the torque map is flashed to
+    pedal_map: pd.DataFrame,  # The torque map to be sent to the remote can server.
+    swap: bool = True,  # Whether to swap the pedal map.
+) -> Dict:  # json payload of the set_torque request
+    """
+    Check the indices of the torque map against the truck and build the set_torque request.
+
+    Shared by the synchronous and the asynchronous remote can clients.
+    """
+    assert not any(
+        pedal_map.index.duplicated()
+    ), f"Input velocity index has duplicated values!"
+    assert not any(
+        pedal_map.columns.duplicated()
+    ), f"Input pedal index has duplicated values!"
+    assert set(pedal_map.columns.astype(float)) == (
+        set(truck.pedal_scale)
+    ), f"Unregurlar input map thrust index {pedal_map.columns} for {truck.vid}!"
+    # assert set(pedalmap.index).issubset(set(self.VelocityScaleList)), \
+    #     f"input map velocity index {pedalmap.index} is out of range for {self.truck.vid}!"
+    input_row_num = len(pedal_map.index)
+    assert any(
+        list(truck.speed_scale[idx : idx + input_row_num]) == list(pedal_map.index)
+        for idx in range(len(truck.speed_scale) - input_row_num + 1)
+    ), f"Input velocity index is not continuous!"
+
+    k = pedal_map.index[0]  # starting line
+    start_row = truck.speed_scale.index(k)
+
+    return {
+        "torque": pedal_map.values.tolist(),
+        "vin": truck.vin,
+        "abswitch": swap,
+        "start_line": start_row,
+    }
+
+# %% ../../nbs/04.conn.remote_can_client.ipynb 9
+def check_reply(
+    status_code: int,  # http status code of the response
+    text: str,  # body of the response
+) -> Dict:  # decoded json reply if successful
+    """
+    Decode the reply of the remote can server.
+
+    Shared by the synchronous and the asynchronous remote can clients.
+
+    raise:
+        RemoteCanException, with the error code of the server or of the http layer
+    """
+    if status_code != 200:
+        raise RemoteCanException(
+            err_code=1,
+            extra_msg=f"{{'status_code': '{status_code}', " f"'text': '{text}'}}",
+        )
+    json_ret = json.loads(text)
+    if json_ret["success"]:
+        return json_ret
+    elif "AIMode" in json_ret and not json_ret["AIMode"]:
+        raise RemoteCanException(err_code=2, extra_msg=f"{{'json_ret': '{json_ret}'}}")
+    else:
+        try:
+            raise RemoteCanException(
+                err_code=int(json_ret["reason"]["why"]["code"]),
+                extra_msg=f"{{'json_ret': '{json_ret}'}}",
+            )
+        except KeyError as e:
+            raise RemoteCanException(
+                err_code=2005, extra_msg=f"{{'json_ret': '{json_ret}'}}"
+            ) from e
+
+# %% ../../nbs/04.conn.remote_can_client.ipynb 10
 class RemoteCanClient:
     """
     RemoteCanClient is used to send torque map to the remote can server and get observation signals from the server.
@@ -128,6 +200,9 @@ class RemoteCanClient:
         # self.session.mount("http://", a)
         if proxies is not None:
             self.session.proxies.update(proxies)
+        self.session.mount(
+            "http://", TimeoutHTTPAdapter(max_retries=self.retries)
+        )  # mounted once, the timeout is given per request
 
         # self.vin = self.truck.vin
         # self.PedalScale = self.truck.pedal_scale  # 17
@@ -166,39 +241,10 @@ class RemoteCanClient:
         """
 
         self.logger.info("entering send_torque_map", extra=self.dict_logger)
-        assert not any(
-            pedal_map.index.duplicated()
-        ), f"Input velocity index has duplicated values!"
-        assert not any(
-            pedal_map.columns.duplicated()
-        ), f"Input pedal index has duplicated values!"
-        assert set(pedal_map.columns.astype(float)) == (
-            set(self.truck.pedal_scale)
-        ), f"Unregurlar input map thrust index {pedal_map.columns} for {self.truck.vid}!"
-        # assert set(pedalmap.index).issubset(set(self.VelocityScaleList)), \
-        #     f"input map velocity index {pedalmap.index} is out of range for {self.truck.vid}!"
-        input_row_num = len(pedal_map.index)
-        assert any(
-            self.truck.speed_scale[idx : idx + input_row_num] == list(pedal_map.index)
-            for idx in range(len(self.truck.speed_scale) - input_row_num + 1)
-        ), f"Input velocity index is not continuous!"
-
+        json_data = torque_map_payload(self.truck, pedal_map, swap)
         self.logger.info("done assert!", extra=self.dict_logger)
 
-        k = pedal_map.index[0]  # starting line
-        start_row = self.truck.speed_scale.index(k)
-
-        json_data = {
-            "torque": pedal_map.values.tolist(),
-            "vin": self.truck.vin,
-            "abswitch": swap,
-            "start_line": start_row,
-        }
-
         try:
-            self.session.mount(
-                "http://", TimeoutHTTPAdapter(max_retries=self.retries, timeout=timeout)
-            )
             with self.connect_sema:  # max sure the http connection is available (default capacity is 1)
                 response = self.session.post(
                     self.url + "set_torque", json=json_data, timeout=timeout
@@ -212,45 +258,7 @@ class RemoteCanClient:
             raise RemoteCanException(err_code=1001, extra_msg=None, codes=None) from e
             # return RetCode.network_unknown_error, {"request exception": e}
 
-        if response.status_code == 200:
-            json_ret = json.loads(response.text)
-
-            if json_ret["success"]:
-                return {"json_ret": json_ret}
-            elif "AIMode" in json_ret and not json_ret["AIMode"]:
-                raise RemoteCanException(err_code=2, extra_msg=None, codes=None)
-            else:
-                try:
-                    raise RemoteCanException(
-                        err_code=int(json_ret["reason"]["why"]["code"]),
-                        codes=None,
-                        extra_msg=f"{{'json_ret': '{json_ret}'}}",
-                    )
-                    # ret_code = RetCode().map_string_code(string_code)
-                    # return ret_code, {"json_ret": json_ret}
-                except KeyError as e:
-                    raise RemoteCanException(
-                        err_code=2005,
-                        codes=None,
-                        extra_msg=f"{{'json_ret': '{json_ret}'}}",
-                    ) from e
-                    # return RetCode.remote_can_unknown_format, {"json_ret": json_ret}
-        else:
-            raise RemoteCanException(
-                err_code=1,
-                codes=None,
-                extra_msg=f"{{'status_code': '{response.status_code}', "
-                f"'text': '{json.loads(response.text)}'}}",
-            )
-            # self.logger.info(
-            #     f"{{\'header\': \'Flash error\', "
-            #     f"\'ret_code\': {RetCode.client_cannot_connect_to_server}, "
-            #     f"\'requests_code\': {response.status_code}}}",
-            #     extra=self.dict_logger,
-            # )
-            # return RetCode.client_cannot_connect_to_server, {
-            #     "status code": response.text
-            # }
+        return {"json_ret": check_reply(response.status_code, response.text)}
 
     def get_signals(
         self,
@@ -277,9 +285,6 @@ class RemoteCanClient:
         json_data = {"vin": self.truck.vin, "signal_duration": duration}
 
         try:
-            self.session.mount(
-                "http://", TimeoutHTTPAdapter(max_retries=self.retries, timeout=timeout)
-            )
             with self.connect_sema:  # max sure the http connection is available (default capacity is 1)
                 response = self.session.post(
                     self.url + "get_signal",
@@ -316,52 +321,9 @@ class RemoteCanClient:
             # )
             # return RetCode.network_unknown_error, {"request exception": e}
 
-        if response.status_code == 200:
-            json_ret = json.loads(response.text)
-            if json_ret["success"]:
-                self.logger.info(
-                    f"{{'header': 'get_signal Success!'}}", extra=self.dict_logger
-                )
-                return json_ret
-            elif "AIMode" in json_ret and not json_ret["AIMode"]:
-                raise RemoteCanException(
-                    err_code=2, extra_msg=f"{{'json_ret': '{json_ret}'}}"
-                )
-                # self.logger.warning(
-                #     f"{{\'header\': \'Blocked by AI mode switch!\'}}",
-                #     extra=self.dict_logger,
-                # )
-                # return RetCode.ai_mode_shutdown, json_ret
-            else:
-                try:
-                    raise RemoteCanException(
-                        err_code=int(json_ret["reason"]["why"]["code"]),
-                        extra_msg=f"{{'json_ret': '{json_ret}'}}",
-                    )
-                except KeyError as e:
-                    raise RemoteCanException(
-                        err_code=2005, extra_msg=f"{{'json_ret': '{json_ret}'}}"
-                    ) from e
-                # string_code = json_ret["reason"]["why"]["code"]
-                # ret_code = RetCode().map_string_code(string_code)
-                # self.logger.warning(
-                #     f"{{\'ret_code\': {ret_code}}}", extra=self.dict_logger
-                # )
-                # return ret_code, json_ret
-        else:
-            raise RemoteCanException(
-                err_code=1,
-                extra_msg=f"{{'status_code': '{response.status_code}', "
-                f"'text': '{json.loads(response.text)}'}}",
-            )
-            # self.logger.warning(
-            #     f"{{\'header\': \'Server Failure\', "
-            #     f"\'requests_code\': {response.status_code}}}",
-            #     extra=self.dict_logger,
-            # )
-            # json_ret = json.loads(response.text)
-            #
-            # return RetCode.client_cannot_connect_to_server, json_ret
+        json_ret = check_reply(response.status_code, response.text)
+        self.logger.info(f"{{'header': 'get_signal Success!'}}", extra=self.dict_logger)
+        return json_ret
 
     def close(self):
         self.session.close()
@@ -0,0 +1,165 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../../../nbs/01.data.external.bson_utils.ipynb.
+
+# %% ../../../nbs/01.data.external.bson_utils.ipynb 4
+from __future__ import annotations
+import struct
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+# %% auto 0
+__all__ = ['BSON_DOUBLE', 'BSON_DOCUMENT', 'BSON_DATETIME', 'bson_element', 'bson_document', 'BSONDocTemplate']
+
+# %% ../../../nbs/01.data.external.bson_utils.ipynb 5
+from .pandas_utils import compile_nested_dict_template
+
+# %% ../../../nbs/01.data.external.bson_utils.ipynb 6
+BSON_DOUBLE = b"\x01"  # BSON element type of a 64-bit float
+BSON_DOCUMENT = b"\x03"  # BSON element type of an embedded document
+BSON_DATETIME = b"\x09"  # BSON element type of a UTC datetime in milliseconds
+
+# %% ../../../nbs/01.data.external.bson_utils.ipynb 7
+def bson_element(
+    type_code: bytes,  # BSON element type
+    key: str,  # key of the element
+    value: bytes,  # encoded value of the element
+) -> bytes:  # encoded element
+    """Encode a BSON element from its type, key and encoded value"""
+    return type_code + key.encode("utf-8") + b"\x00" + value
+
+# %% ../../../nbs/01.data.external.bson_utils.ipynb 8
+def bson_document(
+    elements: list[bytes],  # encoded elements
+) -> bytes:  # encoded document
+    """Wrap encoded BSON elements into a document with the length prefix and the terminator"""
+    body = b"".join(elements)
+    return struct.pack("<i", len(body) + 5) + body + b"\x00"
+
+# %% ../../../nbs/01.data.external.bson_utils.ipynb 9
+@dataclass
+class BSONDocTemplate:
+    """
+    Precompiled BSON layout of the nested observation documents of an eos dataframe.
+
+    With all values of the nested dictionary being doubles or UTC datetimes, every row is encoded
+    to the same byte layout and only the 8-byte value slots differ.
+    The template keeps the encoded document with zeroed slots and the offsets of the slots;
+    the rows are encoded by writing the numpy blocks of the dataframe into copies of the template.
+    The result is byte-identical to `bson.encode` of the nested dictionaries from `df_to_nested_dict`.
+
+    Attributes:
+
+        - columns: columns of the dataframe the template is compiled for
+        - order: column positions in the order of the value slots
+        - is_datetime: whether the column of a slot is a timestamp
+        - header: encoded document with zeroed value slots
+        - offsets: byte offsets of the value slots in the document
+    """
+
+    columns: pd.Index
+    order: np.ndarray
+    is_datetime: np.ndarray
+    header: np.ndarray
+    offsets: np.ndarray
+
+    @classmethod
+    def compile(
+        cls,
+        df: pd.DataFrame,  # dataframe with multi-indexed columns
+    ) -> Optional[BSONDocTemplate]:  # None if a column is neither float nor timestamp
+        """Compile the template from the columns and the dtypes of the dataframe"""
+        order, template = compile_nested_dict_template(df.columns)
+        dtypes = df.dtypes.tolist()
+        is_datetime = []
+        for pos in order:
+            if pd.api.types.is_float_dtype(dtypes[pos]):
+                is_datetime.append(False)
+            elif pd.api.types.is_datetime64_any_dtype(
+                dtypes[pos]
+            ) or pd.api.types.is_object_dtype(dtypes[pos]):
+                is_datetime.append(True)  # object columns are checked for timestamps
+            else:
+                return None
+
+        tree: dict = {}  # same nesting as `nest`
+        for path, keys, start, stop in template:
+            node = tree
+            for k in path[:-1]:
+                node = node.setdefault(k, {})
+            node[path[-1]] = (keys, start)
+
+        offsets = np.zeros(len(order), dtype=np.int64)
+
+        def encode_node(node: dict, base: int) -> bytes:
+            elements = []
+            pos = base + 4  # skip the length prefix
+            for key, child in node.items():
+                prefix_len = 1 + len(key.encode("utf-8")) + 1
+                if isinstance(child, dict):
+                    value = encode_node(child, pos + prefix_len)
+                    elements.append(bson_element(BSON_DOCUMENT, key, value))
+                else:  # leaf document with the value slots
+                    keys, start = child
+                    leaf_pos = pos + prefix_len + 4
+                    leaf_elements = []
+                    for i, k in enumerate(keys):
+                        type_code = (
+                            BSON_DATETIME if is_datetime[start + i] else BSON_DOUBLE
+                        )
+                        element = bson_element(type_code, k, bytes(8))
+                        offsets[start + i] = leaf_pos + len(element) - 8
+                        leaf_pos += len(element)
+                        leaf_elements.append(element)
+                    elements.append(
+                        bson_element(BSON_DOCUMENT, key, bson_document(leaf_elements))
+                    )
+                pos += len(elements[-1])
+            return bson_document(elements)
+
+        header = np.frombuffer(encode_node(tree, 0), dtype=np.uint8)
+        return cls(
+            columns=df.columns,
+            order=np.asarray(order, dtype=np.int64),
+            is_datetime=np.asarray(is_datetime, dtype=bool),
+            header=header,
+            offsets=offsets,
+        )
+
+    def encode(
+        self,
+        df: pd.DataFrame,  # dataframe with the columns of the template
+    ) -> Optional[
+        list[bytes]
+    ]:  # encoded document of each row, None if not all timestamps are valid
+        """Encode the rows of the dataframe to BSON documents"""
+        row_num, slot_num = df.shape[0], self.order.size
+        values = np.empty((row_num, slot_num), dtype="<i8")
+
+        float_slots = np.flatnonzero(~self.is_datetime)
+        if float_slots.size:
+            values[:, float_slots] = (
+                df.iloc[:, self.order[float_slots]].to_numpy(dtype="<f8").view("<i8")
+            )
+
+        for slot in np.flatnonzero(self.is_datetime):
+            column = df.iloc[:, self.order[slot]]
+            if pd.api.types.is_datetime64_any_dtype(column.dtype):
+                ns = column.array.as_unit("ns").asi8
+            else:
+                try:
+                    ns = np.fromiter(
+                        (ts.value for ts in column.array), dtype=np.int64, count=row_num
+                    )  # UTC ns of aware Timestamps, naive ones are taken as UTC like BSON
+                except AttributeError:  # not a Timestamp
+                    return None
+            if (ns == pd.NaT.value).any():
+                return None
+            values[:, slot] = ns // 1_000_000  # floor to ms like BSON
+
+        docs = np.tile(self.header, (row_num, 1))
+        slot_bytes = (self.offsets[:, None] + np.arange(8)).ravel()
+        docs[:, slot_bytes] = values.view(np.uint8).reshape(row_num, slot_num * 8)
+        buf = docs.tobytes()
+        doc_len = self.header.size
+        return [buf[i * doc_len : (i + 1) * doc_len] for i in range(row_num)]
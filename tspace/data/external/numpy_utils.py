@@ -4,6 +4,7 @@
 __all__ = ['nan_helper_1d', 'nan_interp_1d', 'ragged_nparray_list_interp', 'timestamps_from_can_strings']
 
 # %% ../../../nbs/01.data.external.numpy_utils.ipynb 4
+from itertools import chain
 from typing import Callable, List, Tuple
 import numpy as np
 import warnings
@@ -68,62 +69,72 @@ def nan_interp_1d(
 
 # %% ../../../nbs/01.data.external.numpy_utils.ipynb 8
 def ragged_nparray_list_interp(
-    ragged_list_list: List[List],  # list to be interpolated with NaNs
-    ob_num: int,  # number of observations
-) -> np.ndarray:  # np array with NaNs replaced by linear interpolation
-    """Linear interpolation of NaNs.
+    ragged_list_list: List[List],  # ragged list of rows (str or float) to be aligned
+    ob_num: int,  # number of observations per row
+    nan_fill: float = 0.0,  # value for rows without any valid element
+) -> np.ndarray:  # float32 array of shape (len(ragged_list_list), ob_num)
+    """Align a ragged list of rows to a 2d array and interpolate the missing elements.
 
     Parameter:
 
-        - y, list ragged array
+        - ragged_list_list, list of rows with possibly different lengths, elements as str or number
+        - ob_num, number of observations in each aligned row
+        - nan_fill, value for rows without any valid element
 
     Return:
 
-        - y, 2d numpy array with missing elements replaced by linear interpolation
+        - aligned, 2d float32 numpy array of shape (row_num, ob_num),
+            short rows are padded and over-long rows truncated to ob_num,
+            missing elements replaced by row-wise linear interpolation
 
-    Example: linear interpolation of NaNs
-
-        >>> y = nan_interp_1d(y)
+    Example: align remote CAN signal units
 
-    sources:
+        >>> y = ragged_nparray_list_interp([["1", "2"], ["3", "4", "5", "6"]], ob_num=3)
 
-    https://stackoverflow.com/questions/6518811/interpolate-nan-values-in-a-numpy-array
+    The elements are converted to float32 in one pass and written into a preallocated array,
+    NaNs are interpolated for all rows at once with the nearest valid neighbours on both sides,
+    the edges are held constant like `np.interp`.
     """
 
-    # with np.printoptions(precision=4, suppress=True, formatter={'float': '{:0.1f}'.format}, linewidth=100):
-    with np.printoptions(suppress=True, linewidth=100):
-        # capture warning about ragged json arrays
-        with np.testing.suppress_warnings() as sup:
-            log_warning = sup.record(
-                np.VisibleDeprecationWarning,
-                "Creating an ndarray from ragged nested sequences",
-            )
-            ragged_nparray_list: np.ndarray = np.ndarray(ragged_list_list)  # type: ignore
-            if len(log_warning) > 0:
-                log_warning.pop()
-                item_len = [len(item) for item in ragged_nparray_list]
-                for count, item in enumerate(ragged_nparray_list):
-                    if item_len[count] < ob_num:
-                        ragged_nparray_list[count] = np.array(
-                            list(ragged_nparray_list[count])
-                            + [None] * (ob_num - item_len[count]),
-                            dtype=np.float32,
-                        )
-                        ragged_nparray_list[count] = nan_interp_1d(
-                            ragged_nparray_list[count]
-                        )
-                    elif item_len[count] > ob_num:
-                        ragged_nparray_list[count] = ragged_nparray_list[count][:ob_num]
-                    else:
-                        pass
-                aligned_nparray: np.ndarray = np.ndarray(
-                    list(ragged_nparray_list), dtype=np.float32
-                )
-            else:
-                aligned_nparray = ragged_nparray_list
-    return aligned_nparray
-
-# %% ../../../nbs/01.data.external.numpy_utils.ipynb 9
+    row_num = len(ragged_list_list)
+    aligned = np.full((row_num, ob_num), np.nan, dtype=np.float32)
+    if row_num == 0 or ob_num == 0:
+        return aligned
+
+    row_len = np.minimum(
+        np.fromiter(map(len, ragged_list_list), dtype=np.int64, count=row_num), ob_num
+    )
+    valid = np.arange(ob_num) < row_len[:, None]
+    aligned[valid] = np.array(
+        list(chain.from_iterable(row[:ob_num] for row in ragged_list_list)),
+        dtype=np.float32,
+    )  # row-major order of the mask matches the concatenation of the truncated rows
+
+    nans = np.isnan(aligned)
+    if not nans.any():
+        return aligned
+
+    # index of the last valid element on the left and the first on the right of each NaN
+    idx = np.arange(ob_num)
+    left = np.maximum.accumulate(np.where(nans, -1, idx), axis=1)
+    right = np.minimum.accumulate(np.where(nans, ob_num, idx)[:, ::-1], axis=1)[:, ::-1]
+    rows, cols = np.nonzero(nans)
+    left, right = left[rows, cols], right[rows, cols]
+    y_left = aligned[rows, np.maximum(left, 0)]
+    y_right = aligned[rows, np.minimum(right, ob_num - 1)]
+    y_left = np.where(
+        left < 0, y_right, y_left
+    )  # hold first valid value at the left edge
+    y_right = np.where(
+        right == ob_num, y_left, y_right
+    )  # hold last valid value at the right edge
+    weight = ((cols - left) / np.maximum(right - left, 1)).astype(np.float32)
+    filled = y_left + (y_right - y_left) * weight
+    filled[np.isnan(filled)] = nan_fill  # rows without any valid element
+    aligned[rows, cols] = filled
+    return aligned
+
+# %% ../../../nbs/01.data.external.numpy_utils.ipynb 14
 def timestamps_from_can_strings(
     can_timestamp_strings: List[str],  # list of strings from CAN
     signal_freq: float,  # signal frequency
@@ -134,51 +145,54 @@ def timestamps_from_can_strings(
 
     Parameters:
 
-        - can_timestamp_strings, list of CAN strings
+        - can_timestamp_strings, list of CAN strings of the fixed-width format "YYMMDDhhmmss[f...]"
+            in UTC+8, the optional trailing digits are the fraction of the second
         - signal_freq, signal frequency
         - unit_num, number of CAN units
         - unit_duration, duration in seconds per CAN unit
 
     Return:
 
-        - timestamps, 1d numpy array of timestamps
+        - timestamps, int64 numpy array of shape (unit_num, unit_ob_num) with the UTC timestamps in ms
+            of each sample, unit_ob_num = unit_duration * signal_freq
 
     Example: extract timestamps from "CAN" strings
 
         >>> timestamps_arr = timestamps_from_can_strings(can_timestamp_strings)
 
+    The strings are parsed as a fixed-width byte array, the digits are combined
+    by numpy arithmetic into `datetime64[ms]` and the sample offsets are added by broadcasting.
     """
 
-    timestamps = []
-    separators = "--T::."  # adaption separators of the raw intest string
-    start_century = "20"
-    for ts in can_timestamp_strings:
-        # create standard iso string datetime format
-        ts_substrings = [ts[i : i + 2] for i in range(0, len(ts), 2)]
-        ts_iso = start_century
-        for i, sep in enumerate(separators):
-            ts_iso = ts_iso + ts_substrings[i] + sep
-        ts_iso = ts_iso + ts_substrings[-1]
-        timestamps.append(ts_iso)
-    timestamps_units = (
-        np.asarray(timestamps).astype("datetime64[ms]")  # in ms
-        - np.timedelta64(8, "h")
-    ).astype(  # convert to UTC+8
-        "int"
-    )  # convert to int
-    if len(timestamps_units) != unit_num:
+    if len(can_timestamp_strings) != unit_num:
         raise ValueError(
-            f"timestamps_units length is {len(timestamps_units)}, not {unit_num}"
+            f"timestamps_units length is {len(can_timestamp_strings)}, not {unit_num}"
         )
+    raw = np.asarray(can_timestamp_strings, dtype=np.bytes_)
+    width = raw.dtype.itemsize
+    digits = raw.view(np.uint8).reshape(unit_num, width).astype(np.int64) - ord("0")
+    if width < 12 or ((digits < 0) | (digits > 9)).any():
+        raise ValueError(f"invalid CAN timestamp strings: {can_timestamp_strings}")
+
+    fields = digits[:, :12:2] * 10 + digits[:, 1:12:2]  # YY, MM, DD, hh, mm, ss
+    months = (fields[:, 0] + 30) * 12 + fields[:, 1] - 1  # months since 1970-01
+    days = months.astype("datetime64[M]").astype("datetime64[D]") + (fields[:, 2] - 1)
+    fraction = np.zeros(unit_num, dtype=np.int64)
+    for i in range(12, min(width, 15)):  # fraction of the second to ms precision
+        fraction = fraction * 10 + digits[:, i]
+    fraction = fraction * 10 ** max(0, 15 - width)
+    timestamps_units = (
+        days.astype("datetime64[ms]")
+        + np.timedelta64(1000, "ms")
+        * (fields[:, 3] * 3600 + fields[:, 4] * 60 + fields[:, 5])
+        + fraction.astype("timedelta64[ms]")
+        - np.timedelta64(8, "h")  # convert from UTC+8
+    ).astype(np.int64)
+
     # up-sample gears from 2Hz to 50Hz
-    timestamps_seconds = list(timestamps_units)  # in list
     sampling_interval = 1.0 / signal_freq * 1000  # in ms
     unit_ob_num = int(unit_duration * signal_freq)
-    timestamps = [
-        i + j * sampling_interval
-        for i in timestamps_seconds
-        for j in np.arange(unit_ob_num)
-    ]
-    timestamp_arr = np.array(timestamps).reshape((unit_num, -1))
+    offsets = np.rint(np.arange(unit_ob_num) * sampling_interval).astype(np.int64)
+    timestamp_arr = timestamps_units[:, None] + offsets[None, :]
 
     return timestamp_arr
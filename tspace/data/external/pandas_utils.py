@@ -2,15 +2,17 @@
 
 # %% auto 0
 __all__ = ['assemble_state_ser', 'assemble_reward_ser', 'assemble_flash_table', 'assemble_action_ser', 'nest',
-           'df_to_nested_dict', 'eos_df_to_nested_dict', 'ep_nest', 'df_to_ep_nested_dict', 'avro_ep_encoding',
-           'avro_ep_decoding', 'decode_mongo_records', 'decode_mongo_episodes', 'encode_dataframe_from_parquet',
-           'decode_episode_batch_to_padded_arrays', 'encode_episode_dataframe_from_series',
-           'recover_episodestart_tzinfo_from_timestamp']
+           'compile_nested_dict_template', 'df_to_nested_dicts_by_template', 'df_to_nested_dict',
+           'eos_df_to_nested_dict', 'ep_nest', 'df_to_ep_nested_dict', 'avro_ep_encoding', 'avro_ep_decoding',
+           'decode_mongo_records', 'decode_mongo_episodes', 'encode_dataframe_from_parquet',
+           'decode_episode_batch_to_padded_arrays', 'decode_mongo_episodes_to_padded_arrays',
+           'encode_episode_dataframe_from_series', 'recover_episodestart_tzinfo_from_timestamp']
 
 # %% ../../../nbs/01.data.external.pandas_utils.ipynb 4
 import math
 from datetime import datetime
 from functools import reduce
+from operator import itemgetter
 from typing import Dict, List, Optional, Tuple, Union, cast
 from zoneinfo import ZoneInfo
 
@@ -19,6 +21,8 @@ import numpy as np
 import pandas as pd
 import tensorflow as tf
 
+from ..core import ObservationMeta
+
 # %% ../../../nbs/01.data.external.pandas_utils.ipynb 7
 def assemble_state_ser(
     state_columns: pd.DataFrame,  # state_columns: Dataframe with columns ['timestep', 'velocity', 'thrust', 'brake']
@@ -230,16 +234,81 @@ def nest(d: dict) -> dict:
     return result
 
 # %% ../../../nbs/01.data.external.pandas_utils.ipynb 38
+def compile_nested_dict_template(
+    columns: pd.Index,  # multi-indexed columns, e.g. (qtuple, rows, idx) of an eos dataframe
+) -> Tuple[list, list]:  # column order and leaf template
+    """
+    Compile the nested dictionary layout of the columns once for repeated conversion
+    of rows with the same columns, yields the same layout as `nest`.
+
+    Return:
+
+        - order: column positions grouped by the leaf dictionary they belong to
+        - template: list of (path, keys, start, stop) with the path to each leaf dictionary,
+            its string keys and its slice in the reordered row
+    """
+    leaves: Dict = {}
+    for pos, key in enumerate(columns):
+        leaves.setdefault(key[:-1], []).append((pos, str(key[-1])))
+
+    order: list = []
+    template: list = []
+    for path, items in leaves.items():
+        start = len(order)
+        order.extend(pos for pos, _ in items)
+        template.append((path, [k for _, k in items], start, len(order)))
+    return order, template
+
+# %% ../../../nbs/01.data.external.pandas_utils.ipynb 39
+def df_to_nested_dicts_by_template(
+    df_multi_indexed_col: pd.DataFrame,  # dataframe with multi-indexed columns
+    order: list,  # column order from `compile_nested_dict_template`
+    template: list,  # leaf template from `compile_nested_dict_template`
+) -> list[dict]:  # nested dictionary of each row
+    """
+    Convert the rows of a dataframe with multi-indexed columns to nested dictionaries
+    with a precompiled template.
+
+    The values are taken column-wise from the numpy block of each dtype,
+    boxed to python scalars like `DataFrame.to_dict`.
+    """
+    dtypes = df_multi_indexed_col.dtypes.tolist()
+    dtype_groups: Dict = {}
+    for i, pos in enumerate(order):
+        dtype_groups.setdefault(dtypes[pos], []).append((i, pos))
+    column_values: list = [None] * len(order)
+    for group in dtype_groups.values():
+        block = df_multi_indexed_col.iloc[:, [pos for _, pos in group]].to_numpy()
+        for (i, _), values in zip(group, block.T.tolist()):
+            column_values[i] = values
+
+    nested_dicts = []
+    for row in zip(*column_values):
+        result: Dict = {}
+        for path, keys, start, stop in template:
+            target = result
+            for k in path[:-1]:
+                target = target.setdefault(k, {})
+            target[path[-1]] = dict(zip(keys, row[start:stop]))
+        nested_dicts.append(result)
+    return nested_dicts
+
+# %% ../../../nbs/01.data.external.pandas_utils.ipynb 40
 def df_to_nested_dict(df_multi_indexed_col: pd.DataFrame) -> dict:
     """
     Convert a dataframe with multi-indexed columns to a nested dictionary
     """
-    d = df_multi_indexed_col.to_dict(
-        "index"
+    if not df_multi_indexed_col.index.is_unique:
+        raise ValueError("DataFrame index must be unique for orient='index'.")
+    order, template = compile_nested_dict_template(df_multi_indexed_col.columns)
+    return dict(
+        zip(
+            df_multi_indexed_col.index,
+            df_to_nested_dicts_by_template(df_multi_indexed_col, order, template),
+        )
     )  # for multi-indexed dataframe, the index in the first level of the dictionary is still a tuple!
-    return {k: nest(v) for k, v in d.items()}
 
-# %% ../../../nbs/01.data.external.pandas_utils.ipynb 39
+# %% ../../../nbs/01.data.external.pandas_utils.ipynb 41
 def eos_df_to_nested_dict(episode: pd.DataFrame) -> dict:
     """
     Convert an eos dataframe with multi-indexed columns to a nested dictionary
@@ -249,18 +318,14 @@ def eos_df_to_nested_dict(episode: pd.DataFrame) -> dict:
     dict_nested = df_to_nested_dict(
         episode
     )  # for multi-indexed dataframe, the index in the first level of the dictionary is still a tuple!
-    indices_dict = [
-        {episode.index.names[i]: level for i, level in enumerate(levels)}
-        for levels in episode.index
-    ]  # all elements in the array should have the same vehicle, driver, episodestart
-    single_key_dict = {
-        idx["timestamp"]: dict_nested[key]
-        for idx, key in zip(indices_dict, dict_nested)
-    }
+    timestamps = episode.index.get_level_values(
+        "timestamp"
+    )  # all elements in the array should have the same vehicle, driver, episodestart
+    single_key_dict = {ts: dict_nested[key] for ts, key in zip(timestamps, dict_nested)}
 
     return single_key_dict
 
-# %% ../../../nbs/01.data.external.pandas_utils.ipynb 40
+# %% ../../../nbs/01.data.external.pandas_utils.ipynb 43
 def ep_nest(d: Dict) -> Dict:
     """
     Convert a flat dictionary with tuple key to a nested dictionary with arrays at the leaves
@@ -281,7 +346,7 @@ def ep_nest(d: Dict) -> Dict:
 
     return result
 
-# %% ../../../nbs/01.data.external.pandas_utils.ipynb 41
+# %% ../../../nbs/01.data.external.pandas_utils.ipynb 44
 def df_to_ep_nested_dict(df_multi_indexed_col: pd.DataFrame) -> dict:
     """
     Convert a dataframe with multi-indexed columns to a nested dictionary
@@ -291,7 +356,7 @@ def df_to_ep_nested_dict(df_multi_indexed_col: pd.DataFrame) -> dict:
     )  # for multi-indexed dataframe, the index in the first level of the dictionary is still a tuple!
     return {k: ep_nest(v) for k, v in d.items()}
 
-# %% ../../../nbs/01.data.external.pandas_utils.ipynb 42
+# %% ../../../nbs/01.data.external.pandas_utils.ipynb 45
 def avro_ep_encoding(episode: pd.DataFrame) -> list[Dict]:
     """
     avro encoding,
@@ -327,7 +392,7 @@ def avro_ep_encoding(episode: pd.DataFrame) -> list[Dict]:
 
     return array_of_dict
 
-# %% ../../../nbs/01.data.external.pandas_utils.ipynb 43
+# %% ../../../nbs/01.data.external.pandas_utils.ipynb 46
 def avro_ep_decoding(episodes: list[Dict], tz_info: Optional[ZoneInfo]) -> pd.DataFrame:
     """
     avro decoding,
@@ -396,7 +461,7 @@ def avro_ep_decoding(episodes: list[Dict], tz_info: Optional[ZoneInfo]) -> pd.Da
 
     return df_episodes
 
-# %% ../../../nbs/01.data.external.pandas_utils.ipynb 44
+# %% ../../../nbs/01.data.external.pandas_utils.ipynb 47
 def decode_mongo_records(
     df: pd.DataFrame,
     torque_table_row_names: list[str],
@@ -503,7 +568,7 @@ def decode_mongo_records(
 
     return df_states, df_actions, ser_rewards, df_nstates
 
-# %% ../../../nbs/01.data.external.pandas_utils.ipynb 45
+# %% ../../../nbs/01.data.external.pandas_utils.ipynb 48
 def decode_mongo_episodes(
     df: pd.DataFrame,
 ) -> pd.DataFrame:
@@ -554,7 +619,7 @@ def decode_mongo_episodes(
     )
     return df_episodes
 
-# %% ../../../nbs/01.data.external.pandas_utils.ipynb 46
+# %% ../../../nbs/01.data.external.pandas_utils.ipynb 49
 def encode_dataframe_from_parquet(df: pd.DataFrame) -> pd.DataFrame:
     """
     decode the dataframe from parquet with flat column indices to MultiIndexed DataFrame
@@ -587,7 +652,7 @@ def encode_dataframe_from_parquet(df: pd.DataFrame) -> pd.DataFrame:
 
     return df
 
-# %% ../../../nbs/01.data.external.pandas_utils.ipynb 47
+# %% ../../../nbs/01.data.external.pandas_utils.ipynb 50
 def decode_episode_batch_to_padded_arrays(
     episodes: pd.DataFrame,
     torque_table_row_names: list[str],
@@ -646,7 +711,67 @@ def decode_episode_batch_to_padded_arrays(
 
     return s_n_t, a_n_t, r_n_t, ns_n_t
 
-# %% ../../../nbs/01.data.external.pandas_utils.ipynb 48
+# %% ../../../nbs/01.data.external.pandas_utils.ipynb 51
+def decode_mongo_episodes_to_padded_arrays(
+    episodes: list[
+        dict
+    ],  # episode documents as sampled from mongodb, with 'observation' keyed by timestamp
+    meta: ObservationMeta,  # observation metadata with the fixed shapes of state, action and reward
+    torque_table_row_names: Optional[
+        list[str]
+    ] = None,  # action rows, default from `meta`
+    padding_value: float = -10000.0,  # padding value for the shorter episodes
+) -> tuple[
+    np.ndarray, np.ndarray, np.ndarray, np.ndarray
+]:  # states, actions, rewards, next_states
+    """
+    decode the batch of mongodb EPISODE documents directly to padded 3D numpy arrays [B, T, F]
+    for states, actions, rewards, next_states without intermediate pandas objects.
+
+    The feature layout of each quadruple part is compiled once from the fixed shapes in `meta`,
+    rows in the same order as inference, i.e. (velocity, thrust, brake), (r0, r1, ...), (work,),
+    and units in their numeric order. Each step is gathered into a flat row and written into
+    the preallocated arrays, episodes shorter than the longest one are post-padded with `padding_value`.
+    """
+    if torque_table_row_names is None:
+        torque_table_row_names = meta.get_torque_table_row_names()
+    state_rows = ["velocity", "thrust", "brake"]
+    layouts = [
+        ("state", state_rows, meta.state_specs.unit_number_per_state),
+        ("action", torque_table_row_names, meta.action_specs.action_column_number),
+        ("reward", ["work"], meta.reward_specs.reward_number),
+        ("nstate", state_rows, meta.state_specs.unit_number_per_state),
+    ]
+
+    observations = [episode["observation"] for episode in episodes]
+    timestamps = [
+        sorted(observation) for observation in observations
+    ]  # iso format timestamps of one episode sort in time order
+    max_len = max((len(ts) for ts in timestamps), default=0)
+
+    arrays = []
+    for qtuple, rows, unit_number in layouts:
+        keys = [str(i) for i in range(unit_number)]  # mongodb keys are strings
+        getter = (
+            itemgetter(*keys) if len(keys) > 1 else lambda d, k=keys[0]: (d[k],)
+        )  # itemgetter returns a scalar for a single key
+        arr = np.full(
+            (len(episodes), max_len, len(rows) * unit_number),
+            padding_value,
+            dtype=np.float32,
+        )
+        for b, (observation, ts) in enumerate(zip(observations, timestamps)):
+            if ts:
+                arr[b, : len(ts)] = [
+                    [v for row in rows for v in getter(observation[t][qtuple][row])]
+                    for t in ts
+                ]
+        arrays.append(arr)
+
+    states, actions, rewards, nstates = arrays
+    return states, actions, rewards, nstates
+
+# %% ../../../nbs/01.data.external.pandas_utils.ipynb 53
 def encode_episode_dataframe_from_series(
     observations: List[pd.Series],
     torque_table_row_names: List[str],
@@ -693,7 +818,7 @@ def encode_episode_dataframe_from_series(
 
     return episode
 
-# %% ../../../nbs/01.data.external.pandas_utils.ipynb 49
+# %% ../../../nbs/01.data.external.pandas_utils.ipynb 54
 def recover_episodestart_tzinfo_from_timestamp(
     ts: pd.Timestamp, tzinfo: ZoneInfo
 ) -> pd.Timestamp:
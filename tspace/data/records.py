@@ -0,0 +1,221 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/01.data.records.ipynb.
+
+# %% auto 0
+__all__ = ['motion_power_columns', 'motion_power_dtype', 'quadruple_state_rows', 'motion_power_from_arrays',
+           'motion_power_to_frame', 'motion_power_from_frame', 'quadruple_dtype', 'quadruples_from_frame',
+           'records_to_arrow', 'records_from_arrow']
+
+# %% ../../nbs/01.data.records.ipynb 4
+import json
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa  # type: ignore
+
+# %% ../../nbs/01.data.records.ipynb 5
+from .core import ObservationMeta
+
+# %% ../../nbs/01.data.records.ipynb 7
+motion_power_columns = ["velocity", "thrust", "brake", "current", "voltage"]
+motion_power_dtype = np.dtype(
+    [("timestep", "datetime64[ns]")]
+    + [(col, np.float64) for col in motion_power_columns]
+)  # 48 bytes per sample
+
+# %% ../../nbs/01.data.records.ipynb 8
+def motion_power_from_arrays(
+    timesteps: np.ndarray,  # UTC timesteps as datetime64 or int64 ns since epoch, shape [N]
+    values: np.ndarray,  # velocity, thrust, brake, current, voltage, shape [N, 5]
+) -> np.ndarray:  # motion power records of `motion_power_dtype`, shape [N]
+    """
+    Assemble motion power records from a timestep array and a value block in one pass per field.
+    """
+    values = np.asarray(values)
+    timesteps = np.asarray(timesteps)
+    if values.ndim != 2 or values.shape[1] != len(motion_power_columns):
+        raise ValueError(f"values must have shape [N, 5], got {values.shape}")
+    if timesteps.shape != values.shape[:1]:
+        raise ValueError(
+            f"timesteps shape {timesteps.shape} doesn't match values {values.shape}"
+        )
+    records = np.empty(len(values), dtype=motion_power_dtype)
+    records["timestep"] = (
+        timesteps.astype("datetime64[ns]")
+        if timesteps.dtype.kind == "M"
+        else timesteps.astype(np.int64).view("datetime64[ns]")
+    )
+    for i, col in enumerate(motion_power_columns):
+        records[col] = values[:, i]
+    return records
+
+# %% ../../nbs/01.data.records.ipynb 9
+def motion_power_to_frame(
+    records: np.ndarray,  # motion power records of `motion_power_dtype`
+    tz: ZoneInfo,  # timezone of the timestep column
+) -> pd.DataFrame:  # motion power DataFrame, columns as in MotionPower
+    """
+    Convert motion power records to the DataFrame consumed by the cruncher,
+    with tz-aware timesteps and column index named 'qtuple'.
+    """
+    df_motion_power = pd.DataFrame(
+        {col: records[col] for col in motion_power_columns}, copy=False
+    )
+    df_motion_power.insert(
+        0,
+        "timestep",
+        pd.DatetimeIndex(records["timestep"]).tz_localize("UTC").tz_convert(tz),
+    )
+    df_motion_power.columns.name = "qtuple"
+    return df_motion_power
+
+# %% ../../nbs/01.data.records.ipynb 10
+def motion_power_from_frame(
+    df_motion_power: pd.DataFrame,  # motion power DataFrame, columns as in MotionPower
+) -> np.ndarray:  # motion power records of `motion_power_dtype`
+    """
+    Convert a motion power DataFrame with tz-aware or UTC naive timesteps back to records.
+    """
+    timesteps = pd.DatetimeIndex(df_motion_power["timestep"])
+    if timesteps.tz is not None:
+        timesteps = timesteps.tz_convert("UTC").tz_localize(None)
+    return motion_power_from_arrays(
+        timesteps.to_numpy("datetime64[ns]"),
+        df_motion_power[motion_power_columns].to_numpy(np.float64),
+    )
+
+# %% ../../nbs/01.data.records.ipynb 12
+def quadruple_dtype(
+    meta: ObservationMeta,  # observation metadata with the fixed shapes
+) -> np.dtype:  # structured dtype of a quadruple record
+    """
+    Get the structured dtype of quadruple records from the observation metadata,
+    state rows are (velocity, thrust, brake), action rows the torque table rows.
+    """
+    state_shape = (
+        meta.state_specs.state_number,
+        meta.state_specs.unit_number_per_state,
+    )
+    return np.dtype(
+        [
+            ("timestamp", "datetime64[ns]"),
+            ("state", np.float32, state_shape),
+            (
+                "action",
+                np.float32,
+                (
+                    meta.action_specs.action_row_number,
+                    meta.action_specs.action_column_number,
+                ),
+            ),
+            ("reward", np.float32, (meta.reward_specs.reward_number,)),
+            ("nstate", np.float32, state_shape),
+        ]
+    )
+
+# %% ../../nbs/01.data.records.ipynb 13
+quadruple_state_rows = ["velocity", "thrust", "brake"]
+
+
+def quadruples_from_frame(
+    batch: pd.DataFrame,  # record batch with (qtuple, rows, idx) columns and timestamp as last index level
+    meta: ObservationMeta,  # observation metadata with the fixed shapes
+    torque_table_row_names: Optional[
+        list[str]
+    ] = None,  # action rows, default from `meta`
+) -> np.ndarray:  # quadruple records of `quadruple_dtype(meta)`
+    """
+    Convert a batch of RECORD rows sampled from a pool to quadruple records,
+    one block copy per field instead of decoding row by row.
+    """
+    if torque_table_row_names is None:
+        torque_table_row_names = meta.get_torque_table_row_names()
+    idx = pd.IndexSlice
+    quadruples = np.empty(len(batch), dtype=quadruple_dtype(meta))
+    timestamps = pd.DatetimeIndex(batch.index.get_level_values(-1))
+    if timestamps.tz is not None:
+        timestamps = timestamps.tz_convert("UTC").tz_localize(None)
+    quadruples["timestamp"] = timestamps.to_numpy("datetime64[ns]")
+    for name, rows in (
+        ("state", quadruple_state_rows),
+        ("action", torque_table_row_names),
+        ("reward", "work"),
+        ("nstate", quadruple_state_rows),
+    ):
+        quadruples[name] = (
+            batch.loc[:, idx[name, rows]]  # type: ignore
+            .to_numpy(np.float32)
+            .reshape(quadruples[name].shape)
+        )
+    return quadruples
+
+# %% ../../nbs/01.data.records.ipynb 15
+def records_to_arrow(
+    records: np.ndarray,  # 1D structured array, e.g. of `motion_power_dtype` or `quadruple_dtype`
+    tz: Optional[ZoneInfo] = None,  # timezone of the timestamp columns
+) -> pa.Table:  # Arrow table with one column per field
+    """
+    Convert structured records to an Arrow table in bulk, one array per field.
+    """
+    fields, arrays = [], []
+    for name in records.dtype.names:
+        field_dtype = records.dtype.fields[name][0]
+        column = records[name]
+        if field_dtype.subdtype is not None:
+            base, shape = field_dtype.subdtype
+            flat = np.ascontiguousarray(column).reshape(-1)
+            array = pa.FixedSizeListArray.from_arrays(
+                pa.array(flat), int(np.prod(shape))
+            )
+            fields.append(
+                pa.field(name, array.type, metadata={"shape": json.dumps(shape)})
+            )
+        elif field_dtype.kind == "M":
+            unit, _ = np.datetime_data(field_dtype)
+            array = pa.array(
+                np.ascontiguousarray(column).view(np.int64),
+                type=pa.timestamp(unit, tz=None if tz is None else str(tz)),
+            )
+            fields.append(pa.field(name, array.type))
+        else:
+            array = pa.array(np.ascontiguousarray(column))
+            fields.append(pa.field(name, array.type))
+        arrays.append(array)
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+# %% ../../nbs/01.data.records.ipynb 16
+def records_from_arrow(
+    table: pa.Table,  # Arrow table as from `records_to_arrow`
+) -> np.ndarray:  # 1D structured array, timestamps in UTC
+    """
+    Convert an Arrow table back to structured records in bulk, one array per column.
+    """
+    descr, columns = [], []
+    for field in table.schema:
+        column = table.column(field.name).combine_chunks()
+        if pa.types.is_fixed_size_list(field.type):
+            shape = (
+                tuple(json.loads(field.metadata[b"shape"]))
+                if field.metadata and b"shape" in field.metadata
+                else (field.type.list_size,)
+            )
+            values = column.flatten().to_numpy(zero_copy_only=False)
+            descr.append((field.name, values.dtype, shape))
+            columns.append(values.reshape((len(table), *shape)))
+        elif pa.types.is_timestamp(field.type):
+            values = (
+                column.cast(pa.int64())
+                .to_numpy(zero_copy_only=False)
+                .view(f"datetime64[{field.type.unit}]")
+            )
+            descr.append((field.name, values.dtype))
+            columns.append(values)
+        else:
+            values = column.to_numpy(zero_copy_only=False)
+            descr.append((field.name, values.dtype))
+            columns.append(values)
+    records = np.empty(len(table), dtype=np.dtype(descr))
+    for (name, *_), values in zip(descr, columns):
+        records[name] = values
+    return records
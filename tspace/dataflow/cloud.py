@@ -11,7 +11,8 @@ import os
 import subprocess
 import time
 from threading import Event, Lock, current_thread
-from typing import Callable, Optional, Tuple, cast
+from contextlib import nullcontext
+from typing import Callable, Optional, Tuple, Union, cast
 from dataclasses import dataclass
 import numpy as np
 import pandas as pd
@@ -21,12 +22,15 @@ import pandas as pd
 # %% ../../nbs/06.dataflow.cloud.ipynb 4
 from .pipeline.queue import Pipeline  # type: ignore
 from .pipeline.deque import PipelineDQ  # type: ignore
+from .pipeline.ring import PipelineRing, RingPolicy  # type: ignore
+from .scheduler import Backoff
 from .vehicle_interface import VehicleInterface  # type: ignore
 
 # %% ../../nbs/06.dataflow.cloud.ipynb 5
 # from tspace.conn.clearable_pull_consumer import ClearablePullConsumer
 
 from ..conn.remote_can_client import RemoteCanClient, RemoteCanException
+from ..conn.remote_can_async import AsyncRemoteCanClient
 from ..config.messengers import CANMessenger, TripMessenger
 from ..config.vehicles import TruckInCloud
 from ..conn.udp import udp_context
@@ -35,6 +39,8 @@ from tspace.data.external.numpy_utils import (
     timestamps_from_can_strings,
 )
 from ..data.core import RawType, RCANType
+from ..data.records import motion_power_from_arrays, motion_power_to_frame
+from ..system.trace import get_tracer
 
 # %% ../../nbs/06.dataflow.cloud.ipynb 6
 @dataclass
@@ -56,16 +62,18 @@ class Cloud(VehicleInterface):
             web_srv is a tuple of str
         epi_countdown_time: float = 3.0
             epi_countdown_time is a float
-        remotecan: Optional[RemoteCanClient] = None
-            RemoteCanClient type is RemoteCanClient
+        remotecan_connections: int = 1
+            concurrent connections to the remote can server, the asynchronous client is used if > 1
+        remotecan: Optional[Union[RemoteCanClient, AsyncRemoteCanClient]] = None
+            RemoteCanClient, or AsyncRemoteCanClient if remotecan_connections > 1
         rmq_consumer: Optional[ClearablePullConsumer] = None
             ClearablePullConsumer type is ClearablePullConsumer
         rmq_message_ready: Optional[Message] = None
             Message type is Message
         rmq_producer: Optional[Producer] = None
             Producer type is Producer
-        remoteClient_lock: Optional[Lock] = None
-            Lock type is Lock
+        remoteClient_lock: Optional[Union[Lock, nullcontext]] = None
+            Lock serializing capture and flash, nullcontext with the asynchronous client
     """
 
     truck: TruckInCloud
@@ -74,11 +82,12 @@ class Cloud(VehicleInterface):
     ui: str = "UDP"
     web_srv = ("rocket_intra",)
     epi_countdown_time: float = 3.0
-    remotecan: Optional[RemoteCanClient] = None
+    remotecan_connections: int = 1
+    remotecan: Optional[Union[RemoteCanClient, AsyncRemoteCanClient]] = None
     # rmq_consumer: Optional[ClearablePullConsumer] = None
     # rmq_message_ready: Optional[Message] = None
     # rmq_producer: Optional[Producer] = None
-    remoteClient_lock: Optional[Lock] = None
+    remoteClient_lock: Optional[Union[Lock, nullcontext]] = None
 
     def __post_init__(self):
         """init cloud interface and set ui type"""
@@ -99,27 +108,38 @@ class Cloud(VehicleInterface):
     def init_cloud(self) -> None:
         """initialize cloud interface, set proxy and remote can client and the lock"""
         os.environ["http_proxy"] = ""
-        self.remotecan = RemoteCanClient(
-            host=self.can_server.host,
-            port=self.can_server.port,
-            truck=self.truck,
-            logger=self.logger,
-            dict_logger=self.dict_logger,
-        )
-
-        self.remoteClient_lock = Lock()
+        if self.remotecan_connections > 1:
+            # capture and flash share the connection pool concurrently
+            self.remotecan = AsyncRemoteCanClient(
+                host=self.can_server.host,
+                port=self.can_server.port,
+                truck=self.truck,
+                max_connections=self.remotecan_connections,
+                logger=self.logger,
+                dict_logger=self.dict_logger,
+            )
+            self.remoteClient_lock = nullcontext()
+        else:
+            self.remotecan = RemoteCanClient(
+                host=self.can_server.host,
+                port=self.can_server.port,
+                truck=self.truck,
+                logger=self.logger,
+                dict_logger=self.dict_logger,
+            )
+            self.remoteClient_lock = Lock()
 
     def init_internal_pipelines(
         self,
     ) -> Tuple[
-        PipelineDQ[RawType], Pipeline[str]
+        PipelineRing[RawType], Pipeline[str]
     ]:  # PipelineDQ[dict[str, Union[str, dict[str, list[Union[str, list[str]]]]]]],
         """initialize internal pipeline static type for cloud interface"""
-        raw_pipeline = PipelineDQ[
+        raw_pipeline = PipelineRing[
             RawType
         ](  # [dict[str, dict[str, list[Union[str, list[str]]]]]]
-            maxlen=1
-        )
+            maxlen=1, policy=RingPolicy.KEEP_LATEST
+        )  # bounded, the filter always takes the latest window
         hmi_pipeline = Pipeline[str](maxsize=1)
         return raw_pipeline, hmi_pipeline
 
@@ -221,7 +241,11 @@ class Cloud(VehicleInterface):
     ):
         """Callback for the data capture thread"""
         logger_remote_get = self.logger.getChild("remotecan_capture")
+        tracer = get_tracer()
         logger_remote_get.propagate = True
+        backoff = Backoff(
+            base=1.0, cap=float(self.truck.tbox_unit_number)
+        )  # retry backoff of the failed captures
 
         logger_remote_get.info(
             "cloud data_capture starts!",
@@ -239,11 +263,14 @@ class Cloud(VehicleInterface):
                 f"Wake up to fetch remote data, duration={self.truck.tbox_unit_number}s timeout={timeout}s",
                 extra=self.dict_logger,
             )
+            retry_delay = None
             with self.remoteClient_lock:
                 try:
+                    t0 = tracer.start()
                     remotecan_data: RCANType = self.remotecan.get_signals(
                         duration=self.truck.tbox_unit_number, timeout=timeout
                     )  # timeout is 1 second longer than duration
+                    tracer.stop("capture", t0)
                 except RemoteCanException as exc:
                     logger_remote_get.warning(
                         f"{{'header': 'remote get_signals failed and retry', "
@@ -258,7 +285,7 @@ class Cloud(VehicleInterface):
                     if exc.err_code in (1, 1000, 1002):
                         self.cloud_ping()
                         # self.cloud_telnet_test()
-                    continue
+                    retry_delay = backoff.next()
                     # else:
                     #     raise exc
                 except Exception as exc:
@@ -268,6 +295,11 @@ class Cloud(VehicleInterface):
                     )
                     raise exc
 
+            if retry_delay is not None:
+                # back off outside the lock so that flashing is not blocked, cut short on exit
+                exit_event.wait(retry_delay)
+                continue
+            backoff.reset()
             raw_pipeline.put_data(remotecan_data)  # deque is non-blocking
 
         logger_remote_get.info("cloud data_capture dies!!!!!", extra=self.dict_logger)
@@ -591,7 +623,7 @@ class Cloud(VehicleInterface):
 
     def filter(
         self,
-        in_pipeline: PipelineDQ[RawType],  # input pipelineDQ[raw data],
+        in_pipeline: PipelineRing[RawType],  # input PipelineRing[raw data],
         out_pipeline: Pipeline[pd.DataFrame],  # output pipeline[DataFrame]
         start_event: Optional[Event],  # input event start
         stop_event: Optional[Event],  # not used for cloud
@@ -605,6 +637,7 @@ class Cloud(VehicleInterface):
         thread = current_thread()
         thread.name = "cloud_filter"
         logger_filter = self.logger.getChild("data_out")
+        tracer = get_tracer()
         logger_filter.propagate = True
 
         logger_filter.info(
@@ -614,16 +647,19 @@ class Cloud(VehicleInterface):
         while not exit_event.is_set():
             try:
                 remotecan_data: RCANType = cast(
-                    RCANType, in_pipeline.get_data()
-                )  # deque is non-blocking, cast is to sooth mypy
+                    RCANType, in_pipeline.get_data(block=True, timeout=1.0)
+                )  # block until data arrive, cast is to sooth mypy
 
-            except IndexError:  # if deque is empty, IndexError will be raised
+            except (
+                IndexError
+            ):  # if deque is still empty after timeout, check exit_event
                 continue
             assert isinstance(remotecan_data, dict), "remotecan_data is not a dict!"
 
             # as long as flashing is on going, always waiting for flash
             if start_event.is_set():
                 try:
+                    t0 = tracer.start()
                     signal_freq = self.truck.tbox_signal_frequency
                     gear_freq = self.truck.tbox_gear_frequency
                     unit_duration = self.truck.tbox_unit_duration
@@ -675,15 +711,19 @@ class Cloud(VehicleInterface):
                                 axis=1,
                             )
 
-                            motion_power = np.c_[
-                                timestamps_arr.reshape(-1, 1),
-                                velocity_arr.reshape(-1, 1),
-                                thrust_arr.reshape(-1, 1),
-                                brake_arr.reshape(-1, 1),
-                                gears_arr.reshape(-1, 1),
-                                current_arr.reshape(-1, 1),
-                                voltage_arr.reshape(-1, 1),
-                            ]  # 1 + 3 + 1 + 2  : im 7
+                            motion_power = motion_power_from_arrays(
+                                timestamps_arr.reshape(-1).astype("datetime64[ms]"),
+                                np.stack(
+                                    [
+                                        velocity_arr.reshape(-1),
+                                        thrust_arr.reshape(-1),
+                                        brake_arr.reshape(-1),
+                                        current_arr.reshape(-1),
+                                        voltage_arr.reshape(-1),
+                                    ],
+                                    axis=1,
+                                ),
+                            )  # 1 + 3 + 2  : im 6, gears are not part of the motion power
 
                             # 0~20km/h; 7~30km/h; 10~40km/h; 20~50km/h; ...
                             # average concept
@@ -707,42 +747,46 @@ class Cloud(VehicleInterface):
                                 self.vcu_calib_table_row_start = 16
 
                             logger_filter.info(
-                                f"Cycle velocity: Aver{np.mean(velocity_arr):.2f},"
-                                f"Min{np.amin(velocity_arr):.2f},"
-                                f"Max{np.amax(velocity_arr):.2f},"
-                                f"StartIndex{self.vcu_calib_table_row_start}!",
+                                "Cycle velocity: Aver%.2f,Min%.2f,Max%.2f,StartIndex%d!",
+                                np.mean(velocity_arr),
+                                np.amin(velocity_arr),
+                                vel_max,
+                                self.vcu_calib_table_row_start,
                                 extra=self.dict_logger,
                             )
 
-                            df_motion_power = pd.DataFrame(
-                                motion_power,
-                                columns=[
-                                    "timestep",
-                                    "velocity",
-                                    "thrust",
-                                    "brake",
-                                    "current",
-                                    "voltage",
-                                ],
+                            df_motion_power = self.stamp_table_versions(
+                                motion_power_to_frame(motion_power, self.truck.site.tz)
                             )
+                            tracer.stop("filter", t0)
                             # df_motion_power.set_index('timestamp', inplace=True)
-                            df_motion_power.columns.name = "qtuple"
                             out_pipeline.put_data(df_motion_power)
-                            flash_event.wait()  # wait for cruncher to consume and flash to finish
-                            flash_event.clear()  # reset flash_event as the first waiter
-
                             logger_filter.info(
-                                "evt_remote_flash wakes up, reset inner lock, restart remote_get!!!",
+                                "{'header': 'put one dataframe and wait.', 'raw_pipeline': %s}",
+                                in_pipeline.stats(),
                                 extra=self.dict_logger,
                             )
+                            if (
+                                not self.pipelined_flash
+                            ):  # lockstep, capture after flashing
+                                flash_event.wait()  # wait for cruncher to consume and flash to finish
+                                flash_event.clear()  # reset flash_event as the first waiter
+
+                                logger_filter.info(
+                                    "evt_remote_flash wakes up, reset inner lock, restart remote_get!!!",
+                                    extra=self.dict_logger,
+                                )
                         else:
                             logger_filter.info(
-                                f"show status: {key}:{value}",
+                                "show status: %s:%s",
+                                key,
+                                value,
                                 extra=self.dict_logger,
                             )
                 except Exception as exc:
                     logger_filter.error(
-                        f"Observation Corrupt! Status exception {exc}",
+                        "Observation Corrupt! Status exception %s",
+                        exc,
                         extra=self.dict_logger,
                     )
 
@@ -19,6 +19,7 @@ import tensorflow as tf
 # %% ../../nbs/06.dataflow.cruncher.ipynb 5
 from .filter.homo import HomoFilter  # type: ignore
 from .pipeline.queue import Pipeline  # type: ignore
+from .pipeline.event import wait_for_events  # type: ignore
 from .producer import Producer  # type: ignore
 from ..config.drivers import Driver
 from ..config.vehicles import Truck
@@ -30,6 +31,9 @@ from tspace.data.external.pandas_utils import (
 )
 from ..system.plot import plot_3d_figure, plot_to_image
 from ..agent.dpg import DPG
+from .learner import Learner
+from .fleet import BatchedInference
+from ..system.trace import get_tracer
 
 # %% ../../nbs/06.dataflow.cruncher.ipynb 6
 @dataclass
@@ -50,6 +54,11 @@ class Cruncher(HomoFilter[pd.DataFrame]):
         - train_summary_writer: SummaryWriter, Tensorflow training writer
         - logger: Logger
         - dict_logger: logger format specs
+        - learner: Learner, background learner, training inline at the end of each episode if None
+        - updates_per_episode: int, number of updates at the end of each episode when training inline
+        - pipelined_flash: bool, keep consuming observations while flashing, matching the vehicle interface
+        - engine: BatchedInference, inference shared by the trucks of a fleet, the agent infers by itself if None
+        - close_pool_on_exit: bool, close the buffer on exit, False if the pool is shared by a fleet
     """
 
     agent: DPG
@@ -61,6 +70,11 @@ class Cruncher(HomoFilter[pd.DataFrame]):
     train_summary_writer: Optional[tf.summary.SummaryWriter] = None  # type: ignore
     logger: Optional[logging.Logger] = None
     dict_logger: Optional[dict] = None
+    learner: Optional[Learner] = None
+    updates_per_episode: int = 6
+    pipelined_flash: bool = False
+    engine: Optional[BatchedInference] = None
+    close_pool_on_exit: bool = True
 
     def __post_init__(self):
         """Set logger, Tensorflow data path and running mode"""
@@ -80,6 +94,9 @@ class Cruncher(HomoFilter[pd.DataFrame]):
         self.train_summary_writer = tf.summary.create_file_writer(  # type: ignore
             str(tfb_path)
         )
+        self.device = (
+            "/GPU:0" if tf.config.list_physical_devices("GPU") else "/CPU:0"
+        )  # edge boxes without gpu run on the cpu
 
         if self.resume:
             self.logger.info(
@@ -123,13 +140,23 @@ class Cruncher(HomoFilter[pd.DataFrame]):
         epi_cnt = 0
 
         logger_cruncher_consume = self.logger.getChild("consume")
+        tracer = get_tracer()
         logger_cruncher_consume.info(f"Cruncher thread starts!", extra=self.dict_logger)
+        if self.learner is not None and not self.infer_mode:
+            self.learner.start(exit_event)  # train in the background
         while not exit_event.is_set():  # run until program exit
             if (
-                (not start_event.is_set())
-                or stop_event.is_set()
-                or interrupt_event.is_set()
-            ):
+                not wait_for_events(
+                    lambda: exit_event.is_set()
+                    or (
+                        start_event.is_set()
+                        and not stop_event.is_set()
+                        and not interrupt_event.is_set()
+                    ),
+                    [start_event, stop_event, interrupt_event, exit_event],
+                )
+                or exit_event.is_set()
+            ):  # block until an episode starts or program exits
                 continue
 
             # tf.summary.trace_on(graph=True, profiler=True)
@@ -169,6 +196,17 @@ class Cruncher(HomoFilter[pd.DataFrame]):
 
             # prime the episode
             self.agent.start_episode(ts=pd.Timestamp.now(tz=self.truck.site.tz))
+            if (
+                self.engine is None  # the shared engine syncs between its batches
+                and self.learner is not None
+                and self.learner.sync()
+            ):
+                logger_cruncher_consume.info(
+                    f"{{'header': 'acting actor updated', "
+                    f"'version': {self.learner.acting_version}, "
+                    f"'episode': {epi_cnt}}}",
+                    extra=self.dict_logger,
+                )
             step_count = 0
             episode_reward = 0.0
             prev_timestamp = self.agent.episode_start_dt
@@ -204,19 +242,22 @@ class Cruncher(HomoFilter[pd.DataFrame]):
             )
             flash_event.set()  # kick off the episode capturing, reactivate data_transform
             b_flashed = False
+            pending_version = (
+                None  # version of the table being flashed in pipelined mode
+            )
             tf.debugging.set_log_device_placement(True)
-            with tf.device("/GPU:0"):
+            with tf.device(self.device):
                 while (not stop_event.is_set()) and (
                     not interrupt_event.is_set() and (not exit_event.is_set())
                 ):
                     observe_pipeline_size = in_pipeline.qsize()
                     logger_cruncher_consume.info(
-                        f"observe pipeline size: {observe_pipeline_size}"
+                        "observe pipeline size: %d", observe_pipeline_size
                     )
                     if observe_pipeline_size > 2:
                         # self.logc.info(f"motion_power_queue.qsize(): {self.motion_power_queue.qsize()}")
                         logger_cruncher_consume.info(
-                            f"{{'header': 'Residue in Queue is a sign of disordered sequence, interrupted!'}}"
+                            "{'header': 'Residue in Queue is a sign of disordered sequence, interrupted!'}"
                         )
                         interrupt_event.set()
 
@@ -224,23 +265,23 @@ class Cruncher(HomoFilter[pd.DataFrame]):
                         motion_power = in_pipeline.get(block=True, timeout=1.55)
                     except TimeoutError:
                         logger_cruncher_consume.info(
-                            f"{{'header': 'No data in the input Queue Timeout!!!', "
-                            f"'episode': {epi_cnt}}}",
+                            "{'header': 'No data in the input Queue Timeout!!!', 'episode': %d}",
+                            epi_cnt,
                             extra=self.dict_logger,
                         )
                         continue
                     except queue.Empty:
                         logger_cruncher_consume.info(
-                            f"{{'header': 'No data in the input Queue empty Queue!!!', "
-                            f"'episode': {epi_cnt}}}",
+                            "{'header': 'No data in the input Queue empty Queue!!!', 'episode': %d}",
+                            epi_cnt,
                             extra=self.dict_logger,
                         )
                         continue
 
                     logger_cruncher_consume.info(
-                        f"{{'header': 'start', "
-                        f"'step': {step_count}, "
-                        f"'episode': {epi_cnt}}}",
+                        "{'header': 'start', 'step': %d, 'episode': %d}",
+                        step_count,
+                        epi_cnt,
                         extra=self.dict_logger,
                     )  # env.step(action) action is flash the vcu calibration table
 
@@ -260,6 +301,7 @@ class Cruncher(HomoFilter[pd.DataFrame]):
                     # as frequency is fixed at 50Hz, the rest is saved in another col
 
                     # motion_power.loc[:, ['timestep', 'velocity', 'thrust', 'brake']]
+                    t0 = tracer.start()
                     state, table_start_row = assemble_state_ser(
                         motion_power.loc[
                             :, ["timestep", "velocity", "thrust", "brake"]
@@ -275,15 +317,24 @@ class Cruncher(HomoFilter[pd.DataFrame]):
                         ts=pd.Timestamp.now(tz=self.truck.site.tz),
                     )
                     work = reward[("work", 0)]
+                    tracer.stop("state", t0)
                     episode_reward += float(work)
 
                     logger_cruncher_consume.info(
-                        f"{{'header': 'assembling state and reward!', "
-                        f"'episode': {epi_cnt}}}",
+                        "{'header': 'assembling state and reward!', 'episode': %d}",
+                        epi_cnt,
                         extra=self.dict_logger,
                     )
 
                     #  separate the inference and flash in order to avoid the action change incurred reward noise
+                    if (
+                        self.pipelined_flash
+                    ):  # the active half step starts with the pushed table
+                        b_flashed = (
+                            pending_version is not None
+                            and motion_power.attrs["table_version_start"]
+                            < pending_version
+                        )
                     if b_flashed is False:  # the active half step
                         #  at step 0: [ep_start, None (use zeros), a=0, r=0, s=s_0]
                         #  at step n: [t=t_{n-1}, s=s_{n-1}, a=a_{n-1}, r=r_{n-1}, s'=s_n]
@@ -291,6 +342,24 @@ class Cruncher(HomoFilter[pd.DataFrame]):
                         reward[("work", 0)] = (
                             work + step_reward
                         )  # reward is the sum of flashed and not flashed step
+                        step_reward = 0.0
+                        if (
+                            pending_version is not None
+                        ):  # pipelined, the pushed table is active
+                            prev_action = assemble_action_ser(
+                                torque_table_line,
+                                self.agent.torque_table_row_names,
+                                table_start,
+                                flash_start_ts,
+                                motion_power.attrs["table_active_since"],
+                                self.truck.torque_table_row_num_flash,
+                                self.truck.torque_table_col_num,
+                                self.truck.speed_scale,
+                                self.truck.pedal_scale,
+                                self.truck.site.tz,
+                            )
+                            pending_version = None
+                        t0 = tracer.start()
                         self.agent.deposit(
                             prev_timestamp,
                             prev_state,
@@ -298,14 +367,24 @@ class Cruncher(HomoFilter[pd.DataFrame]):
                             reward,  # reward from last action
                             state,
                         )  # (s_{-1}, a_{-1}, r_{-1}, s_0), (s_0, a_0, r_0, s_1), ..., (s_{N-1}, a_{N-1}, r_{N-1}, s_N)
+                        tracer.stop("deposit", t0)
 
                         # Inference !!!
                         # stripping timestamps from state, (later flatten and convert to tensor)
                         # agent return the inferred action sequence without batch and time dimension
-                        torque_table_line = self.agent.actor_predict(
-                            state[["velocity", "thrust", "brake"]]
-                        )  # model input requires fixed order velocity col -> thrust col -> brake col
+                        t0 = tracer.start()
+                        if self.engine is not None:  # batched with the other trucks
+                            torque_table_line = self.engine.predict(
+                                state[["velocity", "thrust", "brake"]],
+                                self.agent.noise_stream,
+                            )
+                        else:
+                            torque_table_line = self.agent.actor_predict(
+                                state[["velocity", "thrust", "brake"]]
+                            )  # model input requires fixed order velocity col -> thrust col -> brake col
                         #  !!! training with samples of the same order!!!
+                        tracer.stop("predict", t0)
+                        t0 = tracer.start()
                         df_torque_table = assemble_flash_table(
                             torque_table_line,
                             table_start_row,
@@ -314,50 +393,62 @@ class Cruncher(HomoFilter[pd.DataFrame]):
                             self.truck.speed_scale,
                             self.truck.pedal_scale,
                         )
+                        tracer.stop("flash_table", t0)
 
                         logger_cruncher_consume.info(
-                            f"{{'header': 'inference done with reduced action space!', "
-                            f"'episode': {epi_cnt}}}",
+                            "{'header': 'inference done with reduced action space!', 'episode': %d}",
+                            epi_cnt,
                             extra=self.dict_logger,
                         )
                         # flash the vcu calibration table and assemble action
                         flash_start_ts = pd.Timestamp.now(self.truck.site.tz)
                         out_pipeline.put_data(df_torque_table)
                         logger_cruncher_consume.info(
-                            f"{{'header': 'Action Push table', "
-                            f"'StartIndex': {table_start_row}, "
-                            f"'qsize': {out_pipeline.qsize()}}}",
-                            extra=self.dict_logger,
-                        )
-
-                        # wait for remote flash to finish
-                        flash_event.wait()  # clear the event flag in observe thread
-                        if interrupt_event.is_set() or exit_event.is_set():
-                            continue
-
-                        logger_cruncher_consume.info(
-                            f"{{'header': 'flash lock released!",
+                            "{'header': 'Action Push table', 'StartIndex': %d, 'qsize': %d}",
+                            table_start_row,
+                            out_pipeline.qsize(),
                             extra=self.dict_logger,
                         )
-                        flash_end_ts = pd.Timestamp.now(self.truck.site.tz)
 
-                        action = assemble_action_ser(
-                            torque_table_line,
-                            self.agent.torque_table_row_names,
-                            table_start,
-                            flash_start_ts,
-                            flash_end_ts,
-                            self.truck.torque_table_row_num_flash,
-                            self.truck.torque_table_col_num,
-                            self.truck.speed_scale,
-                            self.truck.pedal_scale,
-                            self.truck.site.tz,
-                        )
-
-                        prev_timestamp = timestamp
-                        prev_state = state
-                        prev_action = action
-                        b_flashed = True
+                        if self.pipelined_flash:  # keep capturing while flashing
+                            # the action is assembled once a window is captured with the new table
+                            pending_version = (
+                                motion_power.attrs["table_version_end"] + 1
+                            )
+                            prev_timestamp = timestamp
+                            prev_state = state
+                            b_flashed = True
+                        else:  # lockstep
+                            # wait for remote flash to finish
+                            flash_event.wait()  # clear the event flag in observe thread
+                            if interrupt_event.is_set() or exit_event.is_set():
+                                continue
+
+                            logger_cruncher_consume.info(
+                                "{'header': 'flash lock released!'}",
+                                extra=self.dict_logger,
+                            )
+                            flash_end_ts = pd.Timestamp.now(self.truck.site.tz)
+
+                            action = assemble_action_ser(
+                                torque_table_line,
+                                self.agent.torque_table_row_names,
+                                table_start,
+                                flash_start_ts,
+                                flash_end_ts,
+                                self.truck.torque_table_row_num_flash,
+                                self.truck.torque_table_col_num,
+                                self.truck.speed_scale,
+                                self.truck.pedal_scale,
+                                self.truck.site.tz,
+                            )
+
+                            prev_timestamp = timestamp
+                            prev_state = state
+                            prev_action = action
+                            b_flashed = True
+                    elif self.pipelined_flash:  # window captured while flashing
+                        step_reward += float(work)
                     else:  # if bFlashed is True, the dummy half step
                         step_reward = float(
                             work
@@ -367,9 +458,9 @@ class Cruncher(HomoFilter[pd.DataFrame]):
 
                     # TODO add speed sum as positive reward
                     logger_cruncher_consume.info(
-                        f"{{'header': 'Step done',"
-                        f"'step': {step_count}, "
-                        f"'episode': {epi_cnt}}}",
+                        "{'header': 'Step done', 'step': %d, 'episode': %d}",
+                        step_count,
+                        epi_cnt,
                         extra=self.dict_logger,
                     )
 
@@ -419,16 +510,28 @@ class Cruncher(HomoFilter[pd.DataFrame]):
                 logger_cruncher_consume.info(
                     "{{'header': 'No Learning, just calculating loss.'}}"
                 )
+            elif self.learner is not None:  # the truck does not wait for the training
+                self.learner.notify_episode()
+                (critic_loss, actor_loss) = self.learner.losses
+                logger_cruncher_consume.info(
+                    f"{{'header': 'Learning in the background', "
+                    f"'updates': {self.learner.update_count}, "
+                    f"'version': {self.learner.snapshot[0]}}}",
+                    extra=self.dict_logger,
+                )
             else:
                 logger_cruncher_consume.info(
-                    "{{'header': 'Learning and updating 6 times!'}}"
+                    f"{{'header': 'Learning and updating {self.updates_per_episode} times!'}}"
                 )
 
                 # self.logger.info(f"BP{k} starts.", extra=self.dict_logger)
                 if self.agent.buffer.pool.cnt > 0:
-                    for k in range(6):
-                        (critic_loss, actor_loss, value_loss) = self.agent.train()
-                        self.agent.soft_update_target()
+                    t0 = tracer.start()
+                    (critic_loss, actor_loss) = self.agent.train_n(
+                        self.updates_per_episode
+                    )  # fused into one graph call where the agent supports it
+                    tracer.stop("train", t0)
+                    self.agent.set_acting_weights(self.agent.get_actor_weights())
                 else:
                     logger_cruncher_consume.info(
                         f"{{'header': 'Buffer empty, no learning!'}}",
@@ -441,7 +544,7 @@ class Cruncher(HomoFilter[pd.DataFrame]):
                 self.agent.save_ckpt()
 
             logger_cruncher_consume.info(
-                f"{{'header': 'losses after 6 times BP', "
+                f"{{'header': 'losses after BP', "
                 f"'episode': {epi_cnt}, "
                 f"'critic loss': {critic_loss}, "
                 f"'actor loss': {actor_loss}}}",
@@ -475,6 +578,17 @@ class Cruncher(HomoFilter[pd.DataFrame]):
 
             plt.close(fig)
 
+            # per-stage latencies of the episode
+            tracer.write_summary(self.train_summary_writer, step=epi_cnt)
+            logger_cruncher_consume.info(
+                f"{{'header': 'stage latencies in ns', "
+                f"'episode': {epi_cnt}, "
+                f"'stages': {tracer.summary()}}}",
+                extra=self.dict_logger,
+            )
+            tracer.flush()
+            tracer.reset()
+
             logger_cruncher_consume.info(
                 f"{{'episode': {epi_cnt}, " f"'reward': {episode_reward}}}",
                 extra=self.dict_logger,
@@ -505,7 +619,11 @@ class Cruncher(HomoFilter[pd.DataFrame]):
         #         profiler_out_dir=self.train_log_dir,
         #     )
 
-        self.agent.buffer.close()
+        if self.learner is not None:
+            self.learner.join()  # stop training before closing the pool
+        if self.close_pool_on_exit:
+            self.agent.buffer.close()
+            self.agent.close_ckpt()
         plt.close(fig="all")
 
         logger_cruncher_consume.info(
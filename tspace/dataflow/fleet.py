@@ -0,0 +1,187 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/06.dataflow.fleet.ipynb.
+
+# %% auto 0
+__all__ = ['BatchedInference']
+
+# %% ../../nbs/06.dataflow.fleet.ipynb 3
+import concurrent.futures
+import logging
+import queue
+import time
+from dataclasses import dataclass
+from threading import Event, Thread
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+# %% ../../nbs/06.dataflow.fleet.ipynb 4
+from ..agent.dpg import DPG
+from .learner import Learner
+from ..system.trace import get_tracer
+
+# %% ../../nbs/06.dataflow.fleet.ipynb 5
+@dataclass
+class BatchedInference:
+    """
+    BatchedInference is the inference engine shared by the crunchers of a fleet.
+
+    Each cruncher submits the state of its truck with `predict` and blocks for the action.
+    The noise stream of the truck goes along with the state, so the exploration noise of each truck stays its own process.
+    The engine thread gathers the concurrent requests for at most `max_wait` seconds after the first one
+    and evaluates them with a single `actor_predict_batch` call of the agent,
+    which amortizes the dispatch cost of the model over the fleet, especially for CPU inference.
+    The acting actor is synced with the learner between the batches, never within one.
+
+    Attributes:
+
+        - agent: DPG, the agent of the fleet, whose acting actor evaluates the batches
+        - max_batch: int, maximal number of states in a batch, usually the size of the fleet
+        - max_wait: float, seconds to wait for more states after the first one of a batch
+        - learner: Optional[Learner], background learner publishing the actor weights
+        - logger: Logger
+        - dict_logger: logger format specs
+    """
+
+    agent: DPG
+    max_batch: int = 8  # maximal number of states in a batch
+    max_wait: float = 0.005  # seconds to wait for more states after the first one
+    learner: Optional[Learner] = None
+    logger: Optional[logging.Logger] = None
+    dict_logger: Optional[dict] = None
+
+    def __post_init__(self):
+        """Set logger, the request queue and the counters"""
+        self.logger = self.logger.getChild(self.__str__())
+        if self.max_batch < 1:
+            raise ValueError(f"max_batch must be positive, got {self.max_batch}")
+        self.requests: queue.SimpleQueue = (
+            queue.SimpleQueue()
+        )  # (state, stream, future)
+        self.batch_count = 0  # evaluated batches
+        self.request_count = 0  # evaluated states
+        self.thread: Optional[Thread] = None
+
+    def __str__(self):
+        return "batched_inference"
+
+    def predict(
+        self,
+        state: pd.Series,  # flat state of one truck
+        stream: int = 0,  # exploration noise stream of the truck
+        poll_interval: float = 1.0,  # seconds to re-check whether the engine is alive
+    ) -> np.ndarray:  # action of the truck, [torque_flash_numel]
+        """
+        Evaluate the acting actor for one truck, called by the cruncher of the truck.
+
+        Blocks until the batch containing the state has been evaluated.
+
+        raise:
+            RuntimeError, if the engine is not running
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self.requests.put((np.asarray(state.values, dtype=np.float32), stream, future))
+        while True:
+            try:
+                return future.result(poll_interval)
+            except concurrent.futures.TimeoutError:
+                if self.thread is None or not self.thread.is_alive():
+                    raise RuntimeError(f"{self} is not running")
+
+    def gather(
+        self,
+        poll_interval: float,  # seconds to wait for the first state
+    ) -> list[tuple[np.ndarray, int, concurrent.futures.Future]]:
+        """gather the requests of a batch, empty if no request arrives within the poll interval"""
+        try:
+            batch = [self.requests.get(timeout=poll_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def run(
+        self,
+        exit_event: Event,  # input event exit
+        poll_interval: float = 1.0,  # seconds to re-check the exit event
+    ):
+        """evaluate the batches until the program exits"""
+        tracer = get_tracer()
+        self.logger.info(
+            f"{{'header': 'Batched inference starts!', "
+            f"'max_batch': {self.max_batch}, "
+            f"'max_wait': {self.max_wait}}}",
+            extra=self.dict_logger,
+        )
+        while not exit_event.is_set():
+            batch = self.gather(poll_interval)
+            if not batch:
+                continue
+            if self.learner is not None and self.learner.sync():
+                self.logger.info(
+                    f"{{'header': 'acting actor updated', "
+                    f"'version': {self.learner.acting_version}}}",
+                    extra=self.dict_logger,
+                )
+            states = np.stack([state for state, _, _ in batch])
+            streams = np.array([stream for _, stream, _ in batch])
+            t0 = tracer.start()
+            try:
+                actions = self.agent.actor_predict_batch(states, streams)
+            except Exception as exc:
+                self.logger.error(
+                    f"{{'header': 'Batched inference failed', "
+                    f"'batch size': {len(batch)}, "
+                    f"'exception': '{exc}'}}",
+                    extra=self.dict_logger,
+                )
+                for _, _, future in batch:
+                    future.set_exception(exc)
+                continue
+            tracer.stop("predict_batch", t0)
+            for (_, _, future), action in zip(batch, actions):
+                future.set_result(action)
+            self.batch_count += 1
+            self.request_count += len(batch)
+
+        while True:  # fail the requests left behind
+            try:
+                _, _, future = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            future.set_exception(RuntimeError(f"{self} exits"))
+        self.logger.info(
+            f"{{'header': 'Batched inference dies!', "
+            f"'batches': {self.batch_count}, "
+            f"'mean batch size': {self.request_count / max(self.batch_count, 1):.2f}}}",
+            extra=self.dict_logger,
+        )
+
+    def start(
+        self,
+        exit_event: Event,  # input event exit
+    ) -> Thread:
+        """start the inference thread"""
+        self.thread = Thread(
+            target=self.run,
+            args=(exit_event,),
+            name="batched_inference",
+            daemon=True,
+        )
+        self.thread.start()
+        return self.thread
+
+    def join(
+        self,
+        timeout: Optional[float] = None,  # timeout in seconds, None for no timeout
+    ):
+        """wait for the inference thread to finish the current batch and exit"""
+        if self.thread is not None:
+            self.thread.join(timeout)
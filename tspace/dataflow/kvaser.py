@@ -5,22 +5,27 @@ __all__ = ['Kvaser']
 
 # %% ../../nbs/06.dataflow.kvaser.ipynb 3
 import json
+import time
 from threading import Event, current_thread
 from typing import Optional, Tuple, cast
 from dataclasses import dataclass
+import numpy as np
 import pandas as pd
 
 # %% ../../nbs/06.dataflow.kvaser.ipynb 4
 from .consumer import Consumer  # type: ignore
 from .pipeline.queue import Pipeline  # type: ignore
 from .pipeline.deque import PipelineDQ  # type: ignore
+from .pipeline.ring import PipelineRing, RingPolicy  # type: ignore
 from .producer import Producer  # type: ignore
 from .vehicle_interface import VehicleInterface  # type: ignore
 
 # %% ../../nbs/06.dataflow.kvaser.ipynb 5
 from ..conn.tbox import TBoxCanException, kvaser_send_float_array
 from ..conn.udp import udp_context
-from ..data.core import MotionPower, RawType, KvaserType
+from ..data.core import RawType, KvaserType
+from ..data.records import motion_power_dtype, motion_power_to_frame
+from ..system.trace import get_tracer
 from ..config.messengers import CANMessenger, can_servers_by_name
 from ..config.vehicles import TruckInField
 
@@ -36,13 +41,27 @@ class Kvaser(VehicleInterface):
             truck object
         can_server: CANMessenger
             can server object
+        ring_size: int
+            number of observation windows in the ring. In lockstep a window stays valid for
+            ring_size - 1 further windows after it has been put into the output pipeline,
+            with `pipelined_flash` the cruncher may lag by the whole output pipeline,
+            so the frames are copied out of the ring
+        motion_power_ring: np.ndarray
+            preallocated ring of motion power records of shape (ring_size, observation_length),
+            the timestep field holds the UTC wall clock of each sample, read from the monotonic
+            clock shifted by the wall clock offset taken at the start of the window
     """
 
     truck: TruckInField
     can_server: CANMessenger = can_servers_by_name["can_udp_svc"]
+    ring_size: int = 2
+    motion_power_ring: Optional[np.ndarray] = None
 
     def __post_init__(self):
         super().__post_init__()
+        self.motion_power_ring = np.zeros(
+            (self.ring_size, self.truck.observation_length), dtype=motion_power_dtype
+        )
         self.logger.info("Kvaser initialized")
 
     def __str__(self):
@@ -70,13 +89,31 @@ class Kvaser(VehicleInterface):
             extra=self.dict_logger,
         )
 
+    def motion_power_frame(
+        self, slot: int  # index of the observation window in the ring
+    ) -> pd.DataFrame:  # motion power of the window, columns as in MotionPower
+        """
+        Get the motion power DataFrame of a full observation window in the ring.
+
+        In lockstep the frame is built on the ring slot without copying the records,
+        it stays valid until the slot is refilled `ring_size` windows later. With `pipelined_flash`
+        nothing bounds how far the cruncher falls behind, so the records are copied.
+        """
+
+        records = self.motion_power_ring[slot]
+        if self.pipelined_flash:
+            records = records.copy()
+        return motion_power_to_frame(records, self.truck.site.tz)
+
     def init_internal_pipelines(
         self,
     ) -> Tuple[
-        PipelineDQ[RawType], Pipeline[str]
+        PipelineRing[RawType], Pipeline[str]
     ]:  # Tuple[PipelineDQ[dict[str,Union[str,list[str]]]], Pipeline[str]]
         """initialize the internal pipelines for kvaser"""
-        raw_pipeline = PipelineDQ[RawType](maxlen=1)
+        raw_pipeline = PipelineRing[RawType](
+            maxlen=1, policy=RingPolicy.KEEP_LATEST
+        )  # bounded, the filter always takes the latest sample
         hmi_pipeline = Pipeline[str](maxsize=1)
         return raw_pipeline, hmi_pipeline
 
@@ -146,7 +183,7 @@ class Kvaser(VehicleInterface):
 
     def filter(
         self,
-        in_pipeline: PipelineDQ[RawType],  # input PipelineDQ[dict[str, str]],
+        in_pipeline: PipelineRing[RawType],  # input PipelineRing[dict[str, str]],
         out_pipeline: Pipeline[pd.DataFrame],  # output Pipeline[pd.DataFrame],
         start_event: Optional[Event],  # input event start
         stop_event: Optional[Event],  # input event stop
@@ -160,8 +197,11 @@ class Kvaser(VehicleInterface):
         thread = current_thread()
         thread.name = "kvaser_filter"
         logger_kvaser_out = self.logger.getChild("data_transform")
+        tracer = get_tracer()
         logger_kvaser_out.propagate = True
-        motion_power_t: list[MotionPower] = []
+        slot, step = 0, 0  # observation window in the ring and sample in the window
+        window_start = 0  # monotonic clock at the start of the window in ns
+        wall_clock_offset = 0  # wall clock minus monotonic clock in ns
         logger_kvaser_out.info(
             "{{'header': 'kvaser data transform thread start'}}", extra=self.dict_logger
         )
@@ -170,82 +210,70 @@ class Kvaser(VehicleInterface):
             #  always get data from the pipeline if available, forwarding outward depends on the HMI status
             try:
                 data: KvaserType = cast(
-                    KvaserType, in_pipeline.get_data()
-                )  # non-blocking, get the most recent data, cast is to sooth mypy
+                    KvaserType, in_pipeline.get_data(block=True, timeout=1.0)
+                )  # block until data arrive, get the most recent data, cast is to sooth mypy
 
             except IndexError:
-                continue  # empty deque
+                continue  # empty deque after timeout, check exit_event
 
             # logger_kvaser_out.info("{{'header': 'kvaser get data'}}", extra=self.dict_logger)
 
             if start_event.is_set():  # starts episode
                 try:
-                    timestep = pd.Timestamp.now(tz=self.truck.site.tz)
-                    velocity = float(data["velocity"])
-                    pedal = float(data["pedal"])
-                    brake = float(data["brake_pressure"])
-                    current = float(data["A"])
-                    voltage = float(data["V"])
-
-                    motion_power = MotionPower(
-                        timestep,
-                        velocity,
-                        pedal,
-                        brake,
-                        current,
-                        voltage,
-                    )
-                    # 3 +2 : im 5
-
-                    motion_power_t.append(
-                        motion_power
-                    )  # obs_reward [timestep, speed, pedal, brake, current, voltage]
-
-                    if len(motion_power_t) == self.truck.observation_length:
-                        df_motion_power = pd.DataFrame(
-                            motion_power_t,
-                            columns=[
-                                "timestep",
-                                "velocity",
-                                "thrust",
-                                "brake",
-                                "current",
-                                "voltage",
-                            ],
+                    if step == 0:
+                        window_start = time.monotonic_ns()
+                        wall_clock_offset = time.time_ns() - window_start
+                    self.motion_power_ring[slot, step] = (
+                        time.monotonic_ns() + wall_clock_offset,
+                        data["velocity"],
+                        data["pedal"],
+                        data["brake_pressure"],
+                        data["A"],
+                        data["V"],
+                    )  # obs_reward [speed, pedal, brake, current, voltage], 3 +2 : im 5
+                    step += 1
+
+                    if step == self.truck.observation_length:
+                        tracer.stop("capture", window_start)
+                        t0 = tracer.start()
+                        df_motion_power = self.stamp_table_versions(
+                            self.motion_power_frame(slot)
                         )
+                        tracer.stop("filter", t0)
                         # df_motion_power.set_index('timestamp', inplace=True)
-                        df_motion_power.columns.name = "qtuple"
 
                         out_pipeline.put_data(df_motion_power)
                         logger_kvaser_out.info(
-                            f"{{'header': 'convert one dataframe and wait.'}}",
-                            extra=self.dict_logger,
-                        )
-                        flash_event.wait()  # wait for cruncher to consume and flashing to finish
-                        flash_event.clear()  # clear the flash event here as the first waiter
-                        logger_kvaser_out.info(
-                            f"{{'header': 'wake up after flashing'}}",
+                            "{'header': 'convert one dataframe and wait.', 'raw_pipeline': %s}",
+                            in_pipeline.stats(),
                             extra=self.dict_logger,
                         )
-                        # for kvaser the parameter is configured for waiting,
-                        # maybe the event is not necessary, for cloud interface the flash event is necessary
-                        observe_queue_size = out_pipeline.qsize()
-                        if observe_queue_size != 0:
-                            raise ValueError(
-                                f"observe pipeline queue size: {observe_queue_size}, "
-                                f"must be zero, if cruncher has consumed"
+                        if not self.pipelined_flash:  # lockstep, capture after flashing
+                            flash_event.wait()  # wait for cruncher to consume and flashing to finish
+                            flash_event.clear()  # clear the flash event here as the first waiter
+                            logger_kvaser_out.info(
+                                "{'header': 'wake up after flashing'}",
+                                extra=self.dict_logger,
                             )
-                        motion_power_t = []
+                            # for kvaser the parameter is configured for waiting,
+                            # maybe the event is not necessary, for cloud interface the flash event is necessary
+                            observe_queue_size = out_pipeline.qsize()
+                            if observe_queue_size != 0:
+                                raise ValueError(
+                                    f"observe pipeline queue size: {observe_queue_size}, "
+                                    f"must be zero, if cruncher has consumed"
+                                )
+                        slot, step = (slot + 1) % self.ring_size, 0
                 except Exception as exc:
                     logger_kvaser_out.info(
-                        f"{{'header': 'kvaser get signal error',"
-                        f"'exception': '{exc}'}}",
+                        "{'header': 'kvaser get signal error', 'exception': '%s'}",
+                        exc,
                         # f"Valid episode, Reset data capturing to stop after 3 seconds!",
                         extra=self.dict_logger,
                     )
                     break
             elif interrupt_event.is_set() or stop_event.is_set():  # interrupt episode
-                motion_power_t = []  # clean up list of motion power states
+                step = 0  # clean up the motion power states of the window
 
         # exit the thread
         logger_kvaser_out.info(
@@ -0,0 +1,182 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/06.dataflow.learner.ipynb.
+
+# %% auto 0
+__all__ = ['Learner']
+
+# %% ../../nbs/06.dataflow.learner.ipynb 3
+import logging
+from dataclasses import dataclass
+from threading import Condition, Event, Thread
+from typing import Any, Optional
+
+# %% ../../nbs/06.dataflow.learner.ipynb 4
+from ..agent.dpg import DPG
+from ..system.trace import get_tracer
+
+# %% ../../nbs/06.dataflow.learner.ipynb 5
+@dataclass
+class Learner:
+    """
+    Learner trains the agent on the pool in a background thread, while the cruncher keeps inferring.
+
+    The training steps release the GIL in the Tensorflow/JAX kernels,
+    so that the truck does not wait for the training at the end of an episode.
+    The moving actor weights are published as a versioned snapshot `(version, weights)`,
+    which is swapped in by a single reference assignment without lock.
+    The acting actor of the agent picks up the latest snapshot by `sync` at the start of an episode.
+
+    Attributes:
+
+        - agent: abstract base class DPG, available DDPG, RDPG
+        - updates_per_episode: float, ratio of gradient updates to the collected episodes, free running if <= 0
+        - publish_interval: int, publish the actor weights every `publish_interval` updates
+        - fused_updates: int, maximal number of updates fused into one `agent.train_n` call
+        - logger: Logger
+        - dict_logger: logger format specs
+    """
+
+    agent: DPG
+    updates_per_episode: float = (
+        6.0  # ratio of updates to episodes, free running if <= 0
+    )
+    publish_interval: int = 1  # publish the actor weights every n updates
+    fused_updates: int = 1  # maximal number of updates in one train_n call
+    logger: Optional[logging.Logger] = None
+    dict_logger: Optional[dict] = None
+
+    def __post_init__(self):
+        """Set logger and the counters"""
+        self.logger = self.logger.getChild(self.__str__())
+        if self.publish_interval < 1:
+            raise ValueError(
+                f"publish_interval must be positive, got {self.publish_interval}"
+            )
+        if self.fused_updates < 1:
+            raise ValueError(
+                f"fused_updates must be positive, got {self.fused_updates}"
+            )
+        self.cond = Condition()
+        self.episode_count = 0  # episodes deposited into the pool
+        self.update_count = 0  # gradient updates done
+        self.losses: tuple = (0.0, 0.0)  # losses of the last update
+        self.snapshot: tuple[int, Any] = (0, None)  # published (version, weights)
+        self.acting_version = 0  # version loaded into the acting actor
+        self.thread: Optional[Thread] = None
+
+    def __str__(self):
+        return "learner"
+
+    def notify_episode(self):
+        """
+        Notify the learner that a complete episode has been deposited into the pool.
+
+        Each episode grants `updates_per_episode` more gradient updates.
+        """
+        with self.cond:
+            self.episode_count += 1
+            self.cond.notify()
+
+    def has_budget(self) -> bool:
+        """whether the ratio of updates to episodes allows another update"""
+        if self.episode_count == 0 or self.agent.buffer.pool.cnt == 0:
+            return False
+        if self.updates_per_episode <= 0:
+            return True
+        return self.update_count < self.updates_per_episode * self.episode_count
+
+    def budget(self) -> int:
+        """number of updates for the next train_n call, capped by `fused_updates`"""
+        if self.updates_per_episode <= 0:
+            return self.fused_updates
+        remaining = (
+            int(self.updates_per_episode * self.episode_count) - self.update_count
+        )
+        return max(1, min(self.fused_updates, remaining))
+
+    def publish(self):
+        """publish a snapshot of the moving actor weights with a new version"""
+        version, _ = self.snapshot
+        self.snapshot = (version + 1, self.agent.get_actor_weights())
+
+    def sync(self) -> bool:
+        """
+        Load the latest published snapshot into the acting actor, called by the acting thread.
+
+        return:
+            bool, True if a newer version has been loaded
+        """
+        version, weights = self.snapshot  # single read of the reference
+        if version <= self.acting_version:
+            return False
+        self.agent.set_acting_weights(weights)
+        self.acting_version = version
+        return True
+
+    def run(
+        self,
+        exit_event: Event,  # input event exit
+        poll_interval: float = 1.0,  # seconds to re-check the exit event and the pool
+    ):
+        """
+        Train the agent until the program exits, throttled by the ratio of updates to episodes.
+
+        The checkpoint is saved once after each newly deposited episode has been trained on.
+        """
+        saved_episode_count = 0
+        tracer = get_tracer()
+        self.logger.info("{'header': 'Learner starts!'}", extra=self.dict_logger)
+        while not exit_event.is_set():
+            with self.cond:
+                if not self.cond.wait_for(
+                    lambda: exit_event.is_set() or self.has_budget(), poll_interval
+                ):
+                    continue
+                episode_count = self.episode_count
+            if exit_event.is_set():
+                break
+
+            n = self.budget()
+            t0 = tracer.start()
+            self.losses = self.agent.train_n(n)
+            tracer.stop("train", t0)
+            self.update_count += n
+            if (
+                self.update_count // self.publish_interval
+                > (self.update_count - n) // self.publish_interval
+            ):  # crossed a publish interval
+                self.publish()
+
+            if episode_count > saved_episode_count:
+                self.agent.save_ckpt()
+                saved_episode_count = episode_count
+                self.logger.info(
+                    f"{{'header': 'Checkpoint saved', "
+                    f"'episodes': {episode_count}, "
+                    f"'updates': {self.update_count}, "
+                    f"'version': {self.snapshot[0]}}}",
+                    extra=self.dict_logger,
+                )
+        self.logger.info("{'header': 'Learner dies!'}", extra=self.dict_logger)
+
+    def start(
+        self,
+        exit_event: Event,  # input event exit
+    ) -> Thread:
+        """start the learner thread, a running learner shared by the crunchers of a fleet is not started again"""
+        if self.thread is not None and self.thread.is_alive():
+            return self.thread
+        self.thread = Thread(
+            target=self.run, args=(exit_event,), name="learner", daemon=True
+        )
+        self.thread.start()
+        return self.thread
+
+    def join(
+        self,
+        timeout: Optional[float] = None,  # timeout in seconds, None for no timeout
+    ):
+        """wait for the learner thread to finish the current update and exit"""
+        if self.thread is not None:
+            with self.cond:
+                self.cond.notify_all()
+            self.thread.join(timeout)
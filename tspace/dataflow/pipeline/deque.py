@@ -5,27 +5,48 @@ __all__ = ['T', 'PipelineDQ']
 
 # %% ../../../nbs/06.dataflow.pipeline.deque.ipynb 3
 from collections import deque
-from typing import TypeVar
+from threading import Condition, Lock
+from typing import Iterable, Optional, TypeVar
 
 # %% ../../../nbs/06.dataflow.pipeline.deque.ipynb 4
 T = TypeVar("T")  # Generic type
 
 # %% ../../../nbs/06.dataflow.pipeline.deque.ipynb 5
 class PipelineDQ(deque[T]):
-    """Pipeline with Deque for double-ended processing unit in dataflow"""
+    """Pipeline with Deque for double-ended processing unit in dataflow
 
-    def get_data(self) -> T:
+    A consumer can block on the pipeline until new data arrive instead of polling the deque.
+    """
+
+    def __init__(self, iterable: Iterable[T] = (), maxlen: Optional[int] = None):
+        super().__init__(iterable, maxlen)
+        self.mutex = Lock()
+        self.not_empty = Condition(self.mutex)
+
+    def get_data(
+        self,
+        block: bool = False,  # block until data arrive, or a wake-up
+        timeout: Optional[
+            float
+        ] = None,  # timeout in seconds for blocking, None for no timeout
+    ) -> T:
         """
-        Get data from the pipeline
+        Get the most recent data from the pipeline
 
         return:
             data: data from the pipeline
+
+        raise:
+            IndexError: if the pipeline is empty, after the timeout or a wake-up when blocking
         """
-        return self.pop()
+        with self.not_empty:
+            if block and not len(self):
+                self.not_empty.wait(timeout)
+            return self.pop()
 
     def put_data(self, value: T):
         """
-        Put data into the pipeline
+        Put data into the pipeline and wake up a waiting consumer
 
         arg:
 
@@ -36,7 +57,16 @@ class PipelineDQ(deque[T]):
             None
         """
 
-        self.append(value)
+        with self.not_empty:
+            self.append(value)
+            self.not_empty.notify()
+
+    def wake(self):
+        """
+        Wake up all the blocking consumers, e.g. on a state change
+        """
+        with self.not_empty:
+            self.not_empty.notify_all()
 
     def clear(self):
         """
@@ -44,4 +74,5 @@ class PipelineDQ(deque[T]):
 
         `collection.deque` has a clear method. Just call it.
         """
-        self.clear()
+        with self.not_empty:
+            super().clear()
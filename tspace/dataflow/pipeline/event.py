@@ -0,0 +1,96 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../../../nbs/06.dataflow.pipeline.event.ipynb.
+
+# %% auto 0
+__all__ = ['NotifyingEvent', 'wait_for_events']
+
+# %% ../../../nbs/06.dataflow.pipeline.event.ipynb 3
+import time
+from threading import Condition, Event, Lock
+from typing import Callable, Optional, Sequence
+
+# %% ../../../nbs/06.dataflow.pipeline.event.ipynb 4
+class NotifyingEvent(Event):
+    """Event notifying the subscribed conditions when set or cleared
+
+    A thread can thus block on a combination of several events with `wait_for_events`
+    instead of polling them in a loop.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._conditions: list[Condition] = []
+        self._conditions_lock = Lock()
+
+    def subscribe(self, condition: Condition):
+        """
+        Subscribe a condition to be notified on each set and clear
+
+        arg:
+
+            condition: condition to be notified
+        """
+        with self._conditions_lock:
+            self._conditions.append(condition)
+
+    def unsubscribe(self, condition: Condition):
+        """
+        Unsubscribe a condition
+
+        arg:
+
+            condition: condition subscribed before
+        """
+        with self._conditions_lock:
+            self._conditions.remove(condition)
+
+    def _notify(self):
+        with self._conditions_lock:
+            conditions = list(self._conditions)
+        for condition in conditions:
+            with condition:
+                condition.notify_all()
+
+    def set(self):
+        """set the event and notify the subscribed conditions"""
+        super().set()
+        self._notify()
+
+    def clear(self):
+        """clear the event and notify the subscribed conditions"""
+        super().clear()
+        self._notify()
+
+# %% ../../../nbs/06.dataflow.pipeline.event.ipynb 5
+def wait_for_events(
+    predicate: Callable[[], bool],  # condition on the states of the events
+    events: Sequence[Event],  # events the predicate depends on
+    timeout: Optional[float] = None,  # timeout in seconds, None for no timeout
+    poll_interval: float = 0.1,  # interval to check plain `Event`s without notification
+) -> bool:  # the last value of the predicate
+    """
+    Block until the predicate on the states of the events is true or the timeout expires.
+
+    The waiting thread is woken up by each set and clear of a `NotifyingEvent`,
+    plain `Event`s can't notify and are rechecked every `poll_interval` seconds.
+    """
+    condition = Condition()
+    notifying = [event for event in events if isinstance(event, NotifyingEvent)]
+    interval = None if len(notifying) == len(events) else poll_interval
+    for event in notifying:
+        event.subscribe(condition)
+    try:
+        with condition:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not (result := predicate()):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                if interval is not None:
+                    remaining = (
+                        interval if remaining is None else min(remaining, interval)
+                    )
+                condition.wait(remaining)
+            return result
+    finally:
+        for event in notifying:
+            event.unsubscribe(condition)
@@ -0,0 +1,139 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../../../nbs/06.dataflow.pipeline.ring.ipynb.
+
+# %% auto 0
+__all__ = ['T', 'RingPolicy', 'PipelineRing']
+
+# %% ../../../nbs/06.dataflow.pipeline.ring.ipynb 3
+from collections import deque
+from enum import Enum
+from threading import Condition
+from typing import Iterable, Optional, TypeVar
+
+# %% ../../../nbs/06.dataflow.pipeline.ring.ipynb 4
+from .deque import PipelineDQ
+
+# %% ../../../nbs/06.dataflow.pipeline.ring.ipynb 5
+T = TypeVar("T")  # Generic type
+
+# %% ../../../nbs/06.dataflow.pipeline.ring.ipynb 6
+class RingPolicy(str, Enum):
+    """Overflow policy of the `PipelineRing`"""
+
+    KEEP_LATEST = (
+        "keep_latest"  # consumer gets the newest data, the stale backlog is dropped
+    )
+    DROP_OLDEST = (
+        "drop_oldest"  # first in first out, the oldest data is dropped when full
+    )
+    BLOCK = "block"  # first in first out, the producer blocks when full
+
+# %% ../../../nbs/06.dataflow.pipeline.ring.ipynb 7
+class PipelineRing(PipelineDQ[T]):
+    """Bounded Pipeline with Deque, drop-in replacement of `PipelineDQ` as raw pipeline
+
+    The overflow behaviour is explicit by the `RingPolicy`, and the number of enqueued and dropped data
+    and the maximal depth are counted.
+    """
+
+    def __init__(
+        self,
+        iterable: Iterable[T] = (),
+        maxlen: Optional[int] = 1,  # capacity of the ring
+        policy: RingPolicy = RingPolicy.KEEP_LATEST,  # overflow policy
+    ):
+        if maxlen is None or maxlen < 1:
+            raise ValueError(f"PipelineRing must be bounded, maxlen: {maxlen}")
+        super().__init__((), maxlen)
+        self.policy = RingPolicy(policy)
+        self.not_full = Condition(self.mutex)
+        self.enqueued = 0
+        self.dropped = 0
+        self.max_depth = 0
+        for value in iterable:
+            self.put_data(value)
+
+    def get_data(
+        self,
+        block: bool = False,  # block until data arrive, or a wake-up
+        timeout: Optional[
+            float
+        ] = None,  # timeout in seconds for blocking, None for no timeout
+    ) -> T:
+        """
+        Get data from the pipeline, the newest for `KEEP_LATEST` and the oldest otherwise
+
+        return:
+            data: data from the pipeline
+
+        raise:
+            IndexError: if the pipeline is empty, after the timeout or a wake-up when blocking
+        """
+        with self.not_empty:
+            if block and not len(self):
+                self.not_empty.wait(timeout)
+            if self.policy is RingPolicy.KEEP_LATEST:
+                value = self.pop()
+                self.dropped += len(self)  # discard the stale backlog
+                deque.clear(self)
+            else:
+                value = self.popleft()
+            self.not_full.notify()
+            return value
+
+    def put_data(
+        self,
+        value: T,  # data to be put into the pipeline
+        timeout: Optional[
+            float
+        ] = None,  # timeout in seconds for the `BLOCK` policy, None for no timeout
+    ):
+        """
+        Put data into the pipeline and wake up a waiting consumer
+
+        With the `BLOCK` policy the producer waits for free space,
+        with the other policies the oldest data is dropped when full.
+
+        raise:
+            TimeoutError: if the ring is still full after the timeout with the `BLOCK` policy
+        """
+        with self.not_empty:
+            if len(self) == self.maxlen:
+                if self.policy is RingPolicy.BLOCK:
+                    if not self.not_full.wait_for(
+                        lambda: len(self) < self.maxlen, timeout  # type: ignore
+                    ):
+                        raise TimeoutError("PipelineRing is full")
+                else:
+                    self.dropped += 1  # the oldest is dropped by the bounded deque
+            self.append(value)
+            self.enqueued += 1
+            self.max_depth = max(self.max_depth, len(self))
+            self.not_empty.notify()
+
+    def clear(self):
+        """
+        clear the pipeline, the discarded data are counted as dropped
+        """
+        with self.not_empty:
+            self.dropped += len(self)
+            deque.clear(self)
+            self.not_full.notify_all()
+
+    def qsize(self) -> int:
+        """current depth of the ring"""
+        return len(self)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get the counters of the pipeline
+
+        return:
+            dict of enqueued, dropped, max_depth and current depth
+        """
+        with self.not_empty:
+            return {
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "max_depth": self.max_depth,
+                "depth": len(self),
+            }
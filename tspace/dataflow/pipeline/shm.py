@@ -0,0 +1,225 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../../../nbs/06.dataflow.pipeline.shm.ipynb.
+
+# %% auto 0
+__all__ = ['T', 'PipelineShm', 'MotionPowerPipelineShm', 'TorqueTablePipelineShm']
+
+# %% ../../../nbs/06.dataflow.pipeline.shm.ipynb 3
+import abc
+import multiprocessing as mp
+import os
+import queue
+from multiprocessing import shared_memory
+from multiprocessing.context import BaseContext
+from typing import Generic, Optional, Sequence, TypeVar
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+# %% ../../../nbs/06.dataflow.pipeline.shm.ipynb 4
+from tspace.data.records import (
+    motion_power_dtype,
+    motion_power_from_frame,
+    motion_power_to_frame,
+)
+
+# %% ../../../nbs/06.dataflow.pipeline.shm.ipynb 5
+T = TypeVar("T")  # Generic type
+
+# %% ../../../nbs/06.dataflow.pipeline.shm.ipynb 6
+class PipelineShm(Generic[T], metaclass=abc.ABCMeta):
+    """Pipeline over a ring of fixed-size slots in shared memory
+
+    Each item is encoded into a slot of at most `slot_length` records of `slot_dtype`,
+    only the slot index and the lengths cross the process boundary via a shared array under a
+    `multiprocessing.Condition`. The interface follows `Pipeline` (queue.Queue),
+    `put` blocks when all `maxsize` slots are taken, `get` raises `queue.Empty` on timeout.
+    """
+
+    def __init__(
+        self,
+        slot_dtype: np.dtype,  # dtype of the records in a slot
+        slot_length: int,  # maximal number of records in a slot
+        maxsize: int = 3,  # number of slots
+        ctx: Optional[
+            BaseContext
+        ] = None,  # multiprocessing context, default context if None
+    ):
+        if maxsize < 1 or slot_length < 1:
+            raise ValueError(
+                f"maxsize {maxsize} and slot_length {slot_length} must be positive"
+            )
+        ctx = mp.get_context() if ctx is None else ctx
+        self.slot_dtype = np.dtype(slot_dtype)
+        self.slot_length = slot_length
+        self.maxsize = maxsize
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=maxsize * slot_length * self.slot_dtype.itemsize
+        )
+        self._state = ctx.Array(
+            "q", 2 + maxsize, lock=False
+        )  # head, count, record number of each slot
+        self._cond = ctx.Condition()
+        self._owner_pid = os.getpid()
+        self._slots: Optional[np.ndarray] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_slots"] = None  # the view is recreated in the other process
+        return state
+
+    @property
+    def slots(self) -> np.ndarray:
+        """view of the slots in the shared memory, shape [maxsize, slot_length]"""
+        if self._slots is None:
+            self._slots = np.ndarray(
+                (self.maxsize, self.slot_length),
+                dtype=self.slot_dtype,
+                buffer=self._shm.buf,
+            )
+        return self._slots
+
+    @abc.abstractmethod
+    def encode(self, value: T) -> np.ndarray:
+        """encode an item to an 1D array of `slot_dtype`"""
+        pass
+
+    @abc.abstractmethod
+    def decode(self, records: np.ndarray) -> T:
+        """decode an item from an 1D array of `slot_dtype`"""
+        pass
+
+    def put(self, value: T, block: bool = True, timeout: Optional[float] = None):
+        """
+        Put an item into a free slot
+
+        raise:
+            queue.Full: if no slot is free after the timeout or without blocking
+        """
+        records = self.encode(value)
+        if len(records) > self.slot_length:
+            raise ValueError(
+                f"item of {len(records)} records exceeds slot length {self.slot_length}"
+            )
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._state[1] < self.maxsize, timeout if block else 0
+            ):
+                raise queue.Full
+            slot = (self._state[0] + self._state[1]) % self.maxsize
+            self.slots[slot, : len(records)] = records
+            self._state[2 + slot] = len(records)
+            self._state[1] += 1
+            self._cond.notify_all()
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> T:
+        """
+        Get the oldest item and free its slot
+
+        raise:
+            queue.Empty: if no item arrives before the timeout or without blocking
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._state[1] > 0, timeout if block else 0
+            ):
+                raise queue.Empty
+            slot = self._state[0]
+            records = self.slots[slot, : self._state[2 + slot]].copy()
+            self._state[0] = (slot + 1) % self.maxsize
+            self._state[1] -= 1
+            self._cond.notify_all()
+        return self.decode(records)
+
+    def put_data(self, value: T):
+        """Put data into the pipeline, blocking when full"""
+        self.put(value)
+
+    def get_data(self) -> T:
+        """Get data from the pipeline, blocking when empty"""
+        return self.get()
+
+    def qsize(self) -> int:
+        """number of items in the pipeline"""
+        with self._cond:
+            return self._state[1]
+
+    def empty(self) -> bool:
+        """whether the pipeline is empty"""
+        return self.qsize() == 0
+
+    def clear(self):
+        """clear the pipeline, free all the slots"""
+        with self._cond:
+            self._state[0] = 0
+            self._state[1] = 0
+            self._cond.notify_all()
+
+    def close(self):
+        """close the shared memory in this process, the creating process also unlinks it"""
+        self._slots = None
+        self._shm.close()
+        if os.getpid() == self._owner_pid:
+            self._shm.unlink()
+
+# %% ../../../nbs/06.dataflow.pipeline.shm.ipynb 7
+class MotionPowerPipelineShm(PipelineShm[pd.DataFrame]):
+    """Shared memory pipeline of motion power frames, one observation window per slot"""
+
+    def __init__(
+        self,
+        observation_length: int,  # number of samples in an observation window
+        tz: ZoneInfo,  # timezone of the timestep column after decoding
+        maxsize: int = 3,  # number of slots
+        ctx: Optional[BaseContext] = None,  # multiprocessing context
+    ):
+        super().__init__(motion_power_dtype, observation_length, maxsize, ctx)
+        self.tz = tz
+
+    def encode(self, value: pd.DataFrame) -> np.ndarray:
+        """encode the motion power DataFrame to records"""
+        return motion_power_from_frame(value)
+
+    def decode(self, records: np.ndarray) -> pd.DataFrame:
+        """decode the records to the motion power DataFrame"""
+        return motion_power_to_frame(records, self.tz)
+
+# %% ../../../nbs/06.dataflow.pipeline.shm.ipynb 8
+class TorqueTablePipelineShm(PipelineShm[pd.DataFrame]):
+    """Shared memory pipeline of torque tables to be flashed, one table row per record"""
+
+    def __init__(
+        self,
+        row_number: int,  # maximal number of rows of a table, i.e. torque_table_row_num_flash
+        pedal_scale: Sequence[float],  # throttle columns of the table
+        maxsize: int = 3,  # number of slots
+        ctx: Optional[BaseContext] = None,  # multiprocessing context
+    ):
+        super().__init__(
+            np.dtype(
+                [("speed", np.float64), ("torque", np.float64, (len(pedal_scale),))]
+            ),
+            row_number,
+            maxsize,
+            ctx,
+        )
+        self.columns = pd.Index(pedal_scale, name="throttle")
+
+    def encode(self, value: pd.DataFrame) -> np.ndarray:
+        """encode the torque table with speed index to records"""
+        if value.shape[1] != len(self.columns):
+            raise ValueError(
+                f"torque table has {value.shape[1]} columns, expected {len(self.columns)}"
+            )
+        records = np.empty(len(value), dtype=self.slot_dtype)
+        records["speed"] = value.index.to_numpy(np.float64)
+        records["torque"] = value.to_numpy(np.float64)
+        return records
+
+    def decode(self, records: np.ndarray) -> pd.DataFrame:
+        """decode the records to the torque table with speed index and throttle columns"""
+        return pd.DataFrame(
+            records["torque"],
+            index=pd.Index(records["speed"], name="speed"),
+            columns=self.columns,
+        )
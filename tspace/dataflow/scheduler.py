@@ -0,0 +1,242 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/06.dataflow.scheduler.ipynb.
+
+# %% auto 0
+__all__ = ['Timer', 'Backoff', 'Scheduler']
+
+# %% ../../nbs/06.dataflow.scheduler.ipynb 3
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from threading import Condition, Thread, current_thread
+from typing import Any, Callable, Optional
+
+# %% ../../nbs/06.dataflow.scheduler.ipynb 4
+@dataclass(order=True)
+class Timer:
+    """
+    Timer handle of the scheduler, ordered by its deadline on the monotonic clock.
+
+    Attributes:
+
+        - deadline: float, monotonic time in seconds when the callback fires
+        - seq: int, scheduling sequence number, tie breaker for equal deadlines
+        - callback: Callable, called in the scheduler thread with `args`
+        - args: tuple, positional arguments of the callback
+        - interval: Optional[float], period in seconds for a periodic timer, None for a one-shot timer
+        - name: str, name of the timer for logging
+        - cancelled: bool, a cancelled timer is dropped lazily when it reaches the top of the heap
+    """
+
+    deadline: float
+    seq: int
+    callback: Callable = field(compare=False)
+    args: tuple = field(default=(), compare=False)
+    interval: Optional[float] = field(default=None, compare=False)
+    name: str = field(default="", compare=False)
+    cancelled: bool = field(default=False, compare=False)
+    fired: bool = field(default=False, compare=False)
+
+    def cancel(self):
+        """cancel the timer, no-op if it has already fired"""
+        self.cancelled = True
+
+    @property
+    def active(self) -> bool:
+        """whether the timer will still fire"""
+        return not self.cancelled and (self.interval is not None or not self.fired)
+
+# %% ../../nbs/06.dataflow.scheduler.ipynb 5
+@dataclass
+class Backoff:
+    """
+    Exponential backoff of the retries, capped and without jitter for deterministic timing.
+
+    Attributes:
+
+        - base: float, delay of the first retry in seconds
+        - factor: float, growth factor of the delay per failed attempt
+        - cap: float, upper bound of the delay in seconds
+        - attempt: int, number of consecutive failed attempts
+    """
+
+    base: float = 0.5  # delay of the first retry in seconds
+    factor: float = 2.0  # growth factor per failed attempt
+    cap: float = 30.0  # upper bound of the delay in seconds
+    attempt: int = 0  # consecutive failed attempts
+
+    def next(self) -> float:
+        """count a failed attempt and return the delay before the next retry"""
+        delay = min(self.cap, self.base * self.factor**self.attempt)
+        self.attempt += 1
+        return delay
+
+    def reset(self):
+        """reset after a successful attempt"""
+        self.attempt = 0
+
+# %% ../../nbs/06.dataflow.scheduler.ipynb 6
+@dataclass
+class Scheduler:
+    """
+    Scheduler runs the timers of the dataflow in a single thread, a heap ordered by the deadlines.
+
+    Instead of a dedicated sleeping worker per countdown or watchdog,
+    all timers share one thread that waits exactly until the earliest deadline.
+    Timers can be cancelled at any time and `stop` returns promptly,
+    dropping all pending timers.
+    Callbacks run in the scheduler thread and should be short,
+    exceptions are logged and do not kill the scheduler.
+
+    Attributes:
+
+        - name: str, name of the scheduler thread
+        - logger: Logger
+        - dict_logger: logger format specs
+    """
+
+    name: str = "scheduler"
+    logger: Optional[logging.Logger] = None
+    dict_logger: Optional[dict] = None
+
+    def __post_init__(self):
+        """Set logger and the empty heap"""
+        if self.logger is None:
+            self.logger = logging.getLogger("eos")
+        self.logger = self.logger.getChild(self.name)
+        self.cond = Condition()
+        self.heap: list[Timer] = []
+        self.seq = itertools.count()
+        self.running = False
+        self.thread: Optional[Thread] = None
+
+    def __str__(self):
+        return self.name
+
+    def schedule(
+        self,
+        delay: float,  # seconds until the first call
+        callback: Callable,  # called in the scheduler thread
+        *args: Any,  # positional arguments of the callback
+        interval: Optional[float] = None,  # period in seconds, None for one-shot
+        name: str = "",  # name of the timer for logging
+    ) -> Timer:
+        """
+        Schedule a timer.
+
+        return:
+            Timer, handle to cancel the timer
+        raise:
+            ValueError, if the interval is not positive
+        """
+        if interval is not None and interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        with self.cond:
+            timer = Timer(
+                deadline=time.monotonic() + max(delay, 0.0),
+                seq=next(self.seq),
+                callback=callback,
+                args=args,
+                interval=interval,
+                name=name or getattr(callback, "__name__", "timer"),
+            )
+            heapq.heappush(self.heap, timer)
+            if self.heap[0] is timer:  # earlier than the current wait, wake up
+                self.cond.notify()
+        return timer
+
+    def call_later(
+        self,
+        delay: float,  # seconds until the call
+        callback: Callable,  # called in the scheduler thread
+        *args: Any,  # positional arguments of the callback
+        name: str = "",  # name of the timer for logging
+    ) -> Timer:
+        """schedule a one-shot timer"""
+        return self.schedule(delay, callback, *args, name=name)
+
+    def call_every(
+        self,
+        interval: float,  # period in seconds, also the delay of the first call
+        callback: Callable,  # called in the scheduler thread
+        *args: Any,  # positional arguments of the callback
+        name: str = "",  # name of the timer for logging
+    ) -> Timer:
+        """schedule a periodic timer at a fixed rate, missed periods are skipped"""
+        return self.schedule(interval, callback, *args, interval=interval, name=name)
+
+    @property
+    def pending(self) -> int:
+        """number of timers that will still fire"""
+        with self.cond:
+            return sum(timer.active for timer in self.heap)
+
+    def pop_due(self) -> list[Timer]:
+        """wait until the earliest deadline and pop the due timers, called with the lock held"""
+        while self.running:
+            while self.heap and self.heap[0].cancelled:
+                heapq.heappop(self.heap)
+            if not self.heap:
+                self.cond.wait()
+                continue
+            now = time.monotonic()
+            if self.heap[0].deadline > now:
+                self.cond.wait(self.heap[0].deadline - now)
+                continue
+            due = []
+            while self.heap and self.heap[0].deadline <= now:
+                timer = heapq.heappop(self.heap)
+                if timer.cancelled:
+                    continue
+                if timer.interval is not None:  # fixed rate, skip the missed periods
+                    periods = (now - timer.deadline) // timer.interval + 1
+                    timer.deadline += periods * timer.interval
+                    heapq.heappush(self.heap, timer)
+                else:
+                    timer.fired = True
+                due.append(timer)
+            return due
+        return []
+
+    def run(self):
+        """main loop of the scheduler thread"""
+        self.logger.info("{'header': 'Scheduler starts!'}", extra=self.dict_logger)
+        while self.running:
+            with self.cond:
+                due = self.pop_due()
+            for timer in due:
+                if timer.cancelled:  # cancelled by an earlier callback of the same tick
+                    continue
+                try:
+                    timer.callback(*timer.args)
+                except Exception as exc:
+                    self.logger.error(
+                        f"{{'header': 'Timer callback failed', "
+                        f"'timer': '{timer.name}', "
+                        f"'exception': '{exc}'}}",
+                        extra=self.dict_logger,
+                    )
+        self.logger.info("{'header': 'Scheduler dies!'}", extra=self.dict_logger)
+
+    def start(self) -> Thread:
+        """start the scheduler thread"""
+        with self.cond:
+            self.running = True
+        self.thread = Thread(target=self.run, name=self.name, daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def stop(
+        self,
+        timeout: Optional[float] = None,  # timeout in seconds, None for no timeout
+    ):
+        """cancel all pending timers and wait for the scheduler thread to exit"""
+        with self.cond:
+            self.running = False
+            for timer in self.heap:
+                timer.cancel()
+            self.heap.clear()
+            self.cond.notify_all()
+        if self.thread is not None and self.thread is not current_thread():
+            self.thread.join(timeout)
@@ -6,11 +6,11 @@ __all__ = ['repo', 'VehicleInterface']
 # %% ../../nbs/06.dataflow.vehicle_interface.ipynb 3
 import abc
 import concurrent.futures
+from collections import deque
 import logging
 import os
 import git
 import queue
-import time
 from pathlib import Path
 from threading import Event, current_thread, Lock
 from typing import Optional, Tuple
@@ -22,8 +22,11 @@ import pandas as pd
 from .consumer import Consumer  # type: ignore
 from .filter.hetero import HeteroFilter  # type: ignore
 from .pipeline.queue import Pipeline  # type: ignore
+from .pipeline.event import wait_for_events  # type: ignore
 from .pipeline.deque import PipelineDQ  # type: ignore
 from .producer import Producer  # type: ignore
+from .scheduler import Scheduler, Timer
+from ..system.trace import get_tracer
 
 # %% ../../nbs/06.dataflow.vehicle_interface.ipynb 5
 from ..config.vehicles import Truck
@@ -55,12 +58,16 @@ class VehicleInterface(
         can_server: `CANMessenger` object
         resume: resume from last table
         data_dir: data directory
-        flash_count: flash count
+        flash_count: flash count, i.e. the version of the live torque table
+        pipelined_flash: capture the next observation window while the current table is flashed
+        table_history: activation time and version of the recently flashed tables
         episode_count: episode count
         vcu_calib_table_row_start: vcu calibration table row start
         torque_table_default: default torque table
         torque_table_live: live torque table
         epi_countdown_time: episode countdown time
+        scheduler: timer wheel owning the episode countdown and the watchdog windows, created by `ignite`
+        countdown_timer: pending episode countdown
         lock_watchdog: lock for the following two watchdog variables
         capture_failure_count: count of caputure failure
         flash_failure_count: count of flash failure
@@ -74,11 +81,15 @@ class VehicleInterface(
     resume: bool = False
     data_dir: Optional[Path] = None
     flash_count: int = 0
+    pipelined_flash: bool = False
+    table_history: Optional[deque] = None
     episode_count: int = 0
     vcu_calib_table_row_start: int = 0
     torque_table_default: Optional[pd.DataFrame] = None
     torque_table_live: Optional[pd.DataFrame] = None
     epi_countdown_time: float = 3.0
+    scheduler: Optional[Scheduler] = None
+    countdown_timer: Optional[Timer] = None
     lock_watchdog: Lock = Lock()
     capture_failure_count: int = 0
     flash_failure_count: int = 0
@@ -91,6 +102,9 @@ class VehicleInterface(
 
         if self.data_dir is None:
             self.data_dir = Path(".")
+        self.table_history = deque(
+            [(pd.Timestamp(0, tz=self.truck.site.tz), self.flash_count)], maxlen=16
+        )  # (activation time, version), appended by the flash thread only
         self.init_vehicle()
 
         # super().__post_init__()
@@ -140,6 +154,37 @@ class VehicleInterface(
         """Abstract method to flash the vehicle. Implemented by the concrete class `Kvaser` and `Cloud`."""
         pass
 
+    def table_version_at(
+        self, ts: pd.Timestamp  # timezone aware time of an observation
+    ) -> Tuple[int, pd.Timestamp]:  # version of the table and its activation time
+        """Get the version of the torque table active at the given time"""
+        history = list(self.table_history)  # snapshot, the flash thread keeps appending
+        for activated, version in reversed(history):
+            if activated <= ts:
+                return version, activated
+        return history[0][1], history[0][0]
+
+    def stamp_table_versions(
+        self, motion_power: pd.DataFrame  # motion power of an observation window
+    ) -> pd.DataFrame:  # the same DataFrame with the table versions in `attrs`
+        """
+        Record in `motion_power.attrs` which torque table was active during the observation window.
+
+        - table_version_start: version of the table active at the first timestep
+        - table_version_end: version of the table active at the last timestep
+        - table_active_since: activation time of the table at the first timestep
+
+        With pipelined flash, a window with different start and end versions was captured while flashing.
+        """
+        version_start, active_since = self.table_version_at(
+            motion_power["timestep"].iloc[0]
+        )
+        version_end, _ = self.table_version_at(motion_power["timestep"].iloc[-1])
+        motion_power.attrs["table_version_start"] = version_start
+        motion_power.attrs["table_version_end"] = version_end
+        motion_power.attrs["table_active_since"] = active_since
+        return motion_power
+
     def hmi_control(
         self,
         hmi_pipeline: Pipeline[str],  # input HMI pipeline
@@ -147,7 +192,7 @@ class VehicleInterface(
         start_event: Event,  # input event start
         stop_event: Event,  # input event stop
         interrupt_event: Event,  # input event interrupt
-        countdown_event: Event,  # input event countdown
+        scheduler: Scheduler,  # timer wheel for the episode countdown
         exit_event: Event,  # input event exit
         flash_event: Event,  # input event flash
     ) -> None:
@@ -190,8 +235,16 @@ class VehicleInterface(
                 )
 
             elif status == "end_valid":
-                # set flag for countdown thread
-                countdown_event.set()
+                # start the countdown, a repeated end signal does not restart it
+                if self.countdown_timer is None or not self.countdown_timer.active:
+                    self.countdown_timer = scheduler.call_later(
+                        self.epi_countdown_time,
+                        self.countdown,
+                        observe_pipeline,
+                        start_event,
+                        stop_event,
+                        name="countdown",
+                    )
 
                 logger_hmi_control.info(
                     f"{{'header': 'Episode end starts countdown!'}}"
@@ -208,13 +261,13 @@ class VehicleInterface(
                 self.episode_count += 1  # invalid round increments
             elif status == "exit":
                 start_event.clear()
-                countdown_event.set()  # cancel countdown, let countdown thread exit
+                if self.countdown_timer is not None:
+                    self.countdown_timer.cancel()  # cancel the pending countdown
 
                 observe_pipeline.clear()
                 self.episode_count += 1
                 interrupt_event.set()
                 flash_event.set()  # set the flash event here for cruncher and kvaser/cloud filter thread
-                countdown_event.set()  # cancel countdown, let countdown thread exit
                 if not exit_event.is_set():
                     exit_event.set()
                 break  # exit hmi control thread
@@ -274,6 +327,9 @@ class VehicleInterface(
             - guide observation data into the output pipeline
             - start/stop/interrupt/countdown/exit event to control the state machine
         main entry to the capture thread
+
+        The episode countdown and the watchdog windows are timers of a single scheduler thread
+        instead of sleeping workers of the pool, they are cancelled as soon as the pool exits.
         """
 
         thread = current_thread()
@@ -281,14 +337,23 @@ class VehicleInterface(
         # internal pipelines, raw_pipelines are different for kvaser and cloud interface
         raw_pipeline, hmi_pipeline = self.init_internal_pipelines()
 
-        # internal event
-        countdown_event = Event()
+        # timer wheel for the countdown and the watchdog
+        self.scheduler = Scheduler(logger=self.logger, dict_logger=self.dict_logger)
+        self.scheduler.start()
+        self.scheduler.call_every(
+            watchdog_nap_time,  # watch dog will kick in every t seconds and send out exit signal if necessary.
+            self.watch_dog,
+            exit_event,
+            watchdog_capture_error_upper_bound,
+            watchdog_flash_error_upper_bound,
+            name="watch_dog",
+        )
         self.logger.info(
             f"{{'header': 'ignite Thread Pool starts!'}}", extra=self.dict_logger
         )
 
         with concurrent.futures.ThreadPoolExecutor(
-            max_workers=6, thread_name_prefix="Vehicle_Interface"
+            max_workers=4, thread_name_prefix="Vehicle_Interface"
         ) as executor:
             executor.submit(
                 self.produce,
@@ -304,20 +369,11 @@ class VehicleInterface(
                 start_event,
                 stop_event,
                 interrupt_event,
-                countdown_event,
+                self.scheduler,
                 exit_event,
                 flash_event,
             )
 
-            executor.submit(
-                self.countdown,  # countdown thread
-                observe_pipeline,
-                start_event,
-                countdown_event,
-                stop_event,
-                exit_event,
-            )
-
             executor.submit(
                 self.filter,
                 raw_pipeline,
@@ -338,15 +394,7 @@ class VehicleInterface(
                 exit_event,
                 flash_event,
             )
-
-            executor.submit(
-                self.watch_dog,  # observe thread (spawns 4 threads for input, HMI and output)
-                countdown_event=countdown_event,
-                exit_event=exit_event,
-                watchdog_nap_time=watchdog_nap_time,  # watch dog will kick in after t seconds and send out exit signal.
-                watchdog_capture_error_upper_bound=watchdog_capture_error_upper_bound,
-                watchdog_flash_error_upper_bound=watchdog_flash_error_upper_bound,
-            )
+        self.scheduler.stop()  # drop the pending countdown and watchdog timers
         # exit the thread
         self.logger.info(
             f"{{'header': 'ignite Thread Pool dies!'}}", extra=self.dict_logger
@@ -373,110 +421,68 @@ class VehicleInterface(
         self,
         observe_pipeline: Pipeline[pd.DataFrame],  # output pipeline
         start_event: Event,  # output event
-        countdown_event: Event,  # input event
         stop_event: Event,  # output event
-        exit_event: Event,  # input event
     ):
-        """countdown callback for the countdown thread"""
-        thread = current_thread()
-        thread.name = "countdown"
+        """countdown callback, fired by the scheduler `epi_countdown_time` seconds after a valid episode end"""
         logger_countdown = self.logger.getChild("countdown")
         logger_countdown.propagate = True
         logger_countdown.info(
-            f"{{'header': 'countdown thread start!'}}", extra=self.dict_logger
+            f"{{'header': 'finish countdown'}}", extra=self.dict_logger
         )
 
-        while not exit_event.is_set():
-            logger_countdown.info(
-                f"{{'header': 'wait for countdown'}}", extra=self.dict_logger
-            )
-            countdown_event.wait()
-            if exit_event.is_set():
-                continue
+        start_event.clear()
+        stop_event.set()  # set valid stop signal only after countdown
+        observe_pipeline.clear()
+        self.episode_count += 1  # valid round increments
 
-            # if episode done is triggered, sleep for the extension time
-            time.sleep(self.epi_countdown_time)
-            # cancel wait as soon as waking up
-            logger_countdown.info(
-                f"{{'header': 'finish countdown'}}", extra=self.dict_logger
-            )
-
-            start_event.clear()
-            stop_event.set()  # set valid stop signal only after countdown
-            observe_pipeline.clear()
-            self.episode_count += 1  # valid round increments
-
-            logger_countdown.info(
-                f"{{'header': 'Episode done! free remote_flash and remote_get!'}}",
-                extra=self.dict_logger,
-            )
-            countdown_event.clear()
-            # raise Exception("reset capture to stop")
-
-        # exit countdown thread
         logger_countdown.info(
-            f"{{'header': 'Coutndown dies!!!'}}", extra=self.dict_logger
+            f"{{'header': 'Episode done! free remote_flash and remote_get!'}}",
+            extra=self.dict_logger,
         )
 
     def watch_dog(
         self,
-        countdown_event: Event,  # watch dog need to send trigger signal to end count down thread
-        exit_event: Event,  # input event
-        watchdog_nap_time: float,  # nap time for watch dog
+        exit_event: Event,  # output event
         watchdog_capture_error_upper_bound: int,  # upperbound for capture failure
         watchdog_flash_error_upper_bound: int,  # upperbound for flash failure
     ):
-        """watch dog callback for the watch dog thread"""
-        thread = current_thread()
-        thread.name = "watch_dog"
+        """watch dog callback, fired by the scheduler at the end of each watch dog window"""
+        if exit_event.is_set():  # already exiting, the scheduler stops with the pool
+            return
         logger_wdog = self.logger.getChild("watch_dog")
         logger_wdog.propagate = True
         logger_wdog.info(
-            f"{{'header': 'watch dog thread start!'}}", extra=self.dict_logger
+            f"{{'header': 'Watch dog time out！'}}", extra=self.dict_logger
         )
-
-        while not exit_event.is_set():
-            logger_wdog.info(
-                f"{{'header': 'wait for watch dog timeout'}}", extra=self.dict_logger
+        with self.lock_watchdog:
+            capture_failure_count = self.capture_failure_count
+            flash_failure_count = self.flash_failure_count
+        if (
+            capture_failure_count >= watchdog_capture_error_upper_bound
+            or flash_failure_count >= watchdog_flash_error_upper_bound
+        ):
+            exit_event.set()
+            if self.countdown_timer is not None:
+                self.countdown_timer.cancel()
+
+            logger_wdog.warning(
+                f"{{'header': 'watch dog kicks in!', "
+                f"'capture failure count': '{self.capture_failure_count}', "
+                f"'flash failure count': '{self.flash_failure_count}', "
+                f"'tail': 'system exit!'}}",
+                extra=self.dict_logger,
             )
-
-            # if episode done is triggered, sleep for the extension time
-            time.sleep(watchdog_nap_time)
-            # cancel wait as soon as waking up
+        else:
             logger_wdog.info(
-                f"{{'header': 'Watch dog time out！'}}", extra=self.dict_logger
+                f"{{'header': 'watch dog kicks in!', "
+                f"'capture failure count': '{self.capture_failure_count}', "
+                f"'flash failure count': '{self.flash_failure_count}', "
+                f"'tail': 'system ok!'}}",
+                extra=self.dict_logger,
             )
             with self.lock_watchdog:
-                capture_failure_count = self.capture_failure_count
-                flash_failure_count = self.flash_failure_count
-            if (
-                capture_failure_count >= watchdog_capture_error_upper_bound
-                or flash_failure_count >= watchdog_flash_error_upper_bound
-            ):
-                exit_event.set()  # set valid stop signal only after countdown
-                countdown_event.set()
-
-                logger_wdog.warning(
-                    f"{{'header': 'watch dog kicks in!', "
-                    f"'capture failure count': '{self.capture_failure_count}', "
-                    f"'flash failure count': '{self.flash_failure_count}', "
-                    f"'tail': 'system exit!'}}",
-                    extra=self.dict_logger,
-                )
-            else:
-                logger_wdog.info(
-                    f"{{'header': 'watch dog kicks in!', "
-                    f"'capture failure count': '{self.capture_failure_count}', "
-                    f"'flash failure count': '{self.flash_failure_count}', "
-                    f"'tail': 'system ok!'}}",
-                    extra=self.dict_logger,
-                )
-                with self.lock_watchdog:
-                    self.capture_failure_count = 0
-                    self.flash_failure_count = 0
-
-        # exit countdown thread
-        logger_wdog.info(f"{{'header': 'watch dog dies!!!'}}", extra=self.dict_logger)
+                self.capture_failure_count = 0
+                self.flash_failure_count = 0
 
     def consume(
         self,
@@ -498,6 +504,7 @@ class VehicleInterface(
         flash_count = 0
 
         logger_flash = self.logger.getChild("flash")
+        tracer = get_tracer()
         logger_flash.propagate = True
 
         logger_flash.info(
@@ -506,10 +513,17 @@ class VehicleInterface(
 
         while not exit_event.is_set():
             if (
-                not start_event.is_set()
-                or interrupt_event.is_set()
-                or stop_event.is_set()
-            ):
+                not wait_for_events(
+                    lambda: exit_event.is_set()
+                    or (
+                        start_event.is_set()
+                        and not interrupt_event.is_set()
+                        and not stop_event.is_set()
+                    ),
+                    [start_event, interrupt_event, stop_event, exit_event],
+                )
+                or exit_event.is_set()
+            ):  # block until an episode starts or program exits
                 continue
             try:
                 logger_flash.info(
@@ -559,7 +573,8 @@ class VehicleInterface(
                 )
 
                 try:  # flash the vehicle
-                    self.flash_vehicle(self.torque_table_live)
+                    with tracer.span("flash"):
+                        self.flash_vehicle(self.torque_table_live)
                 except TBoxCanException as exc:
                     flash_event.set()  # set the flash event here for cruncher and kvaser/cloud filter thread
                     if exc.err_code == 4:  # xcp time out
@@ -587,6 +602,10 @@ class VehicleInterface(
                 flash_event.set()  # set the flash event here for cruncher and kvaser/cloud filter thread
 
                 flash_count += 1
+                self.flash_count += 1
+                self.table_history.append(
+                    (pd.Timestamp.now(self.truck.site.tz), self.flash_count)
+                )
                 logger_flash.info(
                     f"{{'header': 'flash ends', 'count': {flash_count} }}",
                     extra=self.dict_logger,
@@ -622,6 +641,7 @@ class VehicleInterface(
         with open(last_table_store_path, "wb"):
             self.torque_table_live.to_csv(last_table_store_path)
 
+        tracer.flush()  # spans of the vehicle interface, also in a separate process
         logger_flash.info(
             f"{{'header': 'flash thread dies!!!!'}}", extra=self.dict_logger
         )
@@ -4,13 +4,13 @@
 from __future__ import annotations
 import abc
 import weakref
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import ClassVar, Generic, Optional, Tuple, get_args
 import numpy as np
 import pandas as pd  # type: ignore
 
 # %% auto 0
-__all__ = ['Buffer']
+__all__ = ['Buffer', 'tbptt_bucket_edges']
 
 # %% ../../../nbs/05.storage.buffer.buffer.ipynb 4
 from ..pool.pool import Pool
@@ -30,16 +30,24 @@ class Buffer(abc.ABC, Generic[ItemT]):
         - save()
         - store()
         - sample()
+        - bucket_query()
 
 
     Attributes:
         - pool: the pool object for storing the data
         - batch_size: the batch size for sampling
+        - bucket_edges: sequence length edges of the episode buckets, None or () samples the whole query
         - _type_T: the type of the data item (e.g. Record, Episode, etc.)
     """
 
     pool: Optional[Pool]
     batch_size: int
+    bucket_edges: Optional[tuple[int, ...]] = None
+    _bucket_counts: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _bucket_key: Optional[tuple] = field(default=None, init=False, repr=False)
+    _bucket_rng: np.random.Generator = field(
+        default_factory=np.random.default_rng, init=False, repr=False
+    )
     _type_T: ClassVar[str]
 
     def __init_subclass__(cls):
@@ -81,8 +89,54 @@ class Buffer(abc.ABC, Generic[ItemT]):
         """
         return self.pool.find(query)
 
+    def bucket_queries(self, query: PoolQuery) -> list[PoolQuery]:
+        """
+        Split an episode query into one query per sequence length bucket of `bucket_edges`.
+
+        The buckets are [seq_len_from, e0), [e0, e1), ..., [e_last, seq_len_to].
+        """
+        lows = [query.seq_len_from or 0, *self.bucket_edges]
+        highs = [*self.bucket_edges, None]
+        return [self.pool.length_query(query, lo, hi) for lo, hi in zip(lows, highs)]
+
+    def bucket_query(self, query: PoolQuery) -> PoolQuery:
+        """
+        Draw the sequence length bucket for the next episode batch.
+
+        A bucket is drawn with probability proportional to its episode count, so each episode
+        of the query stays equally likely while a batch only mixes episodes of similar length.
+        Bucket counts are cached until the pool size or the query changes.
+        Returns the query unchanged if no buckets are configured or all of them are empty.
+        """
+        if not self.bucket_edges:
+            return query
+        queries = self.bucket_queries(query)
+        key = (self.pool.cnt, query)
+        if self._bucket_key != key:
+            self._bucket_counts = np.array(
+                [self.pool._count(q) for q in queries], dtype=np.float64
+            )
+            self._bucket_key = key
+        total = self._bucket_counts.sum()
+        if total <= 0:
+            return query
+        return queries[
+            self._bucket_rng.choice(len(queries), p=self._bucket_counts / total)
+        ]
+
     @abc.abstractmethod
     def sample(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         """
         sample data pool to get (state, action, reward, nstate) as a tuple of 4 DataFrames
         """
+
+# %% ../../../nbs/05.storage.buffer.buffer.ipynb 6
+def tbptt_bucket_edges(
+    tbptt_k1: int,  # length of the truncated backpropagation chunks
+    seq_len_to: int,  # maximal sequence length of the episode query
+) -> tuple[int, ...]:  # sequence length edges for `Buffer.bucket_edges`
+    """
+    Bucket edges so that a bucket holds the episodes padded to the same number of tbptt_k1 chunks,
+    i.e. the buckets [1, k1], [k1 + 1, 2 k1], ... up to seq_len_to.
+    """
+    return tuple(range(tbptt_k1 + 1, seq_len_to + 1, tbptt_k1))
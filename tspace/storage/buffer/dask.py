@@ -26,6 +26,7 @@ from tspace.data.core import (
 from tspace.data.external.pandas_utils import (
     decode_episode_batch_to_padded_arrays,
 )
+from ...data.records import quadruples_from_frame
 
 # %% ../../../nbs/05.storage.buffer.dask.ipynb 5
 from .buffer import Buffer  # type: ignore
@@ -131,7 +132,8 @@ class DaskBuffer(Buffer[pd.DataFrame]):
         """
         Decode the batch records from dask DataFrame to numpy arrays
 
-        sample from parquet pool through dask give dask DataFrame, no heavy decoding required just slicing and converting to numpy array
+        sample from parquet pool through dask give dask DataFrame, no heavy decoding required,
+        each field is copied as one block into quadruple records of `quadruple_dtype`
 
         Arg:
 
@@ -145,35 +147,24 @@ class DaskBuffer(Buffer[pd.DataFrame]):
                 nstates: the next states of the batch
         """
 
-        idx = pd.IndexSlice
-        npa_states = batch.loc[
-            :, idx["state", ["velocity", "thrust", "brake"]]  # type: ignore
-        ].values.astype(
-            np.float32
-        )  # same order as inference!! transpose values not necessary!
-        # as each row of batch already corresponds to a tuple with the timestamp
-
-        npa_actions = batch.loc[
-            :, idx["action", self.torque_table_row_names]  # type: ignore
-        ].values.astype(np.float32)
-
-        npa_rewards = batch.loc[:, idx["reward", "work"]].values.astype(np.float32)  # type: ignore
-
-        npa_nstates = batch.loc[
-            :, idx["nstate", ["velocity", "thrust", "brake"]]  # type: ignore
-        ].values.astype(
-            np.float32
-        )  # same order as inference!! transpose values not necessary!
-        # as each row of batch already corresponds to a tuple with the timestamp
-
-        return npa_states, npa_actions, npa_rewards, npa_nstates
+        quadruples = quadruples_from_frame(
+            batch, self.meta, self.torque_table_row_names
+        )
+        # same order as inference!! each record already corresponds to a tuple with the timestamp
+        return tuple(  # type: ignore
+            quadruples[name].reshape(len(quadruples), -1)
+            for name in ("state", "action", "reward", "nstate")
+        )
 
     def sample(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         """
         Sampling from the MongoDB pool
         """
 
-        batch = self.pool.sample(size=self.batch_size, query=self.query)
+        query = self.query
+        if self.recipe["DEFAULT"]["coll_type"] == "EPISODE":
+            query = self.bucket_query(query)
+        batch = self.pool.sample(size=self.batch_size, query=query)
 
         if self.recipe["DEFAULT"]["coll_type"] == "RECORD":
             states, actions, rewards, nstates = self.decode_batch_records(batch)
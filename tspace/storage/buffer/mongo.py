@@ -28,8 +28,7 @@ from tspace.data.core import (
     veos_lifetime_start_date,
 )
 from tspace.data.external.pandas_utils import (
-    decode_episode_batch_to_padded_arrays,
-    decode_mongo_episodes,
+    decode_mongo_episodes_to_padded_arrays,
     decode_mongo_records,
 )
 
@@ -215,28 +214,28 @@ class MongoBuffer(Buffer[pd.DataFrame]):
         """
         Sampling a batch of records or episodes from the pool.
 
-        Decoding the batch observations from mongodb nested dicts to pandas dataframe
-        flatten is used to adapt to model interface
+        Decoding the batch records from mongodb nested dicts to pandas dataframe,
+        flatten is used to adapt to model interface; episodes are decoded directly
+        to padded arrays [B, T, F]
 
         Return:
 
             A quadruple of numpy arrays (states, actions, rewards, next_states)
         """
-        df = self.pool.sample(size=self.batch_size, query=self.query)
-
         if self.db_config.type == "RECORD":
+            df = self.pool.sample(size=self.batch_size, query=self.query)
             states, actions, rewards, nstates = self.decode_batch_records(df)
-        else:  # if pool collection type is EPISODE
-            df_episodes = decode_mongo_episodes(df)
-
-            df_episodes_stripped = df_episodes[["state", "action", "reward", "nstate"]]
+        else:  # if pool collection type is EPISODE, decode the documents directly
+            docs = self.pool.sample_docs(
+                size=self.batch_size, query=self.bucket_query(self.query)
+            )
             (
                 states,
                 actions,
                 rewards,
                 nstates,
-            ) = decode_episode_batch_to_padded_arrays(
-                df_episodes_stripped, self.torque_table_row_names
+            ) = decode_mongo_episodes_to_padded_arrays(
+                docs, self.meta, self.torque_table_row_names
             )
 
         return states, actions, rewards, nstates
@@ -198,6 +198,28 @@ class AvroPool(DaskPool):  # type: ignore   # pycharm bug
         finally:
             self.logger.info(f"Done avro pool.")
 
+    def length_query(
+        self,
+        query: PoolQuery,  # episode query to narrow
+        lo: int,  # shortest sequence length in the bucket
+        hi: Optional[
+            int
+        ] = None,  # first sequence length past the bucket, None keeps the upper bound of query
+    ) -> PoolQuery:  # a copy of query restricted to lo <= seq_len < hi
+        """Restrict an episode query to the sequence lengths [lo, hi).
+
+        `get_query` filters with exclusive bounds on both ends, so the lower bound is shifted by one.
+        """
+        seq_len_from = lo - 1
+        if query.seq_len_from is not None:
+            seq_len_from = max(seq_len_from, query.seq_len_from)
+        seq_len_to = query.seq_len_to
+        if hi is not None:
+            seq_len_to = hi if seq_len_to is None else min(hi, seq_len_to)
+        return query.model_copy(
+            update={"seq_len_from": seq_len_from, "seq_len_to": seq_len_to}
+        )
+
     def get_query(self, query: Optional[PoolQuery] = None) -> Optional[Bag]:
         """
         get query from dask dataframe
@@ -219,7 +241,7 @@ class AvroPool(DaskPool):  # type: ignore   # pycharm bug
         if query.seq_len_from is None:
             query.seq_len_from = 0
 
-        if not query.seq_len_to is None:
+        if query.seq_len_to is None:
             query.seq_len_to = int(
                 1e09
             )  # 1 bio steps is enough as upper bound >74k Years
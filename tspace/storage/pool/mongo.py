@@ -7,6 +7,7 @@ from typing import List, Optional, Union, final
 import logging
 import pandas as pd  # type: ignore
 from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
 from pymongo import MongoClient
 from pymongo.collection import Collection
 from pymongo.errors import CollectionInvalid
@@ -22,7 +23,11 @@ from tspace.data.core import (
     PoolQuery,
     veos_lifetime_start_date,
 )
-from ...data.external.pandas_utils import eos_df_to_nested_dict
+from ...data.external.bson_utils import BSONDocTemplate
+from tspace.data.external.pandas_utils import (
+    compile_nested_dict_template,
+    df_to_nested_dicts_by_template,
+)
 
 # %% ../../../nbs/05.storage.pool.mongo.ipynb 5
 from .pool import Pool  # type: ignore
@@ -53,6 +58,8 @@ class MongoPool(Pool[pd.DataFrame]):
         - client: MongoClient, client for mongodb
         - logger: logging.Logger, logger for mongodb
         - dict_logger: dict, dict for logging
+        - raw_bson: bool, encode the observations to RawBSONDocument with the precompiled BSON template
+        - doc_templates: dict, precompiled document templates by column layout of the observation meta
 
     """
 
@@ -66,6 +73,10 @@ class MongoPool(Pool[pd.DataFrame]):
     client: Optional[MongoClient] = None  # client_default
     logger: Optional[logging.Logger] = None
     dict_logger: Optional[dict] = None
+    raw_bson: bool = False  # fast path for encoding observations to raw BSON
+    doc_templates: dict = field(
+        default_factory=dict
+    )  # (columns, dtypes) -> (order, template, BSONDocTemplate)
 
     def __post_init__(
         self,
@@ -140,6 +151,10 @@ class MongoPool(Pool[pd.DataFrame]):
         self.collection: Collection[DataFrameDoc] = db.get_collection(  # type: ignore
             self.coll_name
         )
+        if (
+            self.db_config.type == "EPISODE"
+        ):  # length bucketed sampling filters on seq_len
+            self.collection.create_index("meta.seq_len")
         self.doc_query = self.parse_query(self.query)
         self.cnt = self._count(
             self.query
@@ -251,46 +266,72 @@ class MongoPool(Pool[pd.DataFrame]):
 
         return doc_query
 
+    def get_doc_template(self, episode: pd.DataFrame) -> tuple:
+        """
+        Get the precompiled document template for the column layout of the episode.
+
+        The template is compiled once per column layout and cached. It consists of the column order
+        and the leaf template of the nested observation dictionaries and, if `raw_bson` is set,
+        the BSON template (None if the column dtypes are not supported).
+        """
+        key = (tuple(episode.columns), tuple(episode.dtypes))
+        doc_template = self.doc_templates.get(key)
+        if doc_template is None:
+            order, template = compile_nested_dict_template(episode.columns)
+            bson_template = BSONDocTemplate.compile(episode) if self.raw_bson else None
+            doc_template = (order, template, bson_template)
+            self.doc_templates[key] = doc_template
+        return doc_template
+
+    def encode_observations(
+        self, episode: pd.DataFrame
+    ) -> list[Union[dict, RawBSONDocument]]:
+        """
+        Encode the rows of an episode to nested observation documents with the precompiled template.
+
+        With `raw_bson`, the documents are RawBSONDocument byte-identical to the encoding of
+        the nested dictionaries, otherwise or if the values are not supported, nested dictionaries.
+        """
+        order, template, bson_template = self.get_doc_template(episode)
+        if bson_template is not None:
+            raw_docs = bson_template.encode(episode)
+            if raw_docs is not None:
+                return [RawBSONDocument(raw_doc) for raw_doc in raw_docs]
+        return df_to_nested_dicts_by_template(episode, order, template)
+
     def store_record(self, episode: pd.DataFrame):
         """
         Deposit the records of an episode into the db.
         """
 
         # encoding DataFrame to nested dict (json format), add meta info then insert_many
-        dict_nested = eos_df_to_nested_dict(
-            episode
-        )  # or 'index'/'tight' nested dict with tuples as keys
+        observations = self.encode_observations(episode)
 
         # generate indices info (vehicle, driver, episodestart, timestamp') from DataFrame MultiIndex for meta info
-        indices_dict = [
-            {episode.index.names[i]: level for i, level in enumerate(levels)}
-            for levels in episode.index
-        ]
-        docs = [
-            DataFrameDoc(
-                timestamp=idx[
-                    "timestamp"
-                ]  # redundant, same as in meta['timestamp'] and 'observation'
-                .to_pydatetime()
-                .replace(
-                    microsecond=0  # mongodb timestamp is in BSON Date format, doesn't support microsecond,
-                ),  # but only for timestamp, not necessary for timestamps as timestep data
-                meta={
-                    **idx,
-                    **(
-                        self.meta.model_dump()
-                    ),  # site will dump tz as IANA string as defined in Eoslocation class
-                },  # merge two dicts into meta: df.index + ObservationMeta
-                observation=dict_nested[key],
-            )
-            for (idx, key) in zip(indices_dict, dict_nested)
-        ]  # list of records, each record is a dict of timestamp, meta, observation (quadruple with timestamp)
+        index_names = episode.index.names
+        meta_dump = (
+            self.meta.model_dump()
+        )  # site will dump tz as IANA string as defined in Eoslocation class
+        docs = []
+        for levels, observation in zip(episode.index, observations):
+            idx = dict(zip(index_names, levels))
+            docs.append(
+                DataFrameDoc(
+                    timestamp=idx[
+                        "timestamp"
+                    ]  # redundant, same as in meta['timestamp'] and 'observation'
+                    .to_pydatetime()
+                    .replace(
+                        microsecond=0  # mongodb timestamp is in BSON Date format, doesn't support microsecond,
+                    ),  # but only for timestamp, not necessary for timestamps as timestep data
+                    meta={
+                        **idx,
+                        **meta_dump,
+                    },  # merge two dicts into meta: df.index + ObservationMeta
+                    observation=observation,
+                )
+            )  # list of records, each record is a dict of timestamp, meta, observation (quadruple with timestamp)
         # each row in rows will be a document in MongoDB
-        # docs = [{'timestamp': idx["timestamp"].to_pydatetime(),  # redundant, same as in meta['timestamp']
-        #         'meta': {**idx, **(self.meta.model_dump())},  # merge two dicts into meta: df.index + ObservationMeta
-        #         'observation': dict_nested[key]}
-        #         for (idx, key) in zip(indices_dict, dict_nested)]
-        # list of records, each record is a dict of timestamp, meta, observation (quadruple with timestamp)
 
         # use typed collection for type checking
         try:
@@ -316,19 +357,19 @@ class MongoPool(Pool[pd.DataFrame]):
 
         # convert dataframe episode to dict
         # encoding DataFrame to nested dict (json format), add meta info then insert_many
-        dict_nested = eos_df_to_nested_dict(
-            episode
-        )  # single key of observation timestamp, or 'index'/'tight' nested dict with tuples as keys
+        observations = self.encode_observations(episode)
         #  convert timestamp key to string for mongodb (only strings are allowed as key for mongodb item key)
-        dict_nested = {key.isoformat(): dict_nested[key] for key in dict_nested}
+        dict_nested = {
+            ts.isoformat(): observation
+            for ts, observation in zip(
+                episode.index.get_level_values("timestamp"), observations
+            )
+        }
 
         # generate indices info (vehicle, driver, episodestart, timestamp') from DataFrame MultiIndex for meta info
-        indices_dict = [
-            {episode.index.names[i]: level for i, level in enumerate(levels)}
-            for levels in episode.index
-        ]  # all elements in the array should have the same vehicle, driver, episodestart
-
-        meta_episode = indices_dict[0].copy()  # shallow copy is sufficient here
+        meta_episode = dict(
+            zip(episode.index.names, episode.index[0])
+        )  # all elements in the array should have the same vehicle, driver, episodestart
         try:
             meta_episode.pop(
                 "timestamp"
@@ -347,7 +388,7 @@ class MongoPool(Pool[pd.DataFrame]):
             **meta_episode,  # meta information of the episode, e.g. vehicle, driver, episodestart
         }  # merge two dicts into meta: df.index + ObservationMeta
         doc = DataFrameDoc(
-            timestamp=indices_dict[0][
+            timestamp=meta_episode[
                 "episodestart"  # the timestamp of a mongo episode document is the episodestart
             ]  # redundant, same as in meta['timestamp'] and 'observation'
             .to_pydatetime()
@@ -423,14 +464,14 @@ class MongoPool(Pool[pd.DataFrame]):
 
         return doc_count
 
-    def sample(
+    def sample_docs(
         self,
         size: int = 4,  # batch size, default 4
         *,
         query: Optional[PoolQuery] = None,  # query for mongodb
-    ) -> Optional[pd.DataFrame]:  # samples as one multi-indexed Pandas DataFrame
+    ) -> Optional[list[dict]]:  # sampled documents as returned by mongodb
         """
-        Sample a batch of records from the db.
+        Sample a batch of raw documents from the db.
 
         db.hyperparameters_collection.aggregate([
             {"$match": {"start_time": {"$exists": False}}},
@@ -500,4 +541,18 @@ class MongoPool(Pool[pd.DataFrame]):
             )
             batch = batch + list(batch_cursor)
 
-        return pd.DataFrame(list(batch)).drop("_id", axis=1)
+        return batch
+
+    def sample(
+        self,
+        size: int = 4,  # batch size, default 4
+        *,
+        query: Optional[PoolQuery] = None,  # query for mongodb
+    ) -> Optional[pd.DataFrame]:  # samples as one multi-indexed Pandas DataFrame
+        """
+        Sample a batch of records from the db as a DataFrame, see `sample_docs`.
+        """
+        batch = self.sample_docs(size, query=query)
+        if batch is None:
+            return None
+        return pd.DataFrame(batch).drop("_id", axis=1)
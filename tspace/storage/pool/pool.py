@@ -102,6 +102,27 @@ class Pool(abc.ABC, Generic[ItemT]):
     def cnt(self, value: int):
         self._cnt = value
 
+    def length_query(
+        self,
+        query: PoolQuery,  # episode query to narrow
+        lo: int,  # shortest sequence length in the bucket
+        hi: Optional[
+            int
+        ] = None,  # first sequence length past the bucket, None keeps the upper bound of query
+    ) -> PoolQuery:  # a copy of query restricted to lo <= seq_len < hi
+        """Restrict an episode query to the sequence lengths [lo, hi).
+
+        The default implementation treats `seq_len_from` and `seq_len_to` as inclusive bounds,
+        pools with different bound semantics override it.
+        """
+        seq_len_from = lo if query.seq_len_from is None else max(lo, query.seq_len_from)
+        seq_len_to = query.seq_len_to
+        if hi is not None:
+            seq_len_to = hi - 1 if seq_len_to is None else min(hi - 1, seq_len_to)
+        return query.model_copy(
+            update={"seq_len_from": seq_len_from, "seq_len_to": seq_len_to}
+        )
+
     @abc.abstractmethod
     def find(self, query: PoolQuery) -> Any:
         """Find an item by id or name."""
@@ -1,11 +1,13 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/02.system.log.ipynb.
 
 # %% auto 0
-__all__ = ['mpl_logger', 'set_root_logger']
+__all__ = ['mpl_logger', 'RingQueueHandler', 'RingQueueListener', 'ThreadSamplingFilter', 'set_root_logger']
 
 # %% ../../nbs/02.system.log.ipynb 3
+import atexit
 import inspect
-from typing import Tuple
+from queue import Empty, Full, Queue
+from typing import Optional, Tuple
 
 # %% ../../nbs/02.system.log.ipynb 4
 # Logging Service Initialization
@@ -16,7 +18,7 @@ from zoneinfo import ZoneInfo
 # system imports
 import os
 from pathlib import Path, PurePosixPath
-from logging.handlers import SocketHandler
+from logging.handlers import QueueHandler, QueueListener, SocketHandler
 
 # %% ../../nbs/02.system.log.ipynb 6
 from pythonjsonlogger import jsonlogger
@@ -28,6 +30,103 @@ mpl_logger = logging.getLogger("matplotlib.font_manager")
 mpl_logger.disabled = True
 
 # %% ../../nbs/02.system.log.ipynb 8
+class RingQueueHandler(QueueHandler):
+    """
+    Non-blocking `QueueHandler` on a bounded queue used as a ring
+
+    If the queue is full, the oldest record is dropped to make room for the newest one,
+    so that logging never blocks the calling thread. Dropped records are counted in `dropped`.
+    Records are enqueued as they are, formatting is deferred to the handlers of the `QueueListener` thread.
+    """
+
+    def __init__(self, queue: Queue):  # bounded queue shared with the QueueListener
+        super().__init__(queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """no formatting in the calling thread, the listener is in the same process"""
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        """put the record into the ring, dropping the oldest record if full"""
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            try:
+                self.queue.get_nowait()  # drop the oldest
+            except Empty:
+                pass
+            self.dropped += 1
+            try:
+                self.queue.put_nowait(record)
+            except Full:  # lost the race to another thread
+                self.dropped += 1
+
+# %% ../../nbs/02.system.log.ipynb 9
+class RingQueueListener(QueueListener):
+    """
+    `QueueListener` on the ring of a `RingQueueHandler`
+
+    The base class puts its stop sentinel with `put_nowait` and raises `queue.Full` on a full ring,
+    here the oldest records are dropped until the sentinel fits. Dropped records are counted in `dropped`.
+    """
+
+    def __init__(
+        self,
+        queue: Queue,  # the ring of the RingQueueHandler
+        *handlers: logging.Handler,  # handlers to emit the records
+        respect_handler_level: bool = False,  # whether to respect the levels of the handlers
+    ):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.dropped = 0
+
+    def enqueue_sentinel(self):
+        """put the stop sentinel into the ring, dropping the oldest records if full"""
+        while True:
+            try:
+                self.queue.put_nowait(self._sentinel)
+                return
+            except Full:
+                try:
+                    self.queue.get_nowait()  # drop the oldest
+                    self.dropped += 1
+                except Empty:
+                    pass
+
+# %% ../../nbs/02.system.log.ipynb 10
+class ThreadSamplingFilter(logging.Filter):
+    """
+    Per-thread level and sampling of the records below WARNING, by the thread name
+
+    e.g. `ThreadSamplingFilter(levels={"flash": logging.INFO}, sample_every={"cruncher_consume": 10})`
+    drops the debug records of the flash thread and passes one in ten info records of the cruncher thread.
+    Warnings and errors are never sampled out.
+    """
+
+    def __init__(
+        self,
+        levels: Optional[dict[str, int]] = None,  # minimal level by thread name
+        sample_every: Optional[
+            dict[str, int]
+        ] = None,  # pass every n-th record below WARNING by thread name
+    ):
+        super().__init__()
+        self.levels = levels or {}
+        self.sample_every = sample_every or {}
+        self.counters: dict[str, int] = {}  # each thread only updates its own counter
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        thread_name = record.threadName
+        if record.levelno < self.levels.get(thread_name, logging.NOTSET):
+            return False
+        every = self.sample_every.get(thread_name, 1)
+        if every > 1 and record.levelno < logging.WARNING:
+            count = self.counters.get(thread_name, 0)
+            self.counters[thread_name] = count + 1
+            return count % every == 0
+        return True
+
+# %% ../../nbs/02.system.log.ipynb 11
 def set_root_logger(
     name: str,  # name of the root logger
     data_root: Path,  # root path of the data
@@ -35,9 +134,19 @@ def set_root_logger(
     tz: ZoneInfo,  # time zone of the logging
     truck: str,  # truck name, ie. "VB7"
     driver: str,  # driver name, ie. "wang-cheng"
+    queue_size: int = 10000,  # capacity of the logging ring, the oldest records are dropped when full
+    thread_levels: Optional[dict[str, int]] = None,  # minimal level by thread name
+    sample_every: Optional[
+        dict[str, int]
+    ] = None,  # sample records below WARNING by thread name
 ) -> Tuple[logging.Logger, dict]:  # return the logger and the dict_logger
     """
     Set the root logger for the system
+
+    The logger only enqueues the records into a bounded ring, so that logging never blocks the
+    real-time threads. The file, stream and cutelog socket handlers format and emit the records
+    in the thread of a `QueueListener`. The listener is stopped at exit to flush the ring,
+    and restarted with a fresh ring in a forked child process.
     """
 
     logger = logging.getLogger(name)
@@ -88,10 +197,37 @@ def set_root_logger(
     socket_handler = SocketHandler("127.0.0.1", 19996)
     socket_handler.setFormatter(formatter)
 
-    logger.addHandler(file_handler)
-    logger.addHandler(str_handler)
-    logger.addHandler(char_handler)
-    logger.addHandler(socket_handler)
+    queue_handler = RingQueueHandler(Queue(maxsize=queue_size))
+    queue_handler.addFilter(ThreadSamplingFilter(thread_levels, sample_every))
+    listener = RingQueueListener(
+        queue_handler.queue,
+        file_handler,
+        str_handler,
+        char_handler,
+        socket_handler,
+        respect_handler_level=True,
+    )
+    listener.start()
+
+    def stop_listener():
+        if queue_handler.dropped:  # flushed by the listener before the sentinel
+            logger.warning("logging ring dropped %d records", queue_handler.dropped)
+        listener.stop()
+
+    def restart_listener_in_child():
+        # the listener thread does not survive fork, and the locks of the ring might be held
+        nonlocal listener
+        queue_handler.queue = Queue(maxsize=queue_size)
+        queue_handler.dropped = 0
+        listener = RingQueueListener(
+            queue_handler.queue, *listener.handlers, respect_handler_level=True
+        )
+        listener.start()
+
+    atexit.register(stop_listener)
+    os.register_at_fork(after_in_child=restart_listener_in_child)
+
+    logger.addHandler(queue_handler)
 
     logger.setLevel(logging.DEBUG)
 
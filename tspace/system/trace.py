@@ -0,0 +1,212 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/02.system.trace.ipynb.
+
+# %% auto 0
+__all__ = ['tracer', 'LatencyHistogram', 'StageTracer', 'get_tracer']
+
+# %% ../../nbs/02.system.trace.ipynb 3
+# system import
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+# %% ../../nbs/02.system.trace.ipynb 4
+# third party import
+import tensorflow as tf
+
+# %% ../../nbs/02.system.trace.ipynb 5
+class LatencyHistogram:
+    """
+    HDR-style histogram of latencies in nanoseconds with log-linear buckets
+
+    Values below `2**sub_bucket_bits` are counted exactly,
+    above that each power of two is split into `2**(sub_bucket_bits-1)` linear buckets,
+    so that the relative error of any recorded value is below `2**(1-sub_bucket_bits)`.
+    Recording is a bit length, a shift and a list increment, without allocation.
+    """
+
+    def __init__(
+        self,
+        sub_bucket_bits: int = 5,  # 5 bits: 16 buckets per power of two, relative error < 6.25%
+        max_value: int = 2
+        ** 40,  # highest trackable value in ns (~18 minutes), larger values are clamped
+    ):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.max_value = max_value
+        self.counts = [0] * (self.bucket_index(max_value) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = max_value
+        self.max = 0
+
+    def bucket_index(self, value: int) -> int:
+        """index of the bucket for the value"""
+        shift = value.bit_length() - self.sub_bucket_bits
+        if shift <= 0:
+            return value
+        return (value >> shift) + shift * self.half_count
+
+    def bucket_upper_bound(self, index: int) -> int:
+        """highest value that falls into the bucket"""
+        if index < self.sub_bucket_count:
+            return index
+        shift, sub = divmod(index - self.sub_bucket_count, self.half_count)
+        shift += 1
+        return ((sub + self.half_count + 1) << shift) - 1
+
+    def record(self, value: int):
+        """record a non-negative latency in ns"""
+        if value > self.max_value:
+            value = self.max_value
+        shift = (
+            value.bit_length() - self.sub_bucket_bits
+        )  # bucket_index inlined for speed
+        if shift <= 0:
+            self.counts[value] += 1
+        else:
+            self.counts[(value >> shift) + shift * self.half_count] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def value_at_percentile(self, percentile: float) -> int:
+        """
+        latency in ns at the percentile (0 ~ 100), the upper bound of the bucket, clamped to the maximum
+        """
+        if self.count == 0:
+            return 0
+        rank = max(1, int(round(percentile / 100.0 * self.count)))
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return min(self.bucket_upper_bound(index), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        """count, mean, min, percentiles and max in ns"""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0,
+            "p50": self.value_at_percentile(50),
+            "p90": self.value_at_percentile(90),
+            "p99": self.value_at_percentile(99),
+            "max": self.max,
+        }
+
+# %% ../../nbs/02.system.trace.ipynb 6
+class StageTracer:
+    """
+    Monotonic-clock spans per stage of a step, e.g. capture, filter, state, predict, flash_table, flash, deposit, train
+
+    A span is recorded either with the explicit pair `t0 = tracer.start()` and `tracer.stop(stage, t0)`,
+    which is cheapest and meant for the hot loop, or with the context manager `tracer.span(stage)`.
+    Each stage keeps a `LatencyHistogram`. If `jsonl_path` is set, the raw spans are buffered
+    and appended to the JSON lines file by `flush`; they are not buffered otherwise.
+    """
+
+    def __init__(
+        self,
+        jsonl_path: Optional[
+            Path
+        ] = None,  # JSON lines file for the raw spans, None for histograms only
+        max_buffered_spans: int = 100_000,  # bound of the raw span buffer between two flushes
+        enabled: bool = True,  # disabled tracer records nothing
+    ):
+        self.jsonl_path = jsonl_path
+        self.enabled = enabled
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.spans: deque = deque(maxlen=max_buffered_spans)
+        self.lock = threading.Lock()  # only guards flush and the creation of histograms
+
+    start = staticmethod(time.monotonic_ns)  # start time of a span in ns
+
+    def stop(
+        self,
+        stage: str,  # name of the stage
+        t0: int,  # start time from `start`
+    ) -> int:  # duration of the span in ns
+        """end the span of the stage started at t0 and record its duration"""
+        t1 = time.monotonic_ns()
+        if not self.enabled:
+            return t1 - t0
+        hist = self.histograms.get(stage)
+        if hist is None:
+            with self.lock:
+                hist = self.histograms.setdefault(stage, LatencyHistogram())
+        hist.record(t1 - t0)
+        if self.jsonl_path is not None:
+            self.spans.append((stage, t0, t1 - t0))
+        return t1 - t0
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:  # name of the stage
+        """context manager recording the span of the enclosed block"""
+        t0 = time.monotonic_ns()
+        try:
+            yield
+        finally:
+            self.stop(stage, t0)
+
+    def summary(self) -> dict[str, dict]:
+        """summary of the histogram of each stage in ns"""
+        return {stage: hist.summary() for stage, hist in list(self.histograms.items())}
+
+    def reset(self):
+        """drop the histograms, e.g. after writing the summary of an episode"""
+        with self.lock:
+            self.histograms = {}
+
+    def flush(self) -> int:
+        """
+        append the buffered raw spans to the JSON lines file
+
+        return:
+            number of spans written
+        """
+        if self.jsonl_path is None:
+            return 0
+        with self.lock:
+            spans, self.spans = self.spans, deque(maxlen=self.spans.maxlen)
+            if not spans:
+                return 0
+            with open(self.jsonl_path, "a") as f:
+                for stage, t0, duration in spans:
+                    f.write(
+                        json.dumps(
+                            {"stage": stage, "start_ns": t0, "duration_ns": duration}
+                        )
+                        + "\n"
+                    )
+        return len(spans)
+
+    def write_summary(
+        self,
+        writer: tf.summary.SummaryWriter,  # e.g. `train_summary_writer` of the cruncher
+        step: int,  # step of the summary, e.g. the episode count
+    ):
+        """write p50, p99, max in milliseconds and the count of each stage to TensorBoard"""
+        with writer.as_default():
+            for stage, stats in self.summary().items():
+                for key in ("p50", "p99", "max"):
+                    tf.summary.scalar(
+                        f"latency/{stage}/{key}_ms", stats[key] / 1e6, step=step
+                    )
+                tf.summary.scalar(f"latency/{stage}/count", stats["count"], step=step)
+
+# %% ../../nbs/02.system.trace.ipynb 7
+tracer = StageTracer()  # process-wide tracer shared by the dataflow threads
+
+
+def get_tracer() -> StageTracer:
+    """get the process-wide tracer"""
+    return tracer